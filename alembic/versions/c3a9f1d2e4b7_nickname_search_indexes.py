@@ -0,0 +1,43 @@
+"""nickname search indexes
+
+Revision ID: c3a9f1d2e4b7
+Revises: b506192f7b3c
+Create Date: 2026-10-18 07:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9f1d2e4b7'
+down_revision: Union[str, Sequence[str], None] = 'b506192f7b3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 큰 테이블에서 쓰기를 막지 않도록 CONCURRENTLY로 만든다 (트랜잭션 밖에서 실행해야 한다)
+    with op.get_context().autocommit_block():
+        # 정확히 일치: get_all_by_nickname / exists_nickname
+        op.create_index(
+            'ix_user_nickname', 'user', ['nickname'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        # 대소문자 무시 prefix 검색 + (key, id) keyset 정렬.
+        # COLLATE "C"라야 btree가 LIKE 'abc%'를 범위 조건으로 쓸 수 있다.
+        op.create_index(
+            'ix_user_nickname_search', 'user',
+            [sa.text('(lower(nickname) COLLATE "C")'), 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_nickname_search', table_name='user', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_nickname', table_name='user', postgresql_concurrently=True, if_exists=True)
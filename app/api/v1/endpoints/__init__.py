@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from app.api.v1.endpoints import (
-    ping, auth_google, auth_steam, users, identities, auth_tokens, auth_session, auth_google_callback
+    ping, auth_google, auth_steam, users, identities, auth_tokens, auth_session, auth_google_callback,
+    admin_profiles,
 )
 
 api_router = APIRouter()
@@ -12,3 +13,4 @@ api_router.include_router(identities.router)
 api_router.include_router(auth_tokens.router)
 api_router.include_router(auth_session.router)
 api_router.include_router(auth_google_callback.router)
+api_router.include_router(admin_profiles.router)
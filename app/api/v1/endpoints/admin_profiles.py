@@ -0,0 +1,42 @@
+from __future__ import annotations
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.utils.profiler import profile_store, verify_profile_token
+
+router = APIRouter(prefix="/admin/profiles", tags=["admin"])
+
+def require_profile_token(x_profile: str | None = Header(None)) -> None:
+    if not settings.PROFILER_ENABLED or not settings.PROFILER_SECRET:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not verify_profile_token(settings.PROFILER_SECRET, x_profile):
+        raise HTTPException(status_code=403, detail="invalid profile token")
+
+@router.get("", dependencies=[Depends(require_profile_token)])
+async def list_profiles() -> list[dict]:
+    return profile_store.summary()
+
+@router.get("/download", dependencies=[Depends(require_profile_token)])
+async def download_profile(
+    route: str = Query(..., description="route path 템플릿 (예: /v1/users/me)"),
+    format: str = Query("prof", pattern="^(prof|text)$"),
+) -> Response:
+    if format == "text":
+        text = profile_store.render_text(route)
+        if text is None:
+            raise HTTPException(status_code=404, detail="no profile for route")
+        return PlainTextResponse(text)
+    data = profile_store.dump(route)
+    if data is None:
+        raise HTTPException(status_code=404, detail="no profile for route")
+    filename = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+    return Response(
+        data, media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.prof"'},
+    )
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_profile_token)])
+async def clear_profiles() -> Response:
+    profile_store.clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
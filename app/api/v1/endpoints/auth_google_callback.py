@@ -7,9 +7,7 @@ from redis.asyncio import Redis
 from app.core.session import get_session
 from app.core.config import settings
 from app.deps.redis import get_redis
-from app.utils.auth_session import (
-    set_result, set_error, get_status, get_code_verifier
-)
+from app.utils.auth_session import get_callback_state, set_error, set_result
 from app.schemas.google_oauth import GoogleTokenRequest
 from app.services import auth_service as S
 
@@ -23,9 +21,11 @@ async def google_callback(
     r: Redis = Depends(get_redis),
     db: AsyncSession = Depends(get_session),
 ):
-    status_str, _, _ = await get_status(r, sid)
+    status_str, cv = await get_callback_state(r, sid)
     if status_str == "not_found":
         raise HTTPException(status_code=404, detail="session not found")
+    if status_str != "pending":
+        raise HTTPException(status_code=409, detail="session already completed")
 
     if error:
         await set_error(r, sid, f"google_error:{error}")
@@ -41,7 +41,6 @@ async def google_callback(
         await set_error(r, sid, "SERVER_MISCONFIG")
         raise HTTPException(status_code=500, detail="SERVER_MISCONFIG")
 
-    cv = await get_code_verifier(r, sid)
     if not cv:
         raise HTTPException(status_code=404, detail="session not found")
 
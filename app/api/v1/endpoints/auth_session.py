@@ -2,9 +2,11 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
 from pydantic import BaseModel
 from redis.asyncio import Redis
+from app.core.config import settings
 from app.schemas.auth_io import AuthUrlResponse, TokenResponse
 from app.deps.redis import get_redis
 from app.utils.auth_session import create_auth_session, get_status
+from app.utils.auth_session_events import session_notifier
 
 router = APIRouter(prefix="/auth/session", tags=["auth"])
 
@@ -17,8 +19,20 @@ async def init_auth_session(body: InitBody, r: Redis = Depends(get_redis)) -> Au
     return AuthUrlResponse(auth_url=data["auth_url"], session_id=data["session_id"])
 
 @router.get("/poll")
-async def poll_session(sid: str = Query(...), r: Redis = Depends(get_redis)):
-    status_str, result, error_msg = await get_status(r, sid)
+async def poll_session(
+    sid: str = Query(...),
+    wait: float = Query(
+        0, ge=0,
+        description="0보다 크면 세션이 끝날 때까지 최대 wait초 기다렸다가 응답한다 (long-poll). "
+        "AUTH_POLL_MAX_WAIT_SEC보다 크면 그 값으로 줄인다",
+    ),
+    r: Redis = Depends(get_redis),
+):
+    if wait > 0:
+        wait = min(wait, settings.AUTH_POLL_MAX_WAIT_SEC)
+        status_str, result, error_msg = await session_notifier.wait_for_status(r, sid, wait)
+    else:
+        status_str, result, error_msg = await get_status(r, sid)
     if status_str == "not_found":
         raise HTTPException(status_code=404, detail="session not found")
     if status_str == "ready" and result:
@@ -39,8 +39,7 @@ async def unlink_identity(
     db: AsyncSession = Depends(get_session),
 ):
     svc = UserService(db)
-    deleted, rows = await svc.ids.delete_returning(user_id, provider.value)
-    await db.commit()
+    deleted, rows = await svc.unlink_identity(user_id, provider)
     return DeleteIdentityResponse(
         deleted=deleted > 0,
         provider=provider.value,
@@ -1,11 +1,11 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.core.session import get_session
 from app.deps.auth import get_current_user, get_current_user_id
-from app.schemas.user import UserOut
+from app.schemas.user import UserBatchRequest, UserBatchResponse, UserOut, UserPublic, UserSearchPage
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -14,6 +14,26 @@ router = APIRouter(prefix="/users", tags=["users"])
 async def me(user = Depends(get_current_user)) -> UserOut:
     return UserOut.model_validate(user)
 
+@router.get("/search", response_model=UserSearchPage)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=16, description="닉네임 prefix (대소문자 무시)"),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    _user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_session),
+) -> UserSearchPage:
+    users, next_cursor = await UserService(db).search_users(q, limit, cursor)
+    return UserSearchPage(items=[UserPublic.model_validate(u) for u in users], next_cursor=next_cursor)
+
+@router.post("/batch", response_model=UserBatchResponse, response_model_exclude_defaults=True)
+async def batch_profiles(
+    body: UserBatchRequest,
+    _user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_session),
+) -> UserBatchResponse:
+    users, missing = await UserService(db).get_public_profiles(body.uids)
+    return UserBatchResponse(users=users, missing=missing)
+
 class NicknameBody(BaseModel):
     nickname: str
 
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 import logging
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # 프로젝트 루트 디렉토리 설정 (app/core/config.py 기준 세 단계 위)
@@ -21,29 +22,92 @@ class Settings(BaseSettings):
 
     API_V1_STR: str = "/v1"
 
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = False
+    # "logger=LEVEL,..." 형식. 라이브러리 debug 로그가 쏟아지지 않도록 기본값을 둔다.
+    LOG_LEVELS: str = "sqlalchemy.engine=WARNING,sqlalchemy.pool=WARNING,httpx=WARNING,httpcore=WARNING,asyncio=WARNING"
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0
+    LOG_QUEUE_SIZE: int = 10000
+
+    METRICS_ENABLED: bool = True
+
+    # 켜면 PROFILER_SAMPLE_RATE 비율의 요청과 서명된 X-Profile 헤더 요청을 cProfile로 잰다
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.0
+    # X-Profile 헤더와 /v1/admin/profiles 인증용. 없으면 헤더 트리거와 admin API가 꺼진다.
+    PROFILER_SECRET: str | None = None
+
     DB_HOST: str = "localhost"
     DB_PORT: int = 55432
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "postgres"
     DB_NAME: str = "sangcheol"
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # 이보다 오래 걸린 statement는 정규화한 SQL과 함께 WARNING으로 남긴다 (0이면 끔)
+    DB_SLOW_QUERY_MS: float = 200.0
+    # 응답에 X-DB-Queries / X-DB-Time 헤더를 붙인다 (개발/부하 테스트용)
+    DB_DEBUG_HEADERS: bool = False
+
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 2
+    WARMUP_REDIS_CONNECTIONS: int = 2
+    WARMUP_TIMEOUT_SEC: float = 10.0
+
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SEC: float = 5.0
+    REDIS_SOCKET_TIMEOUT_SEC: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT_SEC: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL_SEC: int = 30
 
     JWT_SECRET: str = ""
     JWT_EXPIRES_SEC: int = 3600
+    JWT_ISSUER: str = "sangcheol-odyssey"
+    JWT_LEEWAY_SEC: int = 0
+    JWT_CODEC: Literal["fast", "authlib"] = "fast"
+    ACCESS_TOKEN_CACHE_SIZE: int = 10000
     REFRESH_EXPIRES_SEC: int = 30 * 24 * 3600
     REFRESH_REDIS_PREFIX: str = "rtk:"
     REFRESH_USER_SET_PREFIX: str = "rtu:"
     REFRESH_HASH_PEPPER: str | None = None
+    REFRESH_MAX_SESSIONS_PER_USER: int = 10
+    REFRESH_INDEX_SWEEP_INTERVAL_SEC: int = 3600
+    REFRESH_INDEX_SWEEP_BATCH: int = 500
+
+    USER_CACHE_REDIS_PREFIX: str = "usr:"
+    USER_CACHE_TTL_SEC: int = 300
+    USER_CACHE_LOCAL_TTL_SEC: float = 5.0
+    USER_CACHE_LOCAL_SIZE: int = 10000
+    USER_CACHE_TOMBSTONE_SEC: int = 10
+    USER_PUBLIC_CACHE_PREFIX: str = "usrp:"
+    USER_PUBLIC_CACHE_TTL_SEC: int = 60
+    USER_BATCH_MAX_UIDS: int = 200
+
+    UID_POOL_REDIS_KEY: str = "uid-pool"
+    UID_POOL_TARGET: int = 2000
+    UID_POOL_LOW_WATERMARK: int = 500
+    UID_POOL_REFILL_INTERVAL_SEC: float = 5.0
 
     GOOGLE_CLIENT_IDS: str = ""
     GOOGLE_CLIENT_SECRET: str | None = None
     GOOGLE_REDIRECT_URI: str | None = None
     GOOGLE_CLIENT_ID_WEB: str | None = None
 
+    AUTH_POLL_MAX_WAIT_SEC: float = 25.0
+
     STEAM_WEB_API_KEY: str = ""
     STEAM_APP_ID: str = "4566350"
 
+    UPSTREAM_HTTP2: bool = True
+    UPSTREAM_CONNECT_TIMEOUT_SEC: float = 3.0
+    UPSTREAM_READ_TIMEOUT_SEC: float = 10.0
+    UPSTREAM_POOL_TIMEOUT_SEC: float = 5.0
+    UPSTREAM_KEEPALIVE_EXPIRY_SEC: float = 60.0
+    GOOGLE_HTTP_MAX_CONNECTIONS: int = 20
+    STEAM_HTTP_MAX_CONNECTIONS: int = 20
+
     @property
     def db_url_async(self) -> str:
         return (
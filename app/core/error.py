@@ -10,6 +10,7 @@ class DomainErrorCode(StrEnum):
     NICKNAME_CONFLICT = "NICKNAME_CONFLICT"
     IDENTITY_CONFLICT = "IDENTITY_CONFLICT"
     PROVIDER_ALREADY_LINKED = "PROVIDER_ALREADY_LINKED"
+    INVALID_CURSOR = "INVALID_CURSOR"
 
 class SCDomainError(Exception):
     def __init__(self, code: DomainErrorCode, message: str, details: Optional[dict[str, Any]] = None):
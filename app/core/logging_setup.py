@@ -0,0 +1,139 @@
+from __future__ import annotations
+import atexit
+import copy
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
+
+from app.core.config import Settings
+from app.core.serialization import dumps_str
+
+# 요청 경로에서는 레코드를 큐에 넣기만 하고, 포맷팅과 쓰기는 QueueListener 스레드가 한다.
+
+_PLAIN_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+_PLAIN_DATEFMT = "%Y-%m-%d %H:%M:%S"
+# extra로 넘긴 필드만 JSON에 싣기 위해 LogRecord 기본 속성은 뺀다
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+# uvicorn이 자기 handler를 달아 둔 logger. 큐를 거치도록 root로 올린다.
+_UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+ACCESS_LOGGER = "uvicorn.access"
+
+log_stats = {"dropped": 0, "sampled_out": 0}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나. extra로 넘긴 필드는 최상위 키로 들어간다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        doc = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for k, v in record.__dict__.items():
+            if k not in _RECORD_ATTRS and not k.startswith("_"):
+                doc[k] = v
+        if record.exc_info:
+            doc["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            doc["exc"] = record.exc_text
+        if record.stack_info:
+            doc["stack"] = record.stack_info
+        return dumps_str(doc)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버린다. 메시지 인자만 미리 합치고 포맷팅은 listener 스레드로 미룬다."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_stats["dropped"] += 1
+
+
+class AccessLogSampler(logging.Filter):
+    """성공한 access log를 rate 비율만 남긴다. 4xx/5xx와 WARNING 이상은 항상 남긴다."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or record.levelno >= logging.WARNING:
+            return True
+        # uvicorn access log args: (client_addr, method, path, http_version, status_code)
+        args = record.args
+        if isinstance(args, tuple) and len(args) == 5 and isinstance(args[4], int) and args[4] >= 400:
+            return True
+        if random.random() < self.rate:
+            return True
+        log_stats["sampled_out"] += 1
+        return False
+
+
+def parse_level_overrides(spec: str) -> dict[str, str]:
+    """"sqlalchemy.engine=WARNING,httpx=INFO" -> {logger: level}."""
+    out: dict[str, str] = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            out[name.strip()] = level.strip().upper()
+    return out
+
+
+def configure_logging(settings: Settings, stream: IO[str] | None = None) -> QueueListener:
+    """root logger를 Settings대로 다시 구성한다. 여러 번 불러도 listener는 하나만 돈다."""
+    global _listener
+    stop_logging()
+
+    out = logging.StreamHandler(stream or sys.stderr)
+    out.setFormatter(JsonFormatter() if settings.LOG_JSON else logging.Formatter(_PLAIN_FORMAT, _PLAIN_DATEFMT))
+    q: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _listener = QueueListener(q, out, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for h in root.handlers[:]:
+        if isinstance(h, QueueHandler):
+            root.removeHandler(h)
+    root.addHandler(_NonBlockingQueueHandler(q))
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name in _UVICORN_LOGGERS:
+        lg = logging.getLogger(name)
+        lg.handlers.clear()
+        lg.propagate = True
+    access = logging.getLogger(ACCESS_LOGGER)
+    access.filters = [f for f in access.filters if not isinstance(f, AccessLogSampler)]
+    if settings.LOG_ACCESS_SAMPLE_RATE < 1:
+        access.addFilter(AccessLogSampler(settings.LOG_ACCESS_SAMPLE_RATE))
+
+    for name, level in parse_level_overrides(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """큐에 남은 레코드를 모두 쓰고 listener 스레드를 멈춘다."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# 응답 본문, JSONB 컬럼, Redis 레코드가 모두 이 모듈의 orjson 인코더를 쓴다.
+# datetime/UUID/Enum/dataclass는 orjson이 직접 처리하고, 나머지(pydantic 모델, Decimal 등)만 default로 넘어온다.
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default)
+
+def dumps_str(obj: Any) -> str:
+    return orjson.dumps(obj, default=_default).decode()
+
+def loads(s: str | bytes) -> Any:
+    return orjson.loads(s)
+
+
+class ORJSONResponse(JSONResponse):
+    """기본 응답 클래스. JSONResponse와 같은 content를 받지만 orjson으로 렌더링한다."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,28 +1,41 @@
 from __future__ import annotations
-import json
+import time
 from collections.abc import AsyncGenerator
-from typing import Any
 
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.serialization import dumps_str, loads
+from app.utils.metrics import DB_POOL_WAIT
+from app.utils.query_stats import install_query_hooks
 
 
-def _json_serializer(obj: Any) -> str:
-    return json.dumps(jsonable_encoder(obj))
+class _TimedQueuePool(AsyncAdaptedQueuePool):
+    """checkout이 풀에서 연결을 받기까지 기다린 시간을 기록한다."""
+
+    _wait = DB_POOL_WAIT.labels()
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self._wait.observe(time.perf_counter() - t0)
 
 
 engine = create_async_engine(
     settings.db_url_async,
+    poolclass=_TimedQueuePool,
     pool_pre_ping=True,
     pool_recycle=1800,
-    pool_size=getattr(settings, "DB_POOL_SIZE", None) or 5,
-    max_overflow=getattr(settings, "DB_MAX_OVERFLOW", None) or 10,
-    json_serializer=_json_serializer,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    json_serializer=dumps_str,
+    json_deserializer=loads,
     connect_args={
         "server_settings": {
             "application_name": "sangcheol-odyssey-api",
@@ -32,9 +45,15 @@ engine = create_async_engine(
     },
 )
 
+install_query_hooks(engine.sync_engine)
+
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
 
+async def dispose_engine() -> None:
+    await engine.dispose()
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         try:
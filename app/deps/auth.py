@@ -1,20 +1,33 @@
 from __future__ import annotations
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
-from authlib.jose import jwt as jose_jwt
 
 from app.core.config import settings
 from app.core.session import get_session
+from app.deps.redis import get_redis
+from app.schemas.user import UserOut
 from app.services.user_service import UserService
+from app.utils.jwt_tools import InvalidTokenError, decode_access_token
+from app.utils.token_cache import VerifiedTokenCache
+from app.utils.user_cache import user_cache
 
 bearer = HTTPBearer(auto_error=True)
 
+# 같은 bearer token이 반복해서 들어오므로 검증된 claims를 exp까지 캐시해 서명 검증을 건너뛴다
+token_cache = VerifiedTokenCache(settings.ACCESS_TOKEN_CACHE_SIZE)
+
 def _decode(token: str) -> dict:
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
     try:
-        return jose_jwt.decode(token, settings.JWT_SECRET)
-    except Exception:
+        claims = decode_access_token(token)
+    except InvalidTokenError:
         raise HTTPException(status_code=401, detail="invalid token")
+    token_cache.put(token, claims)
+    return claims
 
 async def get_current_user_id(
     cred: HTTPAuthorizationCredentials = Depends(bearer),
@@ -28,6 +41,13 @@ async def get_current_user_id(
 async def get_current_user(
     user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_session),
-):
+    r: Redis = Depends(get_redis),
+) -> UserOut:
+    # 캐시에 있으면 DB 세션은 커넥션을 잡지 않은 채로 닫힌다
+    cached = await user_cache.get(r, user_id)
+    if cached is not None:
+        return cached
     svc = UserService(db)
-    return await svc.require_user(user_id)
+    user = UserOut.model_validate(await svc.require_user(user_id))
+    await user_cache.set(r, user)
+    return user
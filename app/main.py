@@ -1,23 +1,65 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse
+from redis.exceptions import RedisError
 
 from app.api.v1.endpoints import api_router
 from app.core.config import settings
 from app.core.error import DomainErrorCode, SCDomainError
+from app.core.logging_setup import configure_logging
+from app.core.serialization import ORJSONResponse
+from app.core.session import dispose_engine
 from app.schemas.base_response import BaseResponse
+from app.services import metrics as _runtime_metrics  # noqa: F401  (scrape 시점 collector 등록)
+from app.services.refresh_sweeper import start_sweeper, stop_sweeper
+from app.services.uid_pool import pool_depth, start_uid_pool, stop_uid_pool, uid_pool_stats
+from app.services.warmup import mark_not_ready, run_warmup, warmup_state
+from app.utils.redis_client import close_redis, get_redis, pool_stats as redis_pool_stats
+from app.utils.auth_session import load_session_scripts
+from app.utils.auth_session_events import session_notifier
+from app.utils.refresh_store import load_scripts
+from app.utils.metrics import REGISTRY, MetricsMiddleware
+from app.utils.profiler import ProfilerMiddleware
+from app.utils.query_stats import QueryStatsMiddleware
+from app.utils.upstream import close_upstreams, upstream_stats
+from app.ws import ws_router
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+configure_logging(settings)
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    try:
+        # 스크립트를 미리 올려 두면 첫 호출부터 EVALSHA 한 번으로 끝난다
+        await load_scripts(get_redis())
+        await load_session_scripts(get_redis())
+    except RedisError:
+        logger.warning("failed to preload Redis scripts, falling back to EVAL on first use", exc_info=True)
+    start_sweeper()
+    start_uid_pool()
+    if settings.WARMUP_ENABLED:
+        await run_warmup()
+    else:
+        warmup_state["ready"] = True
+    yield
+    # 종료: 먼저 not-ready로 내려 로드밸런서가 빼도록 하고, 백그라운드 작업과 풀을 정리한다
+    mark_not_ready()
+    await stop_sweeper()
+    await stop_uid_pool()
+    await session_notifier.close()
+    await close_upstreams()
+    await close_redis()
+    await dispose_engine()
 
 app = FastAPI(
     title="Sangcheol Odyssey API",
     description="FastAPI backend for Sangcheol Odyssey",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -27,15 +69,42 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(ws_router, prefix=settings.API_V1_STR)
 
 @app.get("/health", status_code=status.HTTP_200_OK)
 async def health_check() -> BaseResponse:
     return BaseResponse(message="healthy")
 
+@app.get("/health/ready")
+async def readiness() -> ORJSONResponse:
+    code = status.HTTP_200_OK if warmup_state["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return ORJSONResponse(status_code=code, content=warmup_state)
+
+@app.get("/health/redis", status_code=status.HTTP_200_OK)
+async def redis_pool_health() -> dict[str, int]:
+    return redis_pool_stats()
+
+@app.get("/health/upstreams", status_code=status.HTTP_200_OK)
+async def upstream_health() -> dict[str, dict[str, float | int]]:
+    return upstream_stats()
+
+@app.get("/health/uid-pool", status_code=status.HTTP_200_OK)
+async def uid_pool_health() -> dict[str, float | int]:
+    return {**uid_pool_stats, "depth": await pool_depth(get_redis())}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.exception_handler(SCDomainError)
-async def sc_domain_error_handler(_request: Request, exc: SCDomainError) -> JSONResponse:
+async def sc_domain_error_handler(_request: Request, exc: SCDomainError) -> ORJSONResponse:
     code_map = {
         DomainErrorCode.NICKNAME_ALREADY_SET: status.HTTP_400_BAD_REQUEST,
         DomainErrorCode.NICKNAME_CONFLICT: status.HTTP_409_CONFLICT,
@@ -44,9 +113,10 @@ async def sc_domain_error_handler(_request: Request, exc: SCDomainError) -> JSON
         DomainErrorCode.INVALID_NICKNAME: status.HTTP_422_UNPROCESSABLE_ENTITY,
         DomainErrorCode.IDENTITY_CONFLICT: status.HTTP_409_CONFLICT,
         DomainErrorCode.PROVIDER_ALREADY_LINKED: status.HTTP_400_BAD_REQUEST,
+        DomainErrorCode.INVALID_CURSOR: status.HTTP_422_UNPROCESSABLE_ENTITY,
     }
     status_code = code_map.get(exc.code, status.HTTP_400_BAD_REQUEST)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={"detail": exc.message, "code": exc.code, "error_details": exc.details},
     )
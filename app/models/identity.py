@@ -30,4 +30,4 @@ class Identity(Base, TimestampedMixin):
 
     profile_json: Mapped[dict | None] = mapped_column(JSONB)
 
-    user = relationship("User", back_populates="identities", lazy="selectin", )
+    user = relationship("User", back_populates="identities", lazy="raise_on_sql")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime
+from sqlalchemy import String, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,9 +14,14 @@ class User(Base, TimestampedMixin):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=_uuid4)
     uid: Mapped[str | None] = mapped_column(String(50), unique=True, index=True, nullable=True)
-    nickname: Mapped[str | None] = mapped_column(String(100))
+    nickname: Mapped[str | None] = mapped_column(String(100), index=True)
     last_login_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
+    # 관계는 기본으로 읽지 않는다. 필요한 쿼리에서 repository의 shape로 명시적으로 로드한다.
     identities: Mapped[list[Identity]] = relationship(
-        back_populates="user", cascade="all, delete-orphan", lazy="selectin", 
+        back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql",
     )
+
+# 닉네임 prefix 검색 (대소문자 무시) + keyset 정렬. 조회 쪽 식(nickname_search_key)과 같아야 인덱스를 탄다.
+nickname_search_key = func.lower(User.nickname).collate("C")
+Index("ix_user_nickname_search", nickname_search_key, User.id)
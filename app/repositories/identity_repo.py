@@ -1,7 +1,7 @@
 from __future__ import annotations
 from uuid import UUID
 
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, delete, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.identity import Identity
@@ -31,11 +31,11 @@ class IdentityRepository:
         return await self.db.scalar(stmt)
 
     async def exists_provider_for_user(self, user_id: UUID, provider: str) -> bool:
-        stmt = select(func.count()).select_from(Identity).where(
+        stmt = select(exists().where(
             Identity.user_id == user_id,
             Identity.provider == provider,
-        )
-        return (await self.db.scalar(stmt)) > 0
+        ))
+        return await self.db.scalar(stmt)
 
     async def delete(self, user_id: UUID, provider: str) -> int:
         stmt = delete(Identity).where(
@@ -1,23 +1,82 @@
 from __future__ import annotations
+import uuid
+from datetime import datetime, timezone
+from enum import StrEnum
+from typing import Any
 from uuid import UUID
-from fastapi import Depends
-from sqlalchemy import func, select, text
+from sqlalchemy import Boolean, DateTime, bindparam, column, exists, select, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 
-from app.core.session import get_session
-from app.models.user import User
+from app.models.user import User, nickname_search_key
+
+
+class UserShape(StrEnum):
+    """User 조회 시 함께 읽을 범위.
+
+    - bare: user 행만 (1 statement)
+    - with_identities: user + 연결된 identity (2 statements, selectin)
+    - profile: 공개 프로필 컬럼만, 관계 없음. 여러 명을 한 번에 읽는 배치 조회용 (1 statement)
+    """
+
+    bare = "bare"
+    with_identities = "with_identities"
+    profile = "profile"
+
+
+_SHAPE_OPTIONS = {
+    UserShape.bare: (),
+    UserShape.with_identities: (selectinload(User.identities),),
+    UserShape.profile: (load_only(User.id, User.uid, User.nickname),),
+}
+
+
+_USER_COLS = "id, uid, nickname, last_login_at, created_at, updated_at"
+
+# postgresql Insert(on_conflict)는 SQLAlchemy 컴파일 캐시를 타지 않아 매번 다시 컴파일된다.
+# 로그인마다 실행되는 statement라 text로 한 번만 만들어 둔다.
+_UPSERT_SOCIAL_SQL = text(f"""
+WITH ins_identity AS (
+    INSERT INTO identity (id, user_id, provider, provider_sub, email, email_verified, profile_json, created_at)
+    VALUES (:identity_id, :user_id, :provider, :provider_sub, :email, :email_verified, :profile_json, :now)
+    ON CONFLICT ON CONSTRAINT uq_identity_provider_sub DO NOTHING
+    RETURNING user_id
+), ins_user AS (
+    INSERT INTO "user" (id, uid, nickname, last_login_at, created_at)
+    SELECT user_id, :uid, NULL, :now, :now FROM ins_identity
+    RETURNING {_USER_COLS}
+), upd_user AS (
+    UPDATE "user" SET last_login_at = :now, updated_at = :now
+    WHERE id = (SELECT user_id FROM identity WHERE provider = :provider AND provider_sub = :provider_sub)
+      AND NOT EXISTS (SELECT 1 FROM ins_identity)
+    RETURNING {_USER_COLS}
+)
+SELECT {_USER_COLS}, true AS is_new FROM ins_user
+UNION ALL
+SELECT {_USER_COLS}, false AS is_new FROM upd_user
+""").bindparams(
+    bindparam("profile_json", type_=JSONB),
+    bindparam("now", type_=DateTime(timezone=True)),
+).columns(*User.__table__.c, column("is_new", Boolean))
+
+_UPSERT_SOCIAL = select(User, _UPSERT_SOCIAL_SQL.selected_columns.is_new).from_statement(_UPSERT_SOCIAL_SQL)
+
+
+def _escape_like(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get(self, user_id: UUID) -> User | None:
-        stmt = select(User).where(User.id == user_id)
+    async def get(self, user_id: UUID, shape: UserShape = UserShape.bare) -> User | None:
+        stmt = select(User).where(User.id == user_id).options(*_SHAPE_OPTIONS[shape])
         return await self.db.scalar(stmt)
 
-    async def get_by_uid(self, uid: str) -> User | None:
-        stmt = select(User).where(User.uid == uid)
+    async def get_by_uid(self, uid: str, shape: UserShape = UserShape.bare) -> User | None:
+        stmt = select(User).where(User.uid == uid).options(*_SHAPE_OPTIONS[shape])
         return await self.db.scalar(stmt)
 
     async def get_all_by_nickname(self, nickname: str) -> list[User]:
@@ -31,12 +90,33 @@ class UserRepository:
         return user
 
     async def exists_uid(self, uid: str) -> bool:
-        stmt = select(func.count()).select_from(User).where(User.uid == uid)
-        return (await self.db.scalar(stmt)) > 0
+        return await self.db.scalar(select(exists().where(User.uid == uid)))
 
     async def exists_nickname(self, nickname: str) -> bool:
-        stmt = select(func.count()).select_from(User).where(User.nickname == nickname)
-        return (await self.db.scalar(stmt)) > 0
+        return await self.db.scalar(select(exists().where(User.nickname == nickname)))
+
+    async def search_by_nickname_prefix(
+        self,
+        prefix: str,
+        limit: int,
+        after: tuple[str, UUID] | None = None,
+    ) -> list[User]:
+        """닉네임이 prefix로 시작하는 user (대소문자 무시), (소문자 닉네임, id) 순.
+
+        after는 이전 페이지 마지막 행의 (소문자 닉네임, id). OFFSET 없이 그 다음부터 읽는다.
+        """
+        pattern = _escape_like(prefix.lower()) + "%"
+        stmt = (
+            select(User)
+            .where(nickname_search_key.like(pattern, escape="\\"))
+            .options(*_SHAPE_OPTIONS[UserShape.profile])
+            .order_by(nickname_search_key, User.id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(nickname_search_key, User.id) > tuple_(*after))
+        res = await self.db.scalars(stmt)
+        return list(res)
 
     async def get_for_update(self, user_id: UUID) -> User | None:
         stmt = select(User).where(User.id == user_id).with_for_update()
@@ -48,9 +128,42 @@ class UserRepository:
             {"id": str(user_id)},
         )
 
-    async def list_by_uids(self, uids: list[str]) -> list[User]:
+    async def list_by_uids(self, uids: list[str], shape: UserShape = UserShape.profile) -> list[User]:
         if not uids:
             return []
-        stmt = select(User).where(User.uid.in_(uids))
+        stmt = select(User).where(User.uid.in_(uids)).options(*_SHAPE_OPTIONS[shape])
         res = await self.db.scalars(stmt)
         return list(res)
+
+    async def upsert_social(
+        self,
+        provider: str,
+        provider_sub: str,
+        uid: str,
+        claims: dict[str, Any] | None = None,
+    ) -> tuple[User, bool] | None:
+        """(provider, provider_sub)의 user를 찾거나 만든다. statement 한 번.
+
+        identity를 ON CONFLICT DO NOTHING으로 먼저 넣어 보고, 들어갔으면 같은 statement에서 user를 만든다
+        (FK는 statement 끝에서 검사된다). 이미 있으면 기존 user의 last_login_at만 갱신한다.
+
+        동시에 첫 로그인한 다른 트랜잭션이 identity를 먼저 넣었다면 그 커밋을 기다린 뒤 DO NOTHING이 되는데,
+        이 statement의 snapshot에서는 그 행이 보이지 않아 None을 돌려준다. 같은 트랜잭션에서 다시 호출하면
+        기존 user로 잡힌다. uid가 겹치면 IntegrityError가 난다.
+        """
+        now = datetime.now(timezone.utc)
+        params = {
+            "identity_id": uuid.uuid4(),
+            "user_id": uuid.uuid4(),
+            "provider": provider,
+            "provider_sub": provider_sub,
+            "email": (claims or {}).get("email"),
+            "email_verified": (claims or {}).get("email_verified"),
+            "profile_json": claims,
+            "uid": uid,
+            "now": now,
+        }
+        row = (await self.db.execute(_UPSERT_SOCIAL, params)).first()
+        if row is None:
+            return None
+        return row[0], row[1]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from app.core.config import settings
 from app.schemas.timestamped_mixin import TimestampedMixin
 
 class UserBase(BaseModel):
@@ -17,3 +18,21 @@ class UserUpdate(BaseModel):
 class UserOut(UserBase, TimestampedMixin):
     id: UUID
     last_login_at: datetime | None = None
+
+class UserPublic(BaseModel):
+    """다른 플레이어에게 보여 주는 프로필."""
+    uid: str | None
+    nickname: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class UserSearchPage(BaseModel):
+    items: list[UserPublic]
+    next_cursor: str | None = None
+
+class UserBatchRequest(BaseModel):
+    uids: list[str] = Field(..., min_length=1, max_length=settings.USER_BATCH_MAX_UIDS)
+
+class UserBatchResponse(BaseModel):
+    users: list[UserPublic]
+    missing: list[str] = []
@@ -1,45 +1,46 @@
 from __future__ import annotations
+import logging
 import httpx
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from authlib.jose import JsonWebToken, JsonWebKey
-from redis.asyncio import from_url as redis_from_url
+from authlib.jose import JsonWebToken
 
 from app.schemas.google_oauth import GoogleTokenRequest, GoogleTokenResponse, GoogleIdClaims
 from app.schemas.auth_io import TokenResponse
 from app.models.identity import Provider
 from app.core.config import settings
-from app.utils.jwks_cache import JWKSCache
+from app.utils.jwks_cache import JWKSCache, JWKSError, unverified_kid
 from app.utils.jwt_tools import issue_access_token
+from app.utils.upstream import google_http
 from app.services.user_service import UserService
 
 from app.utils.redis_client import get_redis
-from app.utils.refresh_tools import (
-    generate_refresh_plain, hash_refresh,
-    redis_token_key, redis_user_set_key,
-    now_ts, exp_ts, to_json, from_json,
-)
+from app.utils.refresh_tools import generate_refresh_plain, hash_refresh
+from app.utils.refresh_store import store_refresh, rotate_refresh, revoke_all
 
 GOOGLE_TOKEN_ENDPOINT = "https://oauth2.googleapis.com/token"
 GOOGLE_JWKS_URI = "https://www.googleapis.com/oauth2/v3/certs"
 GOOGLE_ISS = {"https://accounts.google.com", "accounts.google.com"}
 
-_jwks_cache = JWKSCache(GOOGLE_JWKS_URI)
+logger = logging.getLogger(__name__)
+
+_jwks_cache = JWKSCache(GOOGLE_JWKS_URI, http=google_http)
 _rs256 = JsonWebToken(["RS256"])
 
 async def exchange_google_token(req: GoogleTokenRequest) -> GoogleTokenResponse:
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.post(GOOGLE_TOKEN_ENDPOINT, data=req.to_form())
+    r = await google_http.post(GOOGLE_TOKEN_ENDPOINT, data=req.to_form())
     if r.status_code != 200:
         raise HTTPException(status_code=400, detail="google token exchange failed")
     return GoogleTokenResponse.model_validate(r.json())
 
 
 async def verify_google_id_token(id_token: str) -> GoogleIdClaims:
-    jwks = await _jwks_cache.get()
-    if not isinstance(jwks, dict) or "keys" not in jwks:
-        raise HTTPException(status_code=503, detail="JWKS not available")
-    keyset = JsonWebKey.import_key_set(jwks)
+    try:
+        key = await _jwks_cache.get_key(unverified_kid(id_token))
+    except (httpx.HTTPError, JWKSError) as e:
+        raise HTTPException(status_code=503, detail="JWKS not available") from e
+    if key is None:
+        raise HTTPException(status_code=400, detail="INVALID_ID_TOKEN: unknown signing key")
 
     audiences = settings.google_client_id_list
     if not audiences:
@@ -47,7 +48,7 @@ async def verify_google_id_token(id_token: str) -> GoogleIdClaims:
 
     claims = _rs256.decode(
         id_token,
-        keyset,
+        key,
         claims_options={
             "iss": {"values": list(GOOGLE_ISS)},
             "aud": {"values": audiences},
@@ -70,12 +71,9 @@ async def issue_auth_tokens(user_id: str, is_new_user: bool) -> TokenResponse:
     access_token = issue_access_token(user_id)
 
     plain = generate_refresh_plain()
-    h = hash_refresh(plain)
-    key = redis_token_key(h)
-    record = {"user_id": user_id, "iat": now_ts(), "exp": exp_ts()}
-    async with redis_from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True) as r:
-        await r.setex(key, int(settings.REFRESH_EXPIRES_SEC), to_json(record))
-        await r.sadd(redis_user_set_key(user_id), h)
+    evicted = await store_refresh(get_redis(), user_id, hash_refresh(plain))
+    if evicted:
+        logger.info("refresh session cap reached for user %s, evicted %d oldest", user_id, evicted)
 
     return TokenResponse(
         access_token=access_token,
@@ -100,28 +98,15 @@ async def rotate_refresh_and_issue(db: AsyncSession, refresh_plain: str) -> Toke
         raise HTTPException(status_code=400, detail="missing refresh_token")
 
     h = hash_refresh(refresh_plain)
-    key = redis_token_key(h)
-
-    async with redis_from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True) as r:
-        record_json = await r.getdel(key)
-        if not record_json:
-            raise HTTPException(status_code=401, detail="invalid or used refresh_token")
-
-        rec = from_json(record_json)
-        user_id = rec["user_id"]
+    new_plain = generate_refresh_plain()
+    new_h = hash_refresh(new_plain)
 
-        await r.srem(redis_user_set_key(user_id), h)
+    user_id = await rotate_refresh(get_redis(), h, new_h)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="invalid or used refresh_token")
 
     access = issue_access_token(user_id)
 
-    new_plain = generate_refresh_plain()
-    new_h = hash_refresh(new_plain)
-    new_key = redis_token_key(new_h)
-    new_rec = {"user_id": user_id, "iat": now_ts(), "exp": exp_ts()}
-    async with redis_from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True) as r:
-        await r.setex(new_key, int(settings.REFRESH_EXPIRES_SEC), to_json(new_rec))
-        await r.sadd(redis_user_set_key(user_id), new_h)
-
     await db.commit()
     return TokenResponse(
         access_token=access,
@@ -131,13 +116,5 @@ async def rotate_refresh_and_issue(db: AsyncSession, refresh_plain: str) -> Toke
     )
 
 async def logout_all_refresh(user_id: str) -> dict:
-    set_key = redis_user_set_key(user_id)
-    async with redis_from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True) as r:
-        hashes = await r.smembers(set_key)
-        if hashes:
-            pipe = r.pipeline()
-            for h in hashes:
-                pipe.delete(redis_token_key(h))
-            pipe.delete(set_key)
-            await pipe.execute()
+    await revoke_all(get_redis(), user_id)
     return {"message": "ok"}
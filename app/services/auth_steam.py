@@ -1,4 +1,3 @@
-import httpx
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,6 +6,7 @@ from app.models.identity import Provider
 from app.services.user_service import UserService
 from app.services.auth_service import issue_auth_tokens
 from app.schemas.auth_io import TokenResponse
+from app.utils.upstream import steam_http
 
 STEAM_AUTHENTICATE_URL = "https://api.steampowered.com/ISteamUserAuth/AuthenticateUserTicket/v1/"
 
@@ -19,15 +19,14 @@ async def handle_steam_login(db: AsyncSession, ticket: str) -> TokenResponse:
     
     steam_app_id = settings.STEAM_APP_ID or "4566350"
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.get(
-            STEAM_AUTHENTICATE_URL,
-            params={
-                "key": settings.STEAM_WEB_API_KEY,
-                "appid": steam_app_id,
-                "ticket": ticket,
-            }
-        )
+    r = await steam_http.get(
+        STEAM_AUTHENTICATE_URL,
+        params={
+            "key": settings.STEAM_WEB_API_KEY,
+            "appid": steam_app_id,
+            "ticket": ticket,
+        }
+    )
 
     if r.status_code != 200:
         raise HTTPException(status_code=400, detail=f"Steam authentication request failed: {r.status_code}")
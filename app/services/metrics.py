@@ -0,0 +1,70 @@
+from __future__ import annotations
+from collections.abc import Iterable
+
+from app.core.logging_setup import log_stats
+from app.core.session import engine
+from app.deps.auth import token_cache
+from app.services.refresh_sweeper import sweep_stats
+from app.services.uid_pool import uid_pool_stats
+from app.utils.auth_session_events import session_notifier
+from app.utils.metrics import REGISTRY, Family
+from app.utils.redis_client import pool_stats as redis_pool_stats
+from app.utils.upstream import UPSTREAMS
+from app.utils.user_cache import public_profile_cache, user_cache
+
+# scrape할 때만 읽는 값들. 요청 경로에는 아무것도 더하지 않는다.
+# DB checkout 횟수는 db_pool_checkout_wait_seconds_count로 본다.
+
+
+def _gauge(name: str, help: str, samples: list[tuple[dict[str, str], float]]) -> Family:
+    return name, "gauge", help, samples
+
+
+def _counter(name: str, help: str, samples: list[tuple[dict[str, str], float]]) -> Family:
+    return name, "counter", help, samples
+
+
+def collect_runtime() -> Iterable[Family]:
+    pool = engine.pool
+    yield _gauge("db_pool_size", "Configured DB pool size", [({}, pool.size())])
+    yield _gauge("db_pool_checked_out", "DB connections currently checked out", [({}, pool.checkedout())])
+    # QueuePool.overflow()는 아직 만들 수 있는 overflow를 음수로 돌려주므로 0 밑은 0으로 본다
+    yield _gauge("db_pool_overflow", "DB connections opened beyond pool_size", [({}, max(pool.overflow(), 0))])
+
+    rp = redis_pool_stats()
+    yield _gauge("redis_pool_connections", "Redis pool connections by state", [
+        ({"state": "in_use"}, rp["in_use"]), ({"state": "idle"}, rp["idle"]),
+    ])
+    yield _gauge("redis_pool_max_connections", "Redis pool size limit", [({}, rp["max_connections"])])
+
+    ups = [(u.name, u.stats()) for u in UPSTREAMS]
+    yield _gauge("upstream_latency_p95_ms", "p95 of the last 512 upstream calls", [({"upstream": n}, s["p95_ms"]) for n, s in ups])
+
+    tc = token_cache.stats()
+    yield _gauge("access_token_cache_size", "Verified access tokens cached in this process", [({}, tc["size"])])
+    yield _counter("access_token_cache_lookups_total", "Access token cache lookups", [
+        ({"result": "hit"}, tc["hits"]), ({"result": "miss"}, tc["misses"]),
+    ])
+    uc = user_cache.stats()
+    yield _gauge("user_cache_local_size", "User profiles in the in-process cache", [({}, uc["local_size"])])
+    yield _counter("user_cache_lookups_total", "User profile cache lookups", [
+        ({"result": "local_hit"}, uc["local_hits"]), ({"result": "redis_hit"}, uc["redis_hits"]),
+        ({"result": "miss"}, uc["misses"]),
+    ])
+    pc = public_profile_cache.stats()
+    yield _counter("public_profile_cache_lookups_total", "Public profile cache lookups", [
+        ({"result": "hit"}, pc["hits"]), ({"result": "miss"}, pc["misses"]),
+    ])
+
+    yield _gauge("uid_pool_last_depth", "UID pool depth at the last refill check", [({}, uid_pool_stats["last_depth"])])
+    yield _counter("uid_pool_takes_total", "UIDs handed out by source", [
+        ({"source": "pool"}, uid_pool_stats["taken"]), ({"source": "inline"}, uid_pool_stats["fallbacks"]),
+    ])
+    yield _counter("refresh_index_reclaimed_total", "Refresh index entries reclaimed by the sweeper", [
+        ({}, sweep_stats["total_reclaimed"]),
+    ])
+    yield _gauge("auth_session_waiters", "Long-poll/WebSocket waiters on this worker", [({}, session_notifier.waiting)])
+    yield _counter("log_records_dropped_total", "Log records dropped because the queue was full", [({}, log_stats["dropped"])])
+
+
+REGISTRY.register_collector(collect_runtime)
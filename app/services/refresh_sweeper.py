@@ -0,0 +1,58 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import socket
+
+from app.core.config import settings
+from app.utils.redis_client import get_redis
+from app.utils.refresh_store import compact_user_indexes
+from app.utils.refresh_tools import redis_sweep_lock_key
+
+logger = logging.getLogger(__name__)
+
+_task: asyncio.Task | None = None
+sweep_stats = {"runs": 0, "skipped": 0, "last_reclaimed": 0, "total_reclaimed": 0}
+
+async def sweep_once() -> int | None:
+    """인덱스를 한 번 정리한다. 이번 주기에 다른 인스턴스가 이미 정리했으면 None."""
+    r = get_redis()
+    # 워커/인스턴스마다 sweeper가 돌기 때문에 주기당 한 곳만 keyspace를 훑도록 락을 잡는다.
+    # 락은 풀지 않고 주기만큼 만료되게 두어서, 늦게 깨어난 다른 워커가 같은 주기에 다시 훑지 않게 한다.
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    ttl = max(int(settings.REFRESH_INDEX_SWEEP_INTERVAL_SEC), 1)
+    if not await r.set(redis_sweep_lock_key(), owner, nx=True, ex=ttl):
+        sweep_stats["skipped"] += 1
+        return None
+    reclaimed = await compact_user_indexes(r, batch=settings.REFRESH_INDEX_SWEEP_BATCH)
+    sweep_stats["runs"] += 1
+    sweep_stats["last_reclaimed"] = reclaimed
+    sweep_stats["total_reclaimed"] += reclaimed
+    logger.info("refresh index sweep reclaimed %d expired members", reclaimed)
+    return reclaimed
+
+async def _run(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sweep_once()
+        except Exception:
+            logger.exception("refresh index sweep failed")
+
+def start_sweeper() -> None:
+    global _task
+    interval = settings.REFRESH_INDEX_SWEEP_INTERVAL_SEC
+    if interval <= 0 or _task is not None:
+        return
+    _task = asyncio.create_task(_run(interval), name="refresh-index-sweeper")
+
+async def stop_sweeper() -> None:
+    global _task
+    if _task is None:
+        return
+    task, _task = _task, None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import secrets
+import socket
+import time
+from typing import Final
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.session import async_session_factory
+from app.models.user import User
+from app.utils.redis_client import get_redis
+from app.utils.redis_scripts import LazyScript
+from app.utils.refresh_tools import _env_prefix
+
+logger = logging.getLogger(__name__)
+
+UID_MIN: Final[int] = 100_000_000
+UID_MAX: Final[int] = 9_999_999_999
+
+_task: asyncio.Task | None = None
+# 가입하지 않은 로그인(기존 user)에서 돌려받은 uid. 이미 pool에서 빠진 값이라 이 프로세스만 쓴다.
+_spare: list[str] = []
+_SPARE_MAX: Final[int] = 64
+_REFILL_LOCK_TTL: Final[int] = 30
+
+# 내 락일 때만 지운다. GET과 DEL 사이에 락이 만료돼 다른 워커가 잡았으면 그 락은 건드리지 않는다.
+# KEYS[1] lock   ARGV[1] owner
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_release_lock = LazyScript(_RELEASE_LOCK_LUA)
+
+uid_pool_stats = {
+    "taken": 0,
+    "fallbacks": 0,
+    "refills": 0,
+    "skipped": 0,
+    "added": 0,
+    "rejected": 0,
+    "last_depth": 0,
+    "last_refill_ms": 0.0,
+}
+
+def _gen_numeric_uid() -> str:
+    span = UID_MAX - UID_MIN + 1
+    n = UID_MIN + secrets.randbelow(span)
+    return str(n)
+
+def redis_uid_pool_key() -> str:
+    return f"{_env_prefix()}{settings.UID_POOL_REDIS_KEY}"
+
+def redis_uid_pool_lock_key() -> str:
+    return f"{_env_prefix()}lock:uid-pool-refill"
+
+async def take_uid(r: Redis) -> str:
+    """미리 예약해 둔 uid를 하나 꺼낸다. pool이 비었거나 Redis가 안 되면 그 자리에서 뽑는다."""
+    if _spare:
+        uid_pool_stats["taken"] += 1
+        return _spare.pop()
+    try:
+        uid = await r.spop(redis_uid_pool_key())
+    except RedisError:
+        logger.warning("uid pool unavailable, drawing uid inline", exc_info=True)
+        uid = None
+    if uid is None:
+        uid_pool_stats["fallbacks"] += 1
+        return _gen_numeric_uid()
+    uid_pool_stats["taken"] += 1
+    return uid
+
+def release_uid(uid: str) -> None:
+    """쓰지 않은 uid를 돌려준다. 다음 take_uid가 Redis 왕복 없이 다시 쓴다."""
+    if len(_spare) < _SPARE_MAX:
+        _spare.append(uid)
+
+async def pool_depth(r: Redis) -> int:
+    return await r.scard(redis_uid_pool_key())
+
+async def refill_once(r: Redis, db: AsyncSession) -> int | None:
+    """pool이 low watermark 밑이면 target까지 채운다. 다른 인스턴스가 채우는 중이면 None.
+
+    후보는 secrets로 무작위로 뽑고, DB에 이미 있는 uid와 pool에 이미 있는 uid(SADD 중복)는 버린다.
+    """
+    # 여러 워커가 동시에 같은 양을 채우지 않도록 채우는 동안만 락을 잡는다
+    lock = redis_uid_pool_lock_key()
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    if not await r.set(lock, owner, nx=True, ex=_REFILL_LOCK_TTL):
+        uid_pool_stats["skipped"] += 1
+        return None
+    try:
+        t0 = time.perf_counter()
+        key = redis_uid_pool_key()
+        depth = await r.scard(key)
+        added = 0
+        if depth < settings.UID_POOL_LOW_WATERMARK:
+            candidates = {_gen_numeric_uid() for _ in range(settings.UID_POOL_TARGET - depth)}
+            used = set(await db.scalars(select(User.uid).where(User.uid.in_(candidates))))
+            fresh = candidates - used
+            if fresh:
+                added = await r.sadd(key, *fresh)
+            uid_pool_stats["rejected"] += len(candidates) - added
+            uid_pool_stats["added"] += added
+            uid_pool_stats["refills"] += 1
+            depth += added
+        uid_pool_stats["last_depth"] = depth
+        uid_pool_stats["last_refill_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        return added
+    finally:
+        await _release_lock(r, keys=[lock], args=[owner])
+
+async def _run(interval: float) -> None:
+    while True:
+        try:
+            async with async_session_factory() as db:
+                await refill_once(get_redis(), db)
+        except Exception:
+            logger.exception("uid pool refill failed")
+        await asyncio.sleep(interval)
+
+def start_uid_pool() -> None:
+    global _task
+    interval = settings.UID_POOL_REFILL_INTERVAL_SEC
+    if interval <= 0 or _task is not None:
+        return
+    _task = asyncio.create_task(_run(interval), name="uid-pool-refill")
+
+async def stop_uid_pool() -> None:
+    global _task
+    if _task is None:
+        return
+    task, _task = _task, None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import secrets
+import base64
+import json
 import uuid
 import re
 from datetime import datetime, timezone
@@ -14,19 +15,27 @@ from app.models.identity import Identity, Provider
 from app.repositories.user_repo import UserRepository
 from app.repositories.identity_repo import IdentityRepository
 from app.core.error import SCDomainError, DomainErrorCode
+from app.services.uid_pool import release_uid, take_uid
+from app.utils.redis_client import get_redis
+from app.schemas.user import UserPublic
+from app.utils.user_cache import public_profile_cache, user_cache
 
-UID_MIN: Final[int] = 100_000_000
-UID_MAX: Final[int] = 9_999_999_999
 UID_RETRY_MAX: Final[int] = 10
 
 NICKNAME_RE = re.compile(
     r"^[A-Za-z0-9가-힣ぁ-ゟ゠-ヿ一-龯_.-]{2,16}$"
 )
 
-def _gen_numeric_uid() -> str:
-    span = UID_MAX - UID_MIN + 1
-    n = UID_MIN + secrets.randbelow(span)
-    return str(n)
+def _encode_cursor(key: str, user_id: uuid.UUID) -> str:
+    raw = json.dumps([key, str(user_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def _decode_cursor(cursor: str) -> tuple[str, uuid.UUID]:
+    try:
+        key, user_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(key), uuid.UUID(user_id)
+    except (ValueError, TypeError):
+        raise SCDomainError(DomainErrorCode.INVALID_CURSOR, "Invalid cursor.")
 
 
 class UserService:
@@ -42,25 +51,6 @@ class UserService:
             raise SCDomainError(DomainErrorCode.INVALID_NICKNAME, "Invalid nickname")
         return nn
 
-    async def _assign_numeric_uid(self, user: User) -> None:
-        if user.uid:
-            return
-        for _ in range(UID_RETRY_MAX):
-            try_uid = _gen_numeric_uid()
-            user.uid = try_uid
-            try:
-                await self.db.flush()
-                return
-            except IntegrityError:
-                await self.db.rollback()
-                try:
-                    user.uid = None
-                    await self.db.flush(objects=[user])
-                except Exception:
-                    pass
-                continue
-        raise SCDomainError(DomainErrorCode.UID_CREATE_FAILED, "Failed to create uid.")
-
     async def get_user(self, user_id: uuid.UUID) -> User | None:
         return await self.users.get(user_id)
 
@@ -73,6 +63,35 @@ class UserService:
             raise SCDomainError(DomainErrorCode.INVALID_NICKNAME, "Invalid nickname: empty nickname.")
         return await self.users.get_all_by_nickname(nn)
 
+    async def search_users(
+        self, query: str, limit: int, cursor: str | None = None,
+    ) -> tuple[list[User], str | None]:
+        """닉네임 prefix 검색 한 페이지와 다음 페이지 cursor (없으면 None)."""
+        q = (query or "").strip()
+        if not q or len(q) > 16:
+            raise SCDomainError(DomainErrorCode.INVALID_NICKNAME, "Invalid nickname query.")
+        after = _decode_cursor(cursor) if cursor else None
+        # 한 행 더 읽어서 다음 페이지가 있는지 본다
+        users = await self.users.search_by_nickname_prefix(q, limit + 1, after)
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        last = users[-1]
+        return users, _encode_cursor(last.nickname.lower(), last.id)
+
+    async def get_public_profiles(self, uids: list[str]) -> tuple[list[UserPublic], list[str]]:
+        """요청 순서대로 (공개 프로필, 찾지 못한 uid). 캐시에 없는 uid만 DB에서 한 번에 읽는다."""
+        wanted = list(dict.fromkeys(u.strip() for u in uids))
+        valid = [u for u in wanted if u.isdigit() and 9 <= len(u) <= 10]
+        r = get_redis()
+        found = await public_profile_cache.get_many(r, valid)
+        misses = [u for u in valid if u not in found]
+        if misses:
+            fetched = [UserPublic.model_validate(u) for u in await self.users.list_by_uids(misses)]
+            await public_profile_cache.set_many(r, fetched)
+            found.update((p.uid, p) for p in fetched)
+        return [found[u] for u in wanted if u in found], [u for u in wanted if u not in found]
+
     async def require_user(self, user_id: uuid.UUID) -> User:
         user = await self.users.get(user_id)
         if not user:
@@ -104,34 +123,26 @@ class UserService:
         provider_sub: str,
         claims: dict[str, Any] | None = None,
     ) -> tuple[User, bool]:
-        identity = await self.ids.get_by_provider_sub(provider.value, provider_sub)
-        is_new = False
-        if identity:
-            user = await self.users.get(identity.user_id)
-            if not user:
-                raise SCDomainError(DomainErrorCode.USER_NOT_FOUND, "User not found.")
-            user.last_login_at = datetime.now(timezone.utc)
-        else:
-            user = User(
-                uid=None,
-                nickname=None,
-                last_login_at=datetime.now(timezone.utc),
-            )
-            await self.users.add(user)
-            ident = Identity(
-                user_id=user.id,
-                provider=provider.value,
-                provider_sub=provider_sub,
-                email=claims.get("email") if claims else None,
-                email_verified=claims.get("email_verified") if claims else None,
-                profile_json=claims,
-            )
-            await self.ids.add(ident)
-            await self._assign_numeric_uid(user)
-            is_new = True
-
-        await self.db.commit()
-        return user, is_new
+        r = get_redis()
+        uid = await take_uid(r)
+        for _ in range(UID_RETRY_MAX):
+            try:
+                found = await self.users.upsert_social(provider.value, provider_sub, uid, claims)
+            except IntegrityError:
+                # uid 충돌 (pool이 비어 그 자리에서 뽑은 경우): 되돌리고 다른 uid로 다시 시도
+                await self.db.rollback()
+                uid = await take_uid(r)
+                continue
+            if found is None:
+                # 동시에 들어온 첫 로그인이 identity를 먼저 만들었다. 다음 statement에서는 보인다.
+                continue
+            user, is_new = found
+            await self.db.commit()
+            if not is_new:
+                release_uid(uid)
+                await user_cache.invalidate(r, user.id)  # last_login_at 갱신
+            return user, is_new
+        raise SCDomainError(DomainErrorCode.UID_CREATE_FAILED, "Failed to create uid.")
 
     async def update_nickname_once(self, user_id: uuid.UUID, nickname: str) -> User:
         user = await self.get_user(user_id)
@@ -140,6 +151,9 @@ class UserService:
         nn = self._validate_nickname(nickname)
         user.nickname = nn
         await self.db.commit()
+        r = get_redis()
+        await user_cache.invalidate(r, user.id)
+        await public_profile_cache.invalidate(r, user.uid)
         return user
     
     async def change_nickname(self, user_id: uuid.UUID, nickname: str) -> User:
@@ -147,6 +161,9 @@ class UserService:
         nn = self._validate_nickname(nickname)
         user.nickname = nn
         await self.db.commit()
+        r = get_redis()
+        await user_cache.invalidate(r, user.id)
+        await public_profile_cache.invalidate(r, user.uid)
         return user
 
     async def link_identity(
@@ -194,4 +211,12 @@ class UserService:
                 "Failed to link identity due to a conflict."
             )
 
+        await user_cache.invalidate(get_redis(), user.id)
         return ident
+
+    async def unlink_identity(self, user_id: uuid.UUID, provider: Provider) -> tuple[int, list[dict[str, Any]]]:
+        deleted, rows = await self.ids.delete_returning(user_id, provider.value)
+        await self.db.commit()
+        if deleted:
+            await user_cache.invalidate(get_redis(), user_id)
+        return deleted, rows
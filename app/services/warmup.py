@@ -0,0 +1,70 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.core.session import engine
+from app.utils.redis_client import get_redis
+from app.utils.upstream import prime_upstreams
+
+logger = logging.getLogger(__name__)
+
+# ready는 warmup이 끝난 뒤에만 True가 되고, 종료가 시작되면 다시 False로 내려간다.
+warmup_state: dict = {"ready": False, "steps": {}}
+
+async def warm_db(n: int) -> int:
+    """DB 풀에 커넥션 n개를 동시에 열어 두고 반납한다. 풀 크기를 넘겨서 열지는 않는다."""
+    n = min(n, engine.pool.size())
+    if n <= 0:
+        return 0
+    async with AsyncExitStack() as stack:
+        conns = await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(n)))
+        for conn in conns:
+            await conn.exec_driver_sql("SELECT 1")
+    return n
+
+async def warm_redis(n: int) -> int:
+    """PING을 동시에 n번 보내 Redis 풀에 커넥션 n개를 만들어 둔다."""
+    if n <= 0:
+        return 0
+    r = get_redis()
+    await asyncio.gather(*(r.ping() for _ in range(n)))
+    return n
+
+async def warm_jwks() -> int:
+    from app.services.auth_service import _jwks_cache
+    jwks = await _jwks_cache.get()
+    return len(jwks.get("keys", []))
+
+async def warm_http() -> int:
+    return await prime_upstreams()
+
+async def _step(name: str, fn: Callable[[], Awaitable[int]], timeout: float) -> None:
+    t0 = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(fn(), timeout)
+        warmup_state["steps"][name] = {"ok": True, "result": result, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+    except Exception as e:
+        # warmup 실패는 첫 요청이 느려질 뿐이므로 기동은 계속한다
+        logger.warning("warmup step %s failed", name, exc_info=True)
+        warmup_state["steps"][name] = {"ok": False, "error": type(e).__name__}
+
+async def run_warmup() -> dict:
+    """JWKS, DB/Redis 커넥션, upstream HTTP 연결을 미리 준비하고 끝나면 ready로 표시한다. 각 단계는 동시에 실행된다."""
+    timeout = settings.WARMUP_TIMEOUT_SEC
+    warmup_state["steps"] = {}
+    await asyncio.gather(
+        _step("jwks", warm_jwks, timeout),
+        _step("db", lambda: warm_db(settings.WARMUP_DB_CONNECTIONS), timeout),
+        _step("redis", lambda: warm_redis(settings.WARMUP_REDIS_CONNECTIONS), timeout),
+        _step("http", warm_http, timeout),
+    )
+    warmup_state["ready"] = True
+    logger.info("warmup finished: %s", warmup_state["steps"])
+    return warmup_state
+
+def mark_not_ready() -> None:
+    warmup_state["ready"] = False
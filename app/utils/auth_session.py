@@ -1,10 +1,35 @@
 from __future__ import annotations
-import json, time, secrets, hashlib, base64
+import time, secrets, hashlib, base64
 from typing import Any
 from redis.asyncio import Redis
 
-SESSION_PREFIX = "authsess:"
+from app.core.serialization import dumps, loads
+from app.utils.redis_scripts import LazyScript
+
+# 세션은 hash(status, code_verifier, nonce, created_at, result, error)로 저장한다.
+# 예전 JSON 문자열 세션과 섞이지 않도록 키 공간을 나눴다 (배포 시점에 진행 중이던 세션만 다시 시작하면 된다).
+SESSION_PREFIX = "authsess:h:"
 SESSION_TTL = 600
+# 세션이 끝나면 sid를 이 채널로 알린다 (long-poll / WebSocket 대기 해제용)
+SESSION_EVENTS_CHANNEL = "authsess:events"
+
+# pending일 때만 ready/error로 바꾸고 sid를 PUBLISH한다. 이미 끝났거나 없는 세션이면 0.
+# KEYS[1] session   ARGV[1] 새 status  ARGV[2] 필드 이름(result|error)  ARGV[3] 값  ARGV[4] ttl
+# ARGV[5] 알림 채널  ARGV[6] sid
+_TRANSITION_LUA = """
+if redis.call('HGET', KEYS[1], 'status') ~= 'pending' then
+  return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('PUBLISH', ARGV[5], ARGV[6])
+return 1
+"""
+
+_transition = LazyScript(_TRANSITION_LUA)
+
+async def load_session_scripts(r: Redis) -> None:
+    await _transition.load(r)
 
 def _key(sid: str) -> str:
     return f"{SESSION_PREFIX}{sid}"
@@ -23,50 +48,41 @@ def _nonce() -> str:
 async def create_auth_session(r: Redis, code_verifier: str) -> dict[str, str]:
     sid = _sid()
     nonce = _nonce()
-    rec = {
-        "status": "pending",
-        "code_verifier": code_verifier,
-        "nonce": nonce,
-        "created_at": _now(),
-        "result": None,
-        "error": None,
-    }
-    await r.setex(_key(sid), SESSION_TTL, json.dumps(rec))
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.hset(_key(sid), mapping={
+            "status": "pending",
+            "code_verifier": code_verifier,
+            "nonce": nonce,
+            "created_at": _now(),
+        })
+        pipe.expire(_key(sid), SESSION_TTL)
+        await pipe.execute()
     auth_url = f"https://accounts.google.com/o/oauth2/v2/auth?response_type=code&scope=openid%20email%20profile&code_challenge_method=S256&state={sid}&nonce={nonce}"
     return {"session_id": sid, "auth_url": auth_url}
 
 async def get_status(r: Redis, sid: str) -> tuple[str, Any | None, str | None]:
-    raw = await r.get(_key(sid))
-    if not raw:
+    st, result, error = await r.hmget(_key(sid), ["status", "result", "error"])
+    if not st:
         return "not_found", None, None
-    rec = json.loads(raw)
-    st = rec.get("status")
     if st == "ready":
-        return "ready", rec.get("result"), None
+        return "ready", loads(result) if result else None, None
     if st == "error":
-        return "error", None, rec.get("error")
+        return "error", None, error
     return "pending", None, None
 
-async def get_code_verifier(r: Redis, sid: str) -> str | None:
-    raw = await r.get(_key(sid))
-    if not raw:
-        return None
-    return json.loads(raw).get("code_verifier")
+async def get_callback_state(r: Redis, sid: str) -> tuple[str, str | None]:
+    """callback에 필요한 (status, code_verifier)를 한 번에 읽는다. 세션이 없으면 ("not_found", None)."""
+    st, cv = await r.hmget(_key(sid), ["status", "code_verifier"])
+    return (st or "not_found"), cv
 
-async def set_result(r: Redis, sid: str, result: Any) -> None:
-    raw = await r.get(_key(sid))
-    if not raw:
-        return
-    rec = json.loads(raw)
-    rec["status"] = "ready"
-    rec["result"] = result
-    await r.setex(_key(sid), SESSION_TTL, json.dumps(rec))
+async def set_result(r: Redis, sid: str, result: Any) -> bool:
+    """pending 세션을 ready로 바꾼다. 바꿨으면 True."""
+    return bool(await _transition(
+        r, keys=[_key(sid)], args=["ready", "result", dumps(result), SESSION_TTL, SESSION_EVENTS_CHANNEL, sid],
+    ))
 
-async def set_error(r: Redis, sid: str, message: str) -> None:
-    raw = await r.get(_key(sid))
-    if not raw:
-        return
-    rec = json.loads(raw)
-    rec["status"] = "error"
-    rec["error"] = message
-    await r.setex(_key(sid), SESSION_TTL, json.dumps(rec))
+async def set_error(r: Redis, sid: str, message: str) -> bool:
+    """pending 세션을 error로 바꾼다. 바꿨으면 True."""
+    return bool(await _transition(
+        r, keys=[_key(sid)], args=["error", "error", message, SESSION_TTL, SESSION_EVENTS_CHANNEL, sid],
+    ))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from app.utils.auth_session import SESSION_EVENTS_CHANNEL, get_status
+
+logger = logging.getLogger(__name__)
+
+# 구독 연결은 풀의 socket_timeout(REDIS_SOCKET_TIMEOUT_SEC)을 그대로 쓴다. listen()으로 막혀 읽으면
+# 알림이 없을 때 그 timeout마다 끊고 다시 구독하게 되고(그 사이 알림은 사라진다), retry가 다하면 구독이 죽는다.
+# 대신 이 간격으로 get_message를 돌려서 읽기 timeout은 유휴로 본다.
+_IDLE_READ_SEC = 1.0
+
+
+class SessionNotifier:
+    """auth 세션 완료 알림을 워커당 pub/sub 연결 하나로 받아 기다리는 요청들에게 나눠 준다.
+
+    set_result/set_error 스크립트가 SESSION_EVENTS_CHANNEL에 sid를 PUBLISH한다.
+    기다리는 쪽은 sid별 Future만 들고 있으므로 대기 중인 요청이 많아도 Redis 연결은 늘지 않는다.
+    구독 연결이 끊기면 기다리던 요청을 모두 깨워서 상태를 다시 읽게 하고, 다음 대기 때 다시 구독한다.
+    """
+
+    def __init__(self, channel: str = SESSION_EVENTS_CHANNEL):
+        self.channel = channel
+        self._waiters: dict[str, set[asyncio.Future]] = {}
+        self._pubsub: PubSub | None = None
+        self._task: asyncio.Task | None = None
+        self._subscribed: asyncio.Event | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(fs) for fs in self._waiters.values())
+
+    async def _ensure_listening(self, r: Redis) -> None:
+        async with self._lock:
+            if self._task is None or self._task.done():
+                self._subscribed = asyncio.Event()
+                self._pubsub = r.pubsub()
+                await self._pubsub.subscribe(self.channel)
+                self._task = asyncio.create_task(self._listen(self._pubsub), name="auth-session-events")
+            subscribed = self._subscribed
+        # 구독 확인을 받은 뒤에 상태를 읽어야 그 사이에 온 알림을 놓치지 않는다
+        await subscribed.wait()
+
+    async def _listen(self, pubsub: PubSub) -> None:
+        try:
+            while True:
+                msg = await pubsub.get_message(timeout=_IDLE_READ_SEC)
+                if msg is None:
+                    continue
+                if msg["type"] == "subscribe":
+                    self._subscribed.set()
+                elif msg["type"] == "message":
+                    self._wake(msg["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("auth session event subscriber lost, waking all waiters", exc_info=True)
+        finally:
+            # 구독이 끝나면 기다리던 요청이 멈춰 있지 않도록 모두 깨운다
+            self._subscribed.set()
+            for sid in list(self._waiters):
+                self._wake(sid)
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+    def _wake(self, sid: Any) -> None:
+        if isinstance(sid, bytes):
+            sid = sid.decode()
+        for fut in self._waiters.pop(sid, ()):
+            if not fut.done():
+                fut.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def watch(self, r: Redis, sid: str) -> AsyncIterator[asyncio.Future]:
+        """sid 완료 알림을 받을 Future. 블록 안에서 상태를 읽으면 그 뒤의 알림은 놓치지 않는다."""
+        await self._ensure_listening(r)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(sid, set()).add(fut)
+        try:
+            yield fut
+        finally:
+            waiters = self._waiters.get(sid)
+            if waiters is not None:
+                waiters.discard(fut)
+                if not waiters:
+                    del self._waiters[sid]
+
+    async def wait_for_status(self, r: Redis, sid: str, timeout: float) -> tuple[str, Any | None, str | None]:
+        """세션이 pending에서 벗어나거나 timeout이 지날 때까지 기다렸다가 get_status 결과를 돌려준다."""
+        async with self.watch(r, sid) as fut:
+            status = await get_status(r, sid)
+            if status[0] != "pending":
+                return status
+            try:
+                await asyncio.wait_for(fut, timeout)
+            except asyncio.TimeoutError:
+                return status
+        return await get_status(r, sid)
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+session_notifier = SessionNotifier()
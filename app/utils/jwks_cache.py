@@ -1,22 +1,130 @@
 from __future__ import annotations
+import asyncio
+import base64
+import json
+import logging
+import re
 import time
-import httpx
 from typing import Any
+from authlib.jose import JsonWebKey
+from authlib.jose.rfc7517 import Key
+
+from app.utils.upstream import UpstreamClient
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+class JWKSError(Exception):
+    """JWKS 응답을 해석할 수 없을 때 (JSON/키 형식 오류)."""
+
+
+def _now() -> float:
+    return time.monotonic()
+
+def _max_age(cache_control: str | None) -> int | None:
+    if not cache_control:
+        return None
+    m = _MAX_AGE_RE.search(cache_control)
+    return int(m.group(1)) if m else None
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # 기다리던 요청이 모두 취소된 경우에도 "exception was never retrieved" 경고가 나지 않게 한다
+    if not task.cancelled():
+        task.exception()
+
+def unverified_kid(token: str) -> str | None:
+    """서명 검증 전에 JWT 헤더의 kid만 꺼낸다. 형식이 깨졌으면 None."""
+    try:
+        seg = token.split(".", 1)[0]
+        header = json.loads(base64.urlsafe_b64decode(seg + "=" * (-len(seg) % 4)))
+    except Exception:
+        return None
+    kid = header.get("kid") if isinstance(header, dict) else None
+    return kid if isinstance(kid, str) else None
+
 
 class JWKSCache:
-    def __init__(self, url: str, ttl: int = 3600):
+    """JWKS를 kid별로 파싱해 둔 키와 함께 캐시한다.
+
+    - 갱신은 single-flight: 동시에 갱신이 필요한 요청들은 한 번의 fetch와 그 결과(실패 포함)를 공유한다.
+    - 만료 후에는 기존 키를 그대로 돌려주고 백그라운드에서 다시 받아온다 (stale-while-revalidate).
+    - 응답의 Cache-Control max-age가 있으면 ttl 대신 사용한다.
+    - 모르는 kid가 오면 min_refresh_interval에 한 번까지만 강제로 다시 받아온다.
+      실패한 fetch도 시도로 치므로 JWKS endpoint가 장애일 때 모르는 kid마다 upstream을 두드리지 않는다.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: int = 3600,
+        min_refresh_interval: float = 30.0,
+        http: UpstreamClient | None = None,
+    ):
         self.url = url
+        self.http = http or UpstreamClient("jwks")
         self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
         self._jwks: dict[str, Any] | None = None
+        self._keys: dict[str, Key] = {}
         self._exp: float = 0.0
+        # 성공 여부와 상관없이 마지막으로 fetch를 시작한 시각. 모르는 kid 강제 갱신의 rate limit 기준
+        self._attempted_at: float = 0.0
+        self._inflight: asyncio.Task | None = None
+        self._revalidate_task: asyncio.Task | None = None
+
+    async def _fetch(self) -> None:
+        self._attempted_at = _now()
+        r = await self.http.get(self.url)
+        r.raise_for_status()
+        try:
+            jwks = r.json()
+            keyset = JsonWebKey.import_key_set(jwks)
+            keys: dict[str, Key] = {}
+            for key in keyset.keys:
+                if key.kid:
+                    key.get_public_key()  # 검증 시 파싱하지 않도록 미리 로드
+                    keys[key.kid] = key
+        except (ValueError, TypeError, KeyError) as e:
+            raise JWKSError(f"invalid JWKS from {self.url}") from e
+        now = _now()
+        max_age = _max_age(r.headers.get("cache-control"))
+        self._jwks = jwks
+        self._keys = keys
+        self._exp = now + (max_age if max_age is not None else self.ttl)
+
+    async def _refresh(self) -> None:
+        # 진행 중인 fetch가 있으면 성공이든 실패든 그 결과를 같이 받는다.
+        # 기다리던 요청이 취소돼도 fetch 자체는 끝까지 진행되도록 shield로 감싼다.
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch())
+            self._inflight.add_done_callback(_consume_exception)
+        await asyncio.shield(self._inflight)
+
+    async def _revalidate(self) -> None:
+        try:
+            await self._refresh()
+        except Exception:
+            logger.warning("JWKS revalidation failed, serving stale keys", exc_info=True)
+            self._exp = _now() + self.min_refresh_interval
+
+    def _revalidate_in_background(self) -> None:
+        if self._revalidate_task is None or self._revalidate_task.done():
+            self._revalidate_task = asyncio.create_task(self._revalidate())
 
     async def get(self) -> dict[str, Any]:
-        now = time.time()
-        if self._jwks and now < self._exp:
-            return self._jwks
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(self.url)
-            r.raise_for_status()
-            self._jwks = r.json()
-            self._exp = now + self.ttl
-            return self._jwks
+        if self._jwks is None:
+            await self._refresh()
+        elif _now() >= self._exp:
+            self._revalidate_in_background()
+        return self._jwks
+
+    async def get_key(self, kid: str | None) -> Key | None:
+        await self.get()
+        if not kid:
+            return None
+        key = self._keys.get(kid)
+        if key is None and _now() - self._attempted_at >= self.min_refresh_interval:
+            await self._refresh()
+            key = self._keys.get(kid)
+        return key
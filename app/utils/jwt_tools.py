@@ -1,20 +1,123 @@
 from __future__ import annotations
-from datetime import UTC, datetime
-from typing import Any
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Protocol
 from authlib.jose import jwt
+from authlib.jose.errors import JoseError
 from app.core.config import settings
-from app.schemas.jwt import JwtTokenPayload
+
+class InvalidTokenError(Exception):
+    pass
+
+class JwtCodec(Protocol):
+    def encode(self, claims: dict[str, Any]) -> str: ...
+    def decode(self, token: str) -> dict[str, Any]: ...
+
+def _b64encode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+def _b64decode(seg: bytes) -> bytes:
+    return base64.urlsafe_b64decode(seg + b"=" * (-len(seg) % 4))
+
+def _json(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _check_claims(claims: dict[str, Any], issuer: str, leeway: int) -> None:
+    exp = claims.get("exp")
+    if not isinstance(exp, int) or isinstance(exp, bool):
+        raise InvalidTokenError("missing exp")
+    if exp + leeway <= int(time.time()):
+        raise InvalidTokenError("expired")
+    if claims.get("iss") != issuer:
+        raise InvalidTokenError("invalid iss")
+
+class FastHS256Codec:
+    """HS256 전용 codec. 헤더 세그먼트를 미리 만들어 두고 HMAC 키 상태를 복사해서 재사용한다."""
+
+    _HEADER = {"alg": "HS256", "typ": "JWT"}
+
+    def __init__(self, secret: str, issuer: str, leeway: int = 0):
+        self.issuer = issuer
+        self.leeway = leeway
+        self._header_seg = _b64encode(_json(self._HEADER))
+        self._mac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        signing_input = self._header_seg + b"." + _b64encode(_json(claims))
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            raw = token.encode("ascii")
+            header_seg, payload_seg, sig_seg = raw.split(b".")
+            if header_seg != self._header_seg:
+                # 다른 라이브러리가 만든 토큰은 헤더 직렬화가 다를 수 있으니 alg만 확인한다
+                if json.loads(_b64decode(header_seg)).get("alg") != "HS256":
+                    raise InvalidTokenError("unsupported alg")
+            expected = self._sign(header_seg + b"." + payload_seg)
+            if not hmac.compare_digest(expected, _b64decode(sig_seg)):
+                raise InvalidTokenError("bad signature")
+            claims = json.loads(_b64decode(payload_seg))
+        except InvalidTokenError:
+            raise
+        except (ValueError, UnicodeError, AttributeError) as e:
+            raise InvalidTokenError("malformed token") from e
+        if not isinstance(claims, dict):
+            raise InvalidTokenError("malformed claims")
+        _check_claims(claims, self.issuer, self.leeway)
+        return claims
+
+class AuthlibCodec:
+    """authlib 기반 codec (기존 경로). JWT_CODEC=authlib로 선택한다."""
+
+    def __init__(self, secret: str, issuer: str, leeway: int = 0):
+        self.secret = secret
+        self.issuer = issuer
+        self.leeway = leeway
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        token = jwt.encode({"alg": "HS256", "typ": "JWT"}, claims, self.secret)
+        return token.decode() if isinstance(token, bytes) else token
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            claims = jwt.decode(token, self.secret)
+            claims.validate(leeway=self.leeway)
+        except (JoseError, ValueError) as e:
+            raise InvalidTokenError(str(e)) from e
+        claims = dict(claims)
+        _check_claims(claims, self.issuer, self.leeway)
+        return claims
+
+_CODECS = {"fast": FastHS256Codec, "authlib": AuthlibCodec}
+_codec: tuple[tuple[str, str, str, int], JwtCodec] | None = None
+
+def get_codec() -> JwtCodec:
+    """설정(JWT_CODEC, JWT_SECRET, JWT_ISSUER, JWT_LEEWAY_SEC)이 바뀌지 않는 한 같은 codec을 재사용한다."""
+    global _codec
+    key = (settings.JWT_CODEC, settings.JWT_SECRET, settings.JWT_ISSUER, settings.JWT_LEEWAY_SEC)
+    if _codec is None or _codec[0] != key:
+        cls = _CODECS[settings.JWT_CODEC]
+        _codec = (key, cls(settings.JWT_SECRET, settings.JWT_ISSUER, settings.JWT_LEEWAY_SEC))
+    return _codec[1]
 
 def issue_access_token(sub: str) -> str:
-    now = int(datetime.now(UTC).timestamp())
-    exp = now + int(settings.JWT_EXPIRES_SEC)
-    payload: dict[str, Any] = JwtTokenPayload(
-        sub=sub,
-        typ="access",
-        iat=now,
-        exp=exp,
-        iss="sangcheol-odyssey",
-        aud=None,
-    ).model_dump(exclude_none=True)
-    token = jwt.encode({"alg": "HS256", "typ": "JWT"}, payload, settings.JWT_SECRET)
-    return token.decode() if isinstance(token, bytes) else token
+    now = int(time.time())
+    return get_codec().encode({
+        "sub": sub,
+        "typ": "access",
+        "exp": now + int(settings.JWT_EXPIRES_SEC),
+        "iat": now,
+        "iss": settings.JWT_ISSUER,
+    })
+
+def decode_access_token(token: str) -> dict[str, Any]:
+    return get_codec().decode(token)
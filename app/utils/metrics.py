@@ -0,0 +1,201 @@
+from __future__ import annotations
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import Any
+
+# Prometheus text format(0.0.4) 수집기. 이벤트 루프 한 스레드에서만 갱신하므로 락이 없다.
+# 라벨 조합마다 child를 한 번 만들어 캐시하고, 요청 경로에서는 child의 정수/실수만 더한다.
+
+Sample = tuple[dict[str, str], float]
+Family = tuple[str, str, str, list[Sample]]  # (name, type, help, samples)
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int | float = 1) -> None:
+        self.value += amount
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], _CounterChild] = {}
+
+    def labels(self, *values: str) -> _CounterChild:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _CounterChild()
+        return child
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for values, child in self._children.items():
+            yield f"{self.name}{_fmt_labels(self.labelnames, values)} {_fmt_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # 마지막 칸이 +Inf. 렌더링할 때 누적한다.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._children: dict[tuple[str, ...], _HistogramChild] = {}
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _HistogramChild(self.buckets)
+        return child
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        names = self.labelnames
+        for values, child in self._children.items():
+            acc = 0
+            for le, n in zip((*self.buckets, float("inf")), child.counts):
+                acc += n
+                le_label = 'le="' + _fmt_value(float(le)) + '"'
+                yield f"{self.name}_bucket{_fmt_labels(names, values, le_label)} {acc}"
+            lbl = _fmt_labels(names, values)
+            yield f"{self.name}_sum{lbl} {_fmt_value(child.sum)}"
+            yield f"{self.name}_count{lbl} {acc}"
+
+
+class Registry:
+    """누적 지표(Counter/Histogram)와 scrape 시점에 값을 읽는 collector를 모아 렌더링한다."""
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        m = Counter(name, help, labelnames)
+        self._metrics.append(m)
+        return m
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), *, buckets: tuple[float, ...]) -> Histogram:
+        m = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(m)
+        return m
+
+    def register_collector(self, fn: Callable[[], Iterable[Family]]) -> None:
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        for fn in self._collectors:
+            for name, typ, help, samples in fn():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {typ}")
+                for labels, value in samples:
+                    names, values = tuple(labels), tuple(labels.values())
+                    lines.append(f"{name}{_fmt_labels(names, values)} {_fmt_value(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"),
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_POOL_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a DB connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+REDIS_DURATION = REGISTRY.histogram(
+    "redis_command_duration_seconds", "Redis command latency", ("command",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+REDIS_ERRORS = REGISTRY.counter("redis_command_errors_total", "Redis commands that raised", ("command",))
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "upstream_request_duration_seconds", "Google/Steam HTTP call latency", ("upstream",),
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "upstream_requests_total", "Google/Steam HTTP calls by outcome (status class or error)", ("upstream", "outcome"),
+)
+
+_UNMATCHED = "<unmatched>"
+
+
+def route_label(scope: dict) -> str:
+    """매칭된 route의 path 템플릿. 라우팅 전이거나 매칭되지 않은 요청은 하나의 라벨로 묶는다."""
+    return getattr(scope.get("route"), "path", None) or _UNMATCHED
+
+
+class MetricsMiddleware:
+    """route 템플릿별 지연 시간과 status를 기록하는 순수 ASGI middleware.
+
+    라벨은 실제 경로가 아니라 매칭된 route의 path 템플릿이라 cardinality가 route 수로 묶인다.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        t0 = time.perf_counter()
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            path = route_label(scope)
+            method = scope["method"]
+            HTTP_DURATION.labels(method, path).observe(time.perf_counter() - t0)
+            HTTP_REQUESTS.labels(method, path, str(status)).inc()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+import cProfile
+import hashlib
+import hmac
+import io
+import marshal
+import pstats
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import settings
+from app.utils.metrics import route_label
+
+# 운영 중에 느려진 endpoint를 재배포 없이 프로파일링한다.
+# PROFILER_ENABLED가 꺼져 있으면 middleware를 아예 달지 않는다 (비용 0).
+# 켜져 있어도 프로세스당 한 번에 한 요청만 cProfile을 건다. cProfile은 스레드 전체를 재므로
+# 그 요청이 await하는 동안 같은 루프에서 돈 다른 요청의 코드도 섞여 들어간다 (route별 합산은 근사치).
+
+PROFILE_HEADER = "x-profile"
+_HEADER_KEY = PROFILE_HEADER.encode()
+
+
+def make_profile_token(secret: str, expires_at: int) -> str:
+    """"<만료 unix초>.<HMAC-SHA256 hex>". 이 값을 X-Profile 헤더나 admin API에 넣는다."""
+    sig = hmac.new(secret.encode(), str(expires_at).encode(), hashlib.sha256).hexdigest()
+    return f"{expires_at}.{sig}"
+
+
+def verify_profile_token(secret: str | None, token: str | None, now: float | None = None) -> bool:
+    if not secret or not token:
+        return False
+    exp, _, sig = token.partition(".")
+    if not exp.isdigit() or int(exp) < (time.time() if now is None else now):
+        return False
+    expected = hmac.new(secret.encode(), exp.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, sig)
+
+
+class ProfileStore:
+    """route 템플릿별로 합친 pstats.Stats."""
+
+    def __init__(self) -> None:
+        self._stats: dict[str, pstats.Stats] = {}
+        self._samples: dict[str, int] = {}
+        self.active = False
+
+    def add(self, route: str, prof: cProfile.Profile) -> None:
+        stats = self._stats.get(route)
+        if stats is None:
+            self._stats[route] = pstats.Stats(prof)
+        else:
+            stats.add(prof)
+        self._samples[route] = self._samples.get(route, 0) + 1
+
+    def summary(self) -> list[dict[str, Any]]:
+        return [
+            {"route": route, "samples": self._samples[route], "total_sec": round(stats.total_tt, 6)}
+            for route, stats in sorted(self._stats.items())
+        ]
+
+    def dump(self, route: str) -> bytes | None:
+        """snakeviz / pstats.Stats(path)로 열 수 있는 .prof 내용."""
+        stats = self._stats.get(route)
+        return None if stats is None else marshal.dumps(stats.stats)
+
+    def render_text(self, route: str, limit: int = 50) -> str | None:
+        stats = self._stats.get(route)
+        if stats is None:
+            return None
+        buf = io.StringIO()
+        view = pstats.Stats(stream=buf)
+        view.add(stats)
+        view.sort_stats("cumulative").print_stats(limit)
+        return buf.getvalue()
+
+    def clear(self) -> None:
+        self._stats.clear()
+        self._samples.clear()
+
+
+profile_store = ProfileStore()
+
+
+class ProfilerMiddleware:
+    """PROFILER_SAMPLE_RATE 비율의 요청과, 서명된 X-Profile 헤더가 붙은 요청을 cProfile로 잰다."""
+
+    def __init__(self, app: Any, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+
+    def _wanted(self, scope: dict) -> bool:
+        for k, v in scope["headers"]:
+            if k == _HEADER_KEY:
+                return verify_profile_token(settings.PROFILER_SECRET, v.decode("latin-1"))
+        rate = settings.PROFILER_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or self.store.active or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # 다른 프로파일러(디버거, coverage 등)가 이미 걸려 있다
+            await self.app(scope, receive, send)
+            return
+        self.store.active = True
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            prof.disable()
+            self.store.active = False
+            self.store.add(route_label(scope), prof)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="X-Profile 헤더 / admin profile API용 토큰을 만든다 (PROFILER_SECRET 사용)")
+    ap.add_argument("--ttl", type=int, default=600, help="유효 시간(초)")
+    args = ap.parse_args()
+    if not settings.PROFILER_SECRET:
+        raise SystemExit("PROFILER_SECRET is not set")
+    print(make_profile_token(settings.PROFILER_SECRET, int(time.time()) + args.ttl))
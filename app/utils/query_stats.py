@@ -0,0 +1,123 @@
+from __future__ import annotations
+import logging
+import re
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.utils.metrics import REGISTRY, route_label
+
+logger = logging.getLogger("app.sql.slow")
+
+# 요청마다 statement 수와 DB 시간을 모은다. 요청 밖(백그라운드 작업 등)에서는 None이라 세지 않는다.
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+DB_STATEMENTS = REGISTRY.histogram(
+    "db_statements_per_request", "SQL statements issued per HTTP request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+DB_TIME = REGISTRY.counter("db_time_seconds_total", "Time spent in SQL statements by route", ("route",))
+DB_SLOW = REGISTRY.counter("db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS")
+_slow = DB_SLOW.labels()
+
+_WS = re.compile(r"\s+")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|(?<![:\w]):\w+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_MAX_SQL_LEN = 2000
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def normalize_sql(statement: str) -> str:
+    """값과 바인드 자리를 ?로 바꾸고 IN 목록을 접어서, 같은 모양의 쿼리가 같은 문자열이 되게 한다."""
+    s = _WS.sub(" ", statement).strip()
+    s = _STRING.sub("?", s)
+    s = _PARAM.sub("?", s)
+    s = _NUMBER.sub("?", s)
+    s = _LIST.sub("(...)", s)
+    return s[:_MAX_SQL_LEN]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    threshold = settings.DB_SLOW_QUERY_MS
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        _slow.inc()
+        logger.warning(
+            "slow query %.1fms: %s", elapsed * 1000, normalize_sql(statement),
+            extra={"duration_ms": round(elapsed * 1000, 1)},
+        )
+
+
+def _handle_error(ctx) -> None:
+    # 실패한 statement는 after_cursor_execute가 불리지 않으므로 시작 시각만 버린다
+    if ctx.connection is not None and ctx.connection.info.get("query_start"):
+        ctx.connection.info["query_start"].pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """엔진(async 엔진이면 sync_engine)에 statement 시간 측정 hook을 건다."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """요청마다 QueryStats를 contextvar에 두고, 끝나면 route별 집계에 더한다.
+
+    DB_DEBUG_HEADERS가 켜져 있으면 응답 시작 시점까지의 값을 X-DB-Queries / X-DB-Time(ms) 헤더로 붙인다.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _current.set(stats)
+        send_wrapper = send
+        if settings.DB_DEBUG_HEADERS:
+            async def send_wrapper(message: dict) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"x-db-queries", str(stats.count).encode()))
+                    headers.append((b"x-db-time", f"{stats.seconds * 1000:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = route_label(scope)
+            DB_STATEMENTS.labels(route).observe(stats.count)
+            if stats.seconds:
+                DB_TIME.labels(route).inc(stats.seconds)
@@ -1,15 +1,58 @@
 from __future__ import annotations
-from redis.asyncio import from_url, Redis
+import time
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
 from app.core.config import settings
+from app.utils.metrics import REDIS_DURATION, REDIS_ERRORS
 
 _redis: Redis | None = None
 
+def _make_pool() -> BlockingConnectionPool:
+    # 풀이 가득 차면 새 연결을 만들지 않고 timeout 동안 반환을 기다린다
+    return BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SEC,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SEC,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SEC,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SEC,
+        encoding="utf-8",
+        decode_responses=True,
+    )
+
+class TimedRedis(Redis):
+    """명령마다 지연 시간을 redis_command_duration_seconds에 기록한다. pipeline은 명령 단위로 재지 않는다."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        t0 = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            REDIS_ERRORS.labels(args[0]).inc()
+            raise
+        finally:
+            REDIS_DURATION.labels(args[0]).observe(time.perf_counter() - t0)
+
 def get_redis() -> Redis:
     global _redis
     if _redis is None:
-        _redis = from_url(
-            settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
-        )
+        _redis = TimedRedis.from_pool(_make_pool())
     return _redis
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is None:
+        return
+    r, _redis = _redis, None
+    await r.aclose()
+
+def pool_stats() -> dict[str, int]:
+    if _redis is None:
+        return {"max_connections": settings.REDIS_MAX_CONNECTIONS, "in_use": 0, "idle": 0}
+    pool = _redis.connection_pool
+    return {
+        "max_connections": pool.max_connections,
+        "in_use": len(getattr(pool, "_in_use_connections", ())),
+        "idle": len(getattr(pool, "_available_connections", ())),
+    }
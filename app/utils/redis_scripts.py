@@ -0,0 +1,23 @@
+from __future__ import annotations
+from typing import Any
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+
+class LazyScript:
+    """스크립트 SHA는 처음 호출할 때 한 번만 계산하고 이후에는 EVALSHA로 호출한다."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self._script: AsyncScript | None = None
+
+    async def __call__(self, r: Redis, keys: list[str], args: list[Any]) -> Any:
+        if self._script is None:
+            self._script = r.register_script(self.source)
+        return await self._script(keys=keys, args=args, client=r)
+
+    async def load(self, r: Redis) -> str:
+        if self._script is None:
+            self._script = r.register_script(self.source)
+        self._script.sha = await r.script_load(self.source)
+        return self._script.sha
@@ -0,0 +1,249 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.utils.redis_scripts import LazyScript
+from app.utils.refresh_tools import (
+    RefreshRecord, redis_token_key, redis_token_prefix, redis_user_set_key, redis_user_set_prefix,
+    redis_user_legacy_key, redis_user_legacy_prefix, now_ts, to_json,
+)
+
+# 유저 인덱스(rtu:{user_id})는 score=만료 시각인 sorted set이다.
+# 예전 SET 형식 인덱스는 로그인 경로에서 O(1) RENAME으로 legacy 키(rtu-legacy:{user_id})로 떼어 두기만 하고,
+# 멤버별 변환은 sweeper가 batch 단위로 나눠서 한다. 멤버가 수천 개여도 로그인 경로 스크립트가 길어지지 않는다.
+# 토큰/인덱스 키 일부를 스크립트 안에서 만들기 때문에 단일 노드 Redis를 전제로 한다.
+_INDEX_LUA = """
+local function detach_legacy(idx, legacy)
+    if redis.call('TYPE', idx).ok ~= 'set' then
+        return
+    end
+    if redis.call('EXISTS', legacy) == 0 then
+        redis.call('RENAME', idx, legacy)
+    else
+        redis.call('SUNIONSTORE', legacy, legacy, idx)
+        redis.call('DEL', idx)
+    end
+end
+
+local function extend_ttl(idx, now, exp)
+    if redis.call('TTL', idx) < exp - now then
+        redis.call('EXPIREAT', idx, exp)
+    end
+end
+
+-- cap > 0이면 새 멤버를 넣기 전에 만료가 가장 가까운(가장 오래된) 세션부터 내보낸다
+local function index_add(idx, h, now, exp, token_prefix, cap)
+    redis.call('ZREMRANGEBYSCORE', idx, '-inf', now)
+    local evicted = 0
+    if cap > 0 then
+        local over = redis.call('ZCARD', idx) - cap + 1
+        if over > 0 then
+            local oldest = redis.call('ZPOPMIN', idx, over)
+            for i = 1, #oldest, 2 do
+                redis.call('DEL', token_prefix .. oldest[i])
+            end
+            evicted = over
+        end
+    end
+    redis.call('ZADD', idx, exp, h)
+    extend_ttl(idx, now, exp)
+    return evicted
+end
+"""
+
+# KEYS[1]=토큰 키, KEYS[2]=유저 인덱스 키, KEYS[3]=legacy 인덱스 키
+# ARGV[1]=해시, ARGV[2]=레코드 JSON, ARGV[3]=토큰 키 prefix, ARGV[4]=ttl, ARGV[5]=now, ARGV[6]=세션 상한
+_ISSUE_LUA = _INDEX_LUA + """
+local ttl = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+detach_legacy(KEYS[2], KEYS[3])
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ttl)
+return index_add(KEYS[2], ARGV[1], now, now + ttl, ARGV[3], tonumber(ARGV[6]))
+"""
+
+# KEYS[1]=기존 토큰 키, KEYS[2]=새 토큰 키
+# ARGV[1]=기존 해시, ARGV[2]=새 해시, ARGV[3]=유저 인덱스 키 prefix, ARGV[4]=ttl, ARGV[5]=now,
+# ARGV[6]=토큰 키 prefix, ARGV[7]=세션 상한, ARGV[8]=legacy 인덱스 키 prefix
+_ROTATE_LUA = _INDEX_LUA + """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return false
+end
+redis.call('DEL', KEYS[1])
+local ok, rec = pcall(cjson.decode, raw)
+if not ok or type(rec) ~= 'table' or type(rec['user_id']) ~= 'string' then
+    return false
+end
+local user_id = rec['user_id']
+local idx = ARGV[3] .. user_id
+local legacy = ARGV[8] .. user_id
+local ttl = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+detach_legacy(idx, legacy)
+redis.call('ZREM', idx, ARGV[1])
+redis.call('SREM', legacy, ARGV[1])
+if tonumber(rec['exp']) and tonumber(rec['exp']) < now then
+    return false
+end
+redis.call('SET', KEYS[2], cjson.encode({user_id = user_id, iat = now, exp = now + ttl}), 'EX', ttl)
+index_add(idx, ARGV[2], now, now + ttl, ARGV[6], tonumber(ARGV[7]))
+return user_id
+"""
+
+# KEYS[1]=유저 인덱스 키, KEYS[2]=legacy 인덱스 키
+# ARGV[1]=토큰 키 prefix, ARGV[2]=now
+# 아직 변환되지 않은 legacy 멤버도 살아 있는 토큰일 수 있으므로 같이 지운다.
+_REVOKE_ALL_LUA = _INDEX_LUA + """
+local function del_tokens(members)
+    local deleted = 0
+    for i = 1, #members, 500 do
+        local keys = {}
+        for j = i, math.min(i + 499, #members) do
+            keys[#keys + 1] = ARGV[1] .. members[j]
+        end
+        deleted = deleted + redis.call('DEL', unpack(keys))
+    end
+    return deleted
+end
+detach_legacy(KEYS[1], KEYS[2])
+local revoked = del_tokens(redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[2], '+inf'))
+revoked = revoked + del_tokens(redis.call('SMEMBERS', KEYS[2]))
+redis.call('DEL', KEYS[1], KEYS[2])
+return revoked
+"""
+
+# KEYS[1]=유저 인덱스 키, KEYS[2]=legacy 인덱스 키
+# ARGV[1]=now
+_COMPACT_LUA = _INDEX_LUA + """
+detach_legacy(KEYS[1], KEYS[2])
+return redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]))
+"""
+
+# legacy SET에서 최대 batch개만 꺼내 남은 TTL 기준으로 유저 인덱스에 옮긴다.
+# KEYS[1]=legacy 인덱스 키, KEYS[2]=유저 인덱스 키
+# ARGV[1]=토큰 키 prefix, ARGV[2]=now, ARGV[3]=batch
+# 반환값: {버린 멤버 수, legacy에 남은 멤버 수}
+_CONVERT_LEGACY_LUA = _INDEX_LUA + """
+local now = tonumber(ARGV[2])
+detach_legacy(KEYS[2], KEYS[1])
+local members = redis.call('SPOP', KEYS[1], tonumber(ARGV[3]))
+local dropped = 0
+local max_exp = 0
+for _, h in ipairs(members) do
+    local ttl = redis.call('TTL', ARGV[1] .. h)
+    if ttl > 0 then
+        redis.call('ZADD', KEYS[2], 'NX', now + ttl, h)
+        max_exp = math.max(max_exp, now + ttl)
+    else
+        dropped = dropped + 1
+    end
+end
+if max_exp > 0 then
+    extend_ttl(KEYS[2], now, max_exp)
+end
+return {dropped, redis.call('SCARD', KEYS[1])}
+"""
+
+
+_issue = LazyScript(_ISSUE_LUA)
+_rotate = LazyScript(_ROTATE_LUA)
+_revoke_all = LazyScript(_REVOKE_ALL_LUA)
+_compact = LazyScript(_COMPACT_LUA)
+_convert_legacy = LazyScript(_CONVERT_LEGACY_LUA)
+
+async def load_scripts(r: Redis) -> None:
+    for script in (_issue, _rotate, _revoke_all, _compact, _convert_legacy):
+        await script.load(r)
+
+async def store_refresh(r: Redis, user_id: str, token_hash: str) -> int:
+    """새 refresh 레코드를 저장하고 유저 인덱스에 만료 시각으로 등록한다. 만료된 멤버는 같이 정리된다.
+
+    REFRESH_MAX_SESSIONS_PER_USER를 넘으면 가장 오래된 세션을 같은 스크립트 안에서 내보내고,
+    내보낸 세션 수를 반환한다.
+    """
+    now = now_ts()
+    ttl = int(settings.REFRESH_EXPIRES_SEC)
+    record = RefreshRecord(user_id=user_id, iat=now, exp=now + ttl)
+    return int(await _issue(
+        r,
+        keys=[redis_token_key(token_hash), redis_user_set_key(user_id), redis_user_legacy_key(user_id)],
+        args=[
+            token_hash,
+            to_json(record),
+            redis_token_prefix(),
+            ttl,
+            now,
+            int(settings.REFRESH_MAX_SESSIONS_PER_USER),
+        ],
+    ))
+
+async def rotate_refresh(r: Redis, old_hash: str, new_hash: str) -> str | None:
+    """기존 refresh 레코드를 소비하고 새 레코드를 한 번의 왕복으로 원자적으로 저장한다.
+
+    기존 토큰이 없거나(이미 사용됨/만료) 레코드가 손상된 경우 None을 반환한다.
+    """
+    user_id = await _rotate(
+        r,
+        keys=[redis_token_key(old_hash), redis_token_key(new_hash)],
+        args=[
+            old_hash,
+            new_hash,
+            redis_user_set_prefix(),
+            int(settings.REFRESH_EXPIRES_SEC),
+            now_ts(),
+            redis_token_prefix(),
+            int(settings.REFRESH_MAX_SESSIONS_PER_USER),
+            redis_user_legacy_prefix(),
+        ],
+    )
+    return user_id or None
+
+async def revoke_all(r: Redis, user_id: str) -> int:
+    """유저의 살아 있는 refresh 레코드와 인덱스를 모두 지우고 지운 레코드 수를 반환한다."""
+    return int(await _revoke_all(
+        r,
+        keys=[redis_user_set_key(user_id), redis_user_legacy_key(user_id)],
+        args=[redis_token_prefix(), now_ts()],
+    ))
+
+async def compact_user_indexes(r: Redis, batch: int = 500) -> int:
+    """SCAN으로 유저 인덱스를 batch 단위로 훑으며 만료된 멤버를 제거하고, 제거한 멤버 수를 반환한다.
+
+    예전 SET 인덱스는 legacy 키로 떼어 낸 뒤 convert_legacy_indexes로 batch개씩 나눠 변환한다.
+    """
+    now = now_ts()
+    prefix = redis_user_set_prefix()
+    reclaimed = 0
+    cursor = 0
+    while True:
+        cursor, keys = await r.scan(cursor=cursor, match=f"{prefix}*", count=batch)
+        if keys:
+            pipe = r.pipeline(transaction=False)
+            for key in keys:
+                legacy = redis_user_legacy_key(key[len(prefix):])
+                await _compact(pipe, keys=[key, legacy], args=[now])
+            reclaimed += sum(await pipe.execute())
+        if cursor == 0:
+            break
+        await asyncio.sleep(0)
+    return reclaimed + await convert_legacy_indexes(r, batch=batch)
+
+async def convert_legacy_indexes(r: Redis, batch: int = 500) -> int:
+    """legacy SET 인덱스를 스크립트 한 번에 최대 batch개씩 sorted set 인덱스로 옮기고, 버린(만료된) 멤버 수를 반환한다."""
+    prefix = redis_user_legacy_prefix()
+    dropped = 0
+    cursor = 0
+    while True:
+        cursor, keys = await r.scan(cursor=cursor, match=f"{prefix}*", count=batch)
+        for key in keys:
+            idx = redis_user_set_key(key[len(prefix):])
+            remaining = 1
+            while remaining:
+                n, remaining = await _convert_legacy(r, keys=[key, idx], args=[redis_token_prefix(), now_ts(), batch])
+                dropped += int(n)
+                await asyncio.sleep(0)
+        if cursor == 0:
+            return dropped
+        await asyncio.sleep(0)
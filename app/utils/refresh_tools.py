@@ -1,8 +1,9 @@
 from __future__ import annotations
-import secrets, hmac, hashlib, json
+import secrets, hmac, hashlib
 from datetime import datetime, timezone
 from typing import TypedDict
 from app.core.config import settings
+from app.core.serialization import dumps_str, loads
 
 class RefreshRecord(TypedDict):
     user_id: str
@@ -34,14 +35,29 @@ def _env_prefix() -> str:
     env = mapping.get(raw, "dev")
     return env + ":"
 
+def redis_token_prefix() -> str:
+    return f"{_env_prefix()}{settings.REFRESH_REDIS_PREFIX}"
+
 def redis_token_key(token_hash: str) -> str:
-    return f"{_env_prefix()}{settings.REFRESH_REDIS_PREFIX}{token_hash}"
+    return f"{redis_token_prefix()}{token_hash}"
+
+def redis_user_set_prefix() -> str:
+    return f"{_env_prefix()}{settings.REFRESH_USER_SET_PREFIX}"
 
 def redis_user_set_key(user_id: str) -> str:
-    return f"{_env_prefix()}{settings.REFRESH_USER_SET_PREFIX}{user_id}"
+    return f"{redis_user_set_prefix()}{user_id}"
+
+def redis_user_legacy_prefix() -> str:
+    return f"{_env_prefix()}{settings.REFRESH_USER_SET_PREFIX.rstrip(':')}-legacy:"
+
+def redis_user_legacy_key(user_id: str) -> str:
+    return f"{redis_user_legacy_prefix()}{user_id}"
+
+def redis_sweep_lock_key() -> str:
+    return f"{_env_prefix()}lock:refresh-index-sweep"
 
 def to_json(record: RefreshRecord) -> str:
-    return json.dumps(record)
+    return dumps_str(record)
 
 def from_json(s: str) -> RefreshRecord:
-    return json.loads(s)
+    return loads(s)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+def _now() -> float:
+    return time.time()
+
+class VerifiedTokenCache:
+    """검증이 끝난 access token의 claims를 토큰의 exp까지 보관하는 LRU.
+
+    키는 토큰 원문이 아니라 sha256 digest다. maxsize가 0이면 캐시하지 않는다.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        claims, exp = entry
+        if exp <= _now():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (claims, float(exp))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
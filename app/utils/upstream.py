@@ -0,0 +1,138 @@
+from __future__ import annotations
+import logging
+import statistics
+import time
+from collections import deque
+from typing import Any, Awaitable
+
+import httpx
+
+from app.core.config import settings
+from app.utils.metrics import UPSTREAM_DURATION, UPSTREAM_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+class UpstreamClient:
+    """외부 provider 하나에 대한 공유 httpx 클라이언트.
+
+    keep-alive 풀과 HTTP/2(서버가 지원할 때)를 프로세스 안에서 재사용해서 로그인마다 DNS/TCP/TLS를
+    다시 맺지 않는다. 호출마다 지연 시간을 기록한다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_connections: int = 20,
+        prime_urls: tuple[str, ...] = (),
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.name = name
+        self.max_connections = max_connections
+        self.prime_urls = prime_urls
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._samples: deque[float] = deque(maxlen=512)
+        self.count = 0
+        self.errors = 0
+        self.max_ms = 0.0
+        self._m_duration = UPSTREAM_DURATION.labels(name)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=settings.UPSTREAM_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY_SEC,
+                ),
+                timeout=httpx.Timeout(
+                    settings.UPSTREAM_READ_TIMEOUT_SEC,
+                    connect=settings.UPSTREAM_CONNECT_TIMEOUT_SEC,
+                    pool=settings.UPSTREAM_POOL_TIMEOUT_SEC,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def _timed(self, call: Awaitable[httpx.Response], method: str, url: Any) -> httpx.Response:
+        t0 = time.perf_counter()
+        outcome = "error"
+        try:
+            res = await call
+            outcome = f"{res.status_code // 100}xx"
+            return res
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._m_duration.observe(elapsed)
+            UPSTREAM_REQUESTS.labels(self.name, outcome).inc()
+            ms = elapsed * 1000
+            self.count += 1
+            self.max_ms = max(self.max_ms, ms)
+            self._samples.append(ms)
+            logger.debug("upstream %s %s %s took %.1fms", self.name, method, url, ms)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._timed(self.client.get(url, **kwargs), "GET", url)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._timed(self.client.post(url, **kwargs), "POST", url)
+
+    async def prime(self) -> int:
+        """prime_urls의 호스트마다 연결을 미리 맺어 둔다. 응답 코드는 보지 않는다."""
+        primed = 0
+        for url in self.prime_urls:
+            try:
+                await self._timed(self.client.head(url), "HEAD", url)
+                primed += 1
+            except httpx.HTTPError:
+                logger.warning("failed to prime upstream %s (%s)", self.name, url, exc_info=True)
+        return primed
+
+    def stats(self) -> dict[str, float | int]:
+        samples = list(self._samples)
+        if len(samples) >= 2:
+            q = statistics.quantiles(samples, n=100, method="inclusive")
+            p50, p95 = q[49], q[94]
+        else:
+            p50 = p95 = samples[0] if samples else 0.0
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": round(p50, 1),
+            "p95_ms": round(p95, 1),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+
+google_http = UpstreamClient(
+    "google",
+    max_connections=settings.GOOGLE_HTTP_MAX_CONNECTIONS,
+    prime_urls=("https://oauth2.googleapis.com/", "https://www.googleapis.com/"),
+)
+steam_http = UpstreamClient(
+    "steam",
+    max_connections=settings.STEAM_HTTP_MAX_CONNECTIONS,
+    prime_urls=("https://api.steampowered.com/",),
+)
+UPSTREAMS = (google_http, steam_http)
+
+async def prime_upstreams() -> int:
+    return sum([await u.prime() for u in UPSTREAMS])
+
+async def close_upstreams() -> None:
+    for u in UPSTREAMS:
+        await u.aclose()
+
+def upstream_stats() -> dict[str, dict[str, float | int]]:
+    return {u.name: u.stats() for u in UPSTREAMS}
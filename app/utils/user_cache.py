@@ -0,0 +1,167 @@
+from __future__ import annotations
+import logging
+import time
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.schemas.user import UserOut, UserPublic
+from app.utils.refresh_tools import _env_prefix
+
+logger = logging.getLogger(__name__)
+
+def _now() -> float:
+    return time.monotonic()
+
+# invalidate는 키를 지우는 대신 이 값을 잠깐 남긴다. 그동안 get은 miss로 보고, set(NX)은 덮어쓰지 못한다.
+# DB를 읽은 뒤 set하기 전에 수정이 commit+invalidate돼도 읽어 둔 옛 프로필이 다시 캐시되지 않는다.
+_TOMBSTONE = "-"
+
+def redis_user_cache_key(user_id: str) -> str:
+    return f"{_env_prefix()}{settings.USER_CACHE_REDIS_PREFIX}{user_id}"
+
+def redis_public_profile_key(uid: str) -> str:
+    return f"{_env_prefix()}{settings.USER_PUBLIC_CACHE_PREFIX}{uid}"
+
+class UserProfileCache:
+    """user id -> UserOut 캐시. 프로세스 안 LRU(짧은 TTL) 앞에 Redis(긴 TTL)를 둔다.
+
+    쓰기 경로에서 invalidate하면 이 프로세스의 로컬 항목과 Redis 항목이 바로 지워진다.
+    다른 워커의 로컬 항목은 USER_CACHE_LOCAL_TTL_SEC 안에 만료되므로 그만큼만 늦게 반영된다.
+    set은 키가 없을 때만 쓰고(NX), invalidate는 tombstone_ttl 동안 삭제 표시를 남긴다.
+    Redis 오류는 캐시 miss로 취급한다.
+    """
+
+    def __init__(self, local_size: int, local_ttl: float, ttl: int, tombstone_ttl: int = 10):
+        self.local_size = local_size
+        self.local_ttl = local_ttl
+        self.ttl = ttl
+        self.tombstone_ttl = tombstone_ttl
+        self._local: OrderedDict[str, tuple[float, UserOut]] = OrderedDict()
+        self.hits = {"local": 0, "redis": 0}
+        self.misses = 0
+
+    def _get_local(self, user_id: str) -> UserOut | None:
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= _now():
+            del self._local[user_id]
+            return None
+        self._local.move_to_end(user_id)
+        return user
+
+    def _set_local(self, user: UserOut) -> None:
+        if self.local_size <= 0 or self.local_ttl <= 0:
+            return
+        key = str(user.id)
+        self._local[key] = (_now() + self.local_ttl, user)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def get(self, r: Redis, user_id: str) -> UserOut | None:
+        user_id = str(user_id)
+        user = self._get_local(user_id)
+        if user is not None:
+            self.hits["local"] += 1
+            return user
+        try:
+            raw = await r.get(redis_user_cache_key(user_id))
+        except RedisError:
+            logger.warning("user cache read failed for %s", user_id, exc_info=True)
+            raw = None
+        if raw is None or raw == _TOMBSTONE:
+            self.misses += 1
+            return None
+        user = UserOut.model_validate_json(raw)
+        self._set_local(user)
+        self.hits["redis"] += 1
+        return user
+
+    async def set(self, r: Redis, user: UserOut) -> None:
+        try:
+            if not await r.set(redis_user_cache_key(str(user.id)), user.model_dump_json(), ex=self.ttl, nx=True):
+                # 다른 요청이 이미 채웠거나, 읽은 뒤에 invalidate됐다 (삭제 표시)
+                return
+        except RedisError:
+            logger.warning("user cache write failed for %s", user.id, exc_info=True)
+        self._set_local(user)
+
+    async def invalidate(self, r: Redis, user_id: str) -> None:
+        user_id = str(user_id)
+        self._local.pop(user_id, None)
+        try:
+            await r.set(redis_user_cache_key(user_id), _TOMBSTONE, ex=self.tombstone_ttl)
+        except RedisError:
+            logger.warning("user cache invalidation failed for %s", user_id, exc_info=True)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "local_size": len(self._local),
+            "local_hits": self.hits["local"],
+            "redis_hits": self.hits["redis"],
+            "misses": self.misses,
+        }
+
+
+class PublicProfileCache:
+    """uid -> UserPublic 캐시 (Redis, 짧은 TTL). 여러 uid를 MGET 한 번으로 읽는다.
+
+    닉네임이 바뀌면 invalidate한다. Redis 오류는 캐시 miss로 취급한다.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get_many(self, r: Redis, uids: list[str]) -> dict[str, UserPublic]:
+        if not uids:
+            return {}
+        try:
+            raws = await r.mget([redis_public_profile_key(u) for u in uids])
+        except RedisError:
+            logger.warning("public profile cache read failed", exc_info=True)
+            raws = [None] * len(uids)
+        found = {u: UserPublic.model_validate_json(raw) for u, raw in zip(uids, raws) if raw is not None}
+        self.hits += len(found)
+        self.misses += len(uids) - len(found)
+        return found
+
+    async def set_many(self, r: Redis, profiles: list[UserPublic]) -> None:
+        if not profiles or self.ttl <= 0:
+            return
+        try:
+            async with r.pipeline(transaction=False) as pipe:
+                for p in profiles:
+                    pipe.set(redis_public_profile_key(p.uid), p.model_dump_json(), ex=self.ttl)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("public profile cache write failed", exc_info=True)
+
+    async def invalidate(self, r: Redis, uid: str | None) -> None:
+        if not uid:
+            return
+        try:
+            await r.delete(redis_public_profile_key(uid))
+        except RedisError:
+            logger.warning("public profile cache invalidation failed for %s", uid, exc_info=True)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserProfileCache(
+    local_size=settings.USER_CACHE_LOCAL_SIZE,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL_SEC,
+    ttl=settings.USER_CACHE_TTL_SEC,
+    tombstone_ttl=settings.USER_CACHE_TOMBSTONE_SEC,
+)
+public_profile_cache = PublicProfileCache(ttl=settings.USER_PUBLIC_CACHE_TTL_SEC)
@@ -0,0 +1,5 @@
+from fastapi import APIRouter
+from app.ws import auth_session
+
+ws_router = APIRouter()
+ws_router.include_router(auth_session.router)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import asyncio
+import contextlib
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, WebSocket
+from redis.asyncio import Redis
+
+from app.deps.redis import get_redis
+from app.schemas.auth_io import TokenResponse
+from app.utils.auth_session import SESSION_TTL, get_status
+from app.utils.auth_session_events import session_notifier
+
+router = APIRouter(prefix="/ws/auth", tags=["auth"])
+
+# 4000번대 close code: 4404 세션 없음, 4408 세션 만료까지 완료되지 않음
+WS_CLOSE_NOT_FOUND = 4404
+WS_CLOSE_TIMEOUT = 4408
+# 세션이 pending인데 일찍 깨어났을 때(구독 연결이 끊긴 경우 등) 다시 기다리기 전 쉬는 시간
+_REWAIT_PAUSE_SEC = 0.5
+
+async def _wait_until_done(r: Redis, sid: str) -> tuple[str, Any | None, str | None]:
+    """세션이 끝나거나 실제로 만료될 때까지 기다린다. 만료되면 ("expired", None, None).
+
+    wait_for_status는 구독이 끊기면 timeout 전에 pending으로 돌아오므로, 마감(SESSION_TTL) 전이면 다시 기다린다.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SESSION_TTL
+    status = await get_status(r, sid)
+    if status[0] == "not_found":
+        return status
+    while True:
+        status = await session_notifier.wait_for_status(r, sid, max(deadline - loop.time(), 0))
+        if status[0] == "not_found":
+            # 기다리는 동안 세션 키가 TTL로 사라졌다
+            return "expired", None, None
+        if status[0] != "pending":
+            return status
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return "expired", None, None
+        await asyncio.sleep(min(_REWAIT_PAUSE_SEC, remaining))
+
+@router.websocket("/session")
+async def auth_session_events(
+    ws: WebSocket,
+    sid: str = Query(...),
+    r: Redis = Depends(get_redis),
+):
+    """PKCE 데스크톱 로그인: callback이 끝나는 순간 토큰(또는 오류)을 한 번 보내고 닫는다.
+
+    완료 알림은 Redis pub/sub(SessionNotifier)으로 받으므로 callback이 다른 워커/노드에서 처리돼도 된다.
+    대기 중인 소켓은 Future 하나와 수신 대기 하나만 들고 있다.
+    """
+    await ws.accept()
+    waiting = asyncio.create_task(_wait_until_done(r, sid))
+    # 클라이언트가 먼저 끊으면 더 기다리지 않는다
+    disconnected = asyncio.create_task(ws.receive())
+    try:
+        done, _ = await asyncio.wait({waiting, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        if waiting not in done:
+            return
+        status_str, result, error_msg = waiting.result()
+        if status_str == "not_found":
+            await ws.close(code=WS_CLOSE_NOT_FOUND, reason="session not found")
+        elif status_str == "expired":
+            await ws.close(code=WS_CLOSE_TIMEOUT, reason="session expired")
+        elif status_str == "ready" and result:
+            await ws.send_json({"status": "ready", "token": TokenResponse.model_validate(result).model_dump()})
+            await ws.close()
+        else:
+            await ws.send_json({"status": "error", "error": error_msg or "auth failed"})
+            await ws.close()
+    finally:
+        for task in (waiting, disconnected):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
@@ -0,0 +1,257 @@
+"""인증/유저 hot path 부하 측정: ASGI 앱을 프로세스 안에서 httpx.ASGITransport로 직접 호출한다.
+
+    uv run python -m benchmarks.asgi_load
+    uv run python -m benchmarks.asgi_load --requests 400 --concurrency 32
+    uv run python -m benchmarks.asgi_load --save-baseline        # 현재 결과를 기준값으로 저장
+    uv run python -m benchmarks.asgi_load --only google_login,users_me
+
+Redis는 fakeredis, Google(JWKS)과 Steam은 httpx.MockTransport로 흉내 낸 로컬 응답을 쓴다.
+DB는 설정의 DB(POSTGRES_*)에 직접 쓰고, 이번 실행에서 만든 user/identity(bench-<run>-*)는 끝나면 지운다.
+
+- google_login: POST /auth/google/verify-id-token (RS256 id_token 검증 + 기존 user 로그인 + 토큰 발급)
+- steam_login: POST /auth/steam/login (기존 user 로그인)
+- refresh: POST /auth/refresh (토큰 회전, 체인마다 직전 응답의 refresh_token을 다음 요청에 쓴다)
+- users_me: GET /users/me
+- session_poll: GET /auth/session/poll (ready/pending 세션 반반)
+
+user는 측정 전에 모두 가입시켜 두므로 로그인 시나리오는 기존 user 경로를 잰다.
+시나리오마다 --rounds번 돌려 p95가 가장 낮은 회차의 처리량(req/s)과 p50/p95/p99를 출력하고,
+기준값 파일이 있으면 비교한다. 기준값은 회차 중앙값으로 저장하고 비교는 가장 좋은 회차로 해서,
+한두 회차가 튀는 잡음은 넘기고 모든 회차가 느려진 경우만 잡는다.
+p95가 기준보다 --tolerance 넘게 느려지거나 처리량이 그만큼 떨어지거나 오류 응답이 있으면 exit code 1로 끝난다.
+기준값은 머신에 따라 다르므로 비교할 머신(CI runner 등)에서 --save-baseline으로 만든다.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import httpx
+from authlib.jose import JsonWebKey, JsonWebToken
+from fakeredis import aioredis as fakeredis
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.session import engine
+from app.models.identity import Identity
+from app.models.user import User
+from app.utils import auth_session as a_sess
+from app.utils import redis_client
+from app.utils.upstream import google_http, steam_http
+
+BASELINE = Path(__file__).with_name("baselines") / "asgi_load.json"
+_KID = "bench-kid"
+_CLIENT_ID = "bench-client"
+
+Call = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+Prepare = Callable[[], Awaitable[None]] | None
+
+
+def _install_stand_ins(run: str) -> JsonWebKey:
+    """Google JWKS / Steam AuthenticateUserTicket 응답을 로컬에서 돌려준다."""
+    key = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": _KID})
+    jwks = {"keys": [key.as_dict(is_private=False)]}
+
+    def google(req: httpx.Request) -> httpx.Response:
+        if req.url.path == "/oauth2/v3/certs":
+            return httpx.Response(200, json=jwks, headers={"cache-control": "public, max-age=3600"})
+        return httpx.Response(404)
+
+    def steam(req: httpx.Request) -> httpx.Response:
+        ticket = req.url.params.get("ticket", "")
+        return httpx.Response(200, json={"response": {"params": {"result": "OK", "steamid": f"bench-{run}-{ticket}"}}})
+
+    for up, handler in ((google_http, google), (steam_http, steam)):
+        up._transport = httpx.MockTransport(handler)
+        up._client = None
+    settings.GOOGLE_CLIENT_IDS = _CLIENT_ID
+    settings.STEAM_WEB_API_KEY = settings.STEAM_WEB_API_KEY or "bench"
+    return key
+
+
+def _id_token(key: JsonWebKey, sub: str) -> str:
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com", "aud": _CLIENT_ID, "sub": sub,
+        "iat": now, "exp": now + 3600, "email": f"{sub}@example.com", "email_verified": True,
+    }
+    return JsonWebToken(["RS256"]).encode({"alg": "RS256", "kid": _KID}, claims, key).decode()
+
+
+async def _drive(c: httpx.AsyncClient, call: Call, n: int, concurrency: int, ok: set[int]) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    next_i = 0
+
+    async def worker() -> None:
+        nonlocal next_i, errors
+        while next_i < n:
+            i, next_i = next_i, next_i + 1
+            t0 = time.perf_counter()
+            res = await call(c, i)
+            latencies.append(time.perf_counter() - t0)
+            if res.status_code not in ok:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - t0
+
+
+def _summary(latencies: list[float], errors: int, wall: float) -> dict[str, float]:
+    q = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies), "errors": errors, "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(q[49] * 1e3, 3), "p95_ms": round(q[94] * 1e3, 3), "p99_ms": round(q[98] * 1e3, 3),
+    }
+
+
+def _compare(name: str, cur: dict, base: dict | None, tolerance: float) -> list[str]:
+    problems = []
+    if cur["errors"]:
+        problems.append(f"{name}: {cur['errors']} error responses")
+    if base is None:
+        return problems
+    if cur["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+        problems.append(f"{name}: p95 {cur['p95_ms']:.2f}ms > baseline {base['p95_ms']:.2f}ms +{tolerance:.0%}")
+    if cur["rps"] < base["rps"] * (1 - tolerance):
+        problems.append(f"{name}: {cur['rps']:.0f} req/s < baseline {base['rps']:.0f} req/s -{tolerance:.0%}")
+    return problems
+
+
+async def _scenarios(
+    c: httpx.AsyncClient, key: JsonWebKey, run: str, users: int,
+) -> dict[str, tuple[Call, set[int], Prepare]]:
+    v1 = settings.API_V1_STR
+    id_tokens = [_id_token(key, f"bench-{run}-g{i}") for i in range(users)]
+
+    async def google_login(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.post(f"{v1}/auth/google/verify-id-token", json={"id_token": id_tokens[i % users]})
+
+    async def steam_login(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.post(f"{v1}/auth/steam/login", json={"ticket": f"s{i % users}"})
+
+    # 가입은 측정에서 빼고, refresh / users_me / session_poll이 쓸 토큰과 세션을 미리 만든다
+    logins = [(await google_login(c, i)).json() for i in range(users)]
+    for i in range(users):
+        await steam_login(c, i)
+    access = [t["access_token"] for t in logins]
+    chains: asyncio.Queue[str] = asyncio.Queue()
+
+    async def new_chains() -> None:
+        # 로그인 시나리오가 user당 세션 상한(REFRESH_MAX_SESSIONS_PER_USER)을 넘겨 예전 토큰이 밀려났으므로 새로 받는다
+        while not chains.empty():
+            chains.get_nowait()
+        for i in range(users):
+            chains.put_nowait((await google_login(c, i)).json()["refresh_token"])
+
+    async def refresh(c: httpx.AsyncClient, _i: int) -> httpx.Response:
+        token = await chains.get()
+        res = await c.post(f"{v1}/auth/refresh", json={"refresh_token": token})
+        chains.put_nowait(res.json()["refresh_token"] if res.status_code == 200 else token)
+        return res
+
+    async def users_me(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.get(f"{v1}/users/me", headers={"Authorization": f"Bearer {access[i % users]}"})
+
+    r = redis_client.get_redis()
+    sids = []
+    for i in range(users):
+        sid = (await a_sess.create_auth_session(r, "bench-verifier"))["session_id"]
+        if i % 2 == 0:
+            await a_sess.set_result(r, sid, logins[i])
+        sids.append(sid)
+
+    async def session_poll(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.get(f"{v1}/auth/session/poll", params={"sid": sids[i % users]})
+
+    return {
+        "google_login": (google_login, {200}, None),
+        "steam_login": (steam_login, {200}, None),
+        "refresh": (refresh, {200}, new_chains),
+        "users_me": (users_me, {200}, None),
+        "session_poll": (session_poll, {200, 202}, None),
+    }
+
+
+async def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=300, help="시나리오당 측정 요청 수")
+    ap.add_argument("--warmup", type=int, default=50, help="시나리오당 측정 전 요청 수")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--rounds", type=int, default=5, help="시나리오당 측정 회차 (가장 좋은 회차를 쓴다)")
+    ap.add_argument("--users", type=int, default=100, help="시나리오가 돌려 쓰는 user/세션 수")
+    ap.add_argument("--only", default="", help="쉼표로 구분한 시나리오 이름")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="기준 대비 허용 비율")
+    args = ap.parse_args()
+
+    settings.DB_SLOW_QUERY_MS = 0
+    redis_client._redis = fakeredis.FakeRedis(decode_responses=True)
+    run = uuid.uuid4().hex[:8]
+    key = _install_stand_ins(run)
+
+    from app.main import app, lifespan
+
+    logging.getLogger().setLevel(logging.WARNING)
+    settings.WARMUP_ENABLED = False
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() and not args.save_baseline else {}
+    results: dict[str, dict] = {}
+    problems: list[str] = []
+    print(f"requests={args.requests} concurrency={args.concurrency} users={args.users} run={run}")
+    try:
+        async with lifespan(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+                scenarios = await _scenarios(c, key, run, args.users)
+                only = {s.strip() for s in args.only.split(",") if s.strip()}
+                for name, (call, ok, prepare) in scenarios.items():
+                    if only and name not in only:
+                        continue
+                    if prepare is not None:
+                        await prepare()
+                    await _drive(c, call, args.warmup, args.concurrency, ok)
+                    rounds = []
+                    for _ in range(args.rounds):
+                        gc.collect()
+                        rounds.append(_summary(*await _drive(c, call, args.requests, args.concurrency, ok)))
+                    rounds.sort(key=lambda s: s["p95_ms"])
+                    errors = sum(s["errors"] for s in rounds)
+                    cur = {**rounds[0], "errors": errors}
+                    results[name] = {**rounds[len(rounds) // 2], "errors": errors}
+                    base = baseline.get(name)
+                    delta = f"  (baseline p95={base['p95_ms']:.2f}ms rps={base['rps']:.0f})" if base else ""
+                    print(
+                        f"{name:<13} {cur['rps']:>8.1f} req/s  p50={cur['p50_ms']:.2f}ms  p95={cur['p95_ms']:.2f}ms"
+                        f"  p99={cur['p99_ms']:.2f}ms  errors={cur['errors']}{delta}"
+                    )
+                    problems += _compare(name, cur, base, args.tolerance)
+    finally:
+        async with engine.begin() as conn:
+            user_ids = select(Identity.user_id).where(Identity.provider_sub.like(f"bench-{run}-%"))
+            await conn.execute(delete(User).where(User.id.in_(user_ids)))
+        await engine.dispose()
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+    for p in problems:
+        print(f"REGRESSION {p}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
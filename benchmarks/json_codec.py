@@ -0,0 +1,77 @@
+"""JSON 직렬화: stdlib json 경로 vs orjson 경로 (app.core.serialization) 비교.
+
+    uv run python -m benchmarks.json_codec
+    uv run python -m benchmarks.json_codec --number 20000 --repeat 7
+
+- response: response_model 응답 한 번에 드는 직렬화 (jsonable_encoder + 응답 클래스 render)
+- jsonb: identity.profile_json 쓰기 (엔진 json_serializer)
+- redis: refresh 레코드 / auth 세션 결과 encode+decode
+
+각 항목마다 timeit을 repeat번 돌려 가장 빠른 회차 기준 1회당 시간과 절약분을 출력한다.
+"""
+from __future__ import annotations
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import ORJSONResponse, dumps, dumps_str, loads
+from app.schemas.auth_io import TokenResponse
+from app.schemas.user import UserOut
+
+
+def _samples() -> dict:
+    now = datetime.now(timezone.utc)
+    token = TokenResponse(
+        access_token="eyJhbGciOiJIUzI1NiJ9." + "a" * 180 + ".sig", refresh_token="r" * 43,
+        expires_in=3600, is_new_user=False,
+    )
+    user = UserOut(
+        id=uuid.uuid4(), uid="1234567890", nickname="상철", created_at=now, updated_at=now, last_login_at=now,
+    )
+    claims = {
+        "iss": "https://accounts.google.com", "sub": "1" * 21, "aud": "cid", "email": "user@example.com",
+        "email_verified": True, "name": "홍길동", "picture": "https://lh3.googleusercontent.com/a/x", "iat": 1, "exp": 2,
+    }
+    record = {"user_id": str(uuid.uuid4()), "iat": 1, "exp": 2}
+    return {"token": token, "user": user, "claims": claims, "record": record}
+
+
+def _bench(fn, number: int, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _row(name: str, old: float, new: float) -> None:
+    print(f"{name:<22} stdlib={old * 1e6:>7.2f}us  orjson={new * 1e6:>7.2f}us  saved={(old - new) * 1e6:>6.2f}us  x{old / new:.2f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--number", type=int, default=5000, help="회차당 호출 수")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    s = _samples()
+    b = lambda fn: _bench(fn, args.number, args.repeat)  # noqa: E731
+
+    print(f"number={args.number} repeat={args.repeat}")
+    for name in ("token", "user"):
+        model = s[name]
+        _row(
+            f"response:{type(model).__name__}",
+            b(lambda: JSONResponse(jsonable_encoder(model)).body),
+            b(lambda: ORJSONResponse(jsonable_encoder(model)).body),
+        )
+    claims = s["claims"]
+    _row("jsonb:claims", b(lambda: json.dumps(jsonable_encoder(claims))), b(lambda: dumps_str(claims)))
+    record = s["record"]
+    _row("redis:refresh", b(lambda: json.loads(json.dumps(record))), b(lambda: loads(dumps_str(record))))
+    result = s["token"].model_dump()
+    _row("redis:session", b(lambda: json.loads(json.dumps(result))), b(lambda: loads(dumps(result))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""access token encode/decode 처리량: codec 백엔드별 비교.
+
+    uv run python -m benchmarks.jwt_codec
+    uv run python -m benchmarks.jwt_codec --number 20000 --repeat 7
+
+각 백엔드마다 timeit을 repeat번 돌려 가장 빠른 회차 기준 ops/s와 1회당 시간을 출력한다.
+"""
+from __future__ import annotations
+import argparse
+import time
+import timeit
+
+from app.utils.jwt_tools import AuthlibCodec, FastHS256Codec
+
+_SECRET = "bench-secret"
+_ISSUER = "sangcheol-odyssey"
+
+
+def _claims() -> dict:
+    now = int(time.time())
+    return {"sub": "00000000-0000-0000-0000-000000000000", "typ": "access", "exp": now + 3600, "iat": now, "iss": _ISSUER}
+
+
+def _bench(fn, number: int, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--number", type=int, default=5000, help="회차당 호출 수")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    claims = _claims()
+    print(f"number={args.number} repeat={args.repeat}")
+    for name, cls in (("fast", FastHS256Codec), ("authlib", AuthlibCodec)):
+        codec = cls(_SECRET, _ISSUER)
+        token = codec.encode(claims)
+        for op, fn in (("encode", lambda: codec.encode(claims)), ("decode", lambda: codec.decode(token))):
+            per_op = _bench(fn, args.number, args.repeat)
+            print(f"{name:<8} {op:<7} {1 / per_op:>10.0f} ops/s  {per_op * 1e6:>7.2f}us/op")
+
+
+if __name__ == "__main__":
+    main()
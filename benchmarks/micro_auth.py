@@ -0,0 +1,136 @@
+"""로그인/요청마다 도는 auth 유틸 함수 microbenchmark. 결과를 JSON으로 남기고 이전 결과와 비교한다.
+
+    uv run python -m benchmarks.micro_auth
+    uv run python -m benchmarks.micro_auth --repeat 15 --min-time 0.5
+    uv run python -m benchmarks.micro_auth --only hash_refresh,redis_token_key
+    uv run python -m benchmarks.micro_auth --compare benchmarks/results/micro_auth-<rev>.json
+
+각 항목은 timeit.autorange로 회차당 --min-time초 이상 걸리는 호출 수를 정한 뒤 --repeat번 잰다 (GC는 끔).
+1회당 시간의 최솟값/중앙값/IQR과 변동(IQR/중앙값)을 출력한다. 비교는 중앙값 기준이고,
+차이가 양쪽 IQR을 합친 것보다 작으면 잡음(~)으로 표시한다.
+결과는 --out(기본 benchmarks/results/micro_auth-<git rev>.json)에 저장한다.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import settings
+
+RESULTS_DIR = Path(__file__).with_name("results")
+
+
+def _git_rev() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _cases() -> dict[str, Callable[[], object]]:
+    settings.JWT_SECRET = settings.JWT_SECRET or "bench-secret"
+
+    from app.deps.auth import _decode, token_cache
+    from app.services.user_service import NICKNAME_RE
+    from app.utils.auth_session import _nonce, _sid
+    from app.utils.jwt_tools import issue_access_token
+    from app.utils.refresh_tools import generate_refresh_plain, hash_refresh, redis_token_key
+
+    plain = generate_refresh_plain()
+    token_hash = hash_refresh(plain)
+    sub = "00000000-0000-0000-0000-000000000000"
+    access = issue_access_token(sub)
+    _decode(access)
+
+    def decode_miss() -> object:
+        token_cache.clear()
+        return _decode(access)
+
+    return {
+        "generate_refresh_plain": generate_refresh_plain,
+        "hash_refresh": lambda: hash_refresh(plain),
+        "redis_token_key": lambda: redis_token_key(token_hash),
+        "issue_access_token": lambda: issue_access_token(sub),
+        "_decode[cached]": lambda: _decode(access),
+        "_decode[miss]": decode_miss,
+        "NICKNAME_RE[ok]": lambda: NICKNAME_RE.match("상철_Odyssey.01"),
+        "NICKNAME_RE[bad]": lambda: NICKNAME_RE.match("bad nickname with spaces!"),
+        "_sid": _sid,
+        "_nonce": _nonce,
+    }
+
+
+def _measure(fn: Callable[[], object], repeat: int, min_time: float) -> dict[str, float | int]:
+    timer = timeit.Timer(fn)
+    # autorange는 0.2초 기준이라 min_time에 맞춰 호출 수를 늘린다
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    per_op = sorted(t / number * 1e9 for t in timer.repeat(repeat=repeat, number=number))
+    q1, med, q3 = statistics.quantiles(per_op, n=4, method="inclusive")
+    return {
+        "number": number, "repeat": repeat,
+        "min_ns": round(per_op[0], 1), "median_ns": round(med, 1),
+        "iqr_ns": round(q3 - q1, 1), "rel_iqr": round((q3 - q1) / med, 4) if med else 0.0,
+    }
+
+
+def _delta(cur: dict, old: dict | None) -> str:
+    if old is None:
+        return ""
+    diff = cur["median_ns"] - old["median_ns"]
+    pct = diff / old["median_ns"] * 100 if old["median_ns"] else 0.0
+    noise = abs(diff) <= cur["iqr_ns"] + old["iqr_ns"]
+    return f"  vs {old['median_ns']:>10.1f}ns  {pct:+6.1f}%{' ~' if noise else ''}"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=9, help="항목당 측정 회차")
+    ap.add_argument("--min-time", type=float, default=0.2, help="회차당 최소 측정 시간(초)")
+    ap.add_argument("--only", default="", help="쉼표로 구분한 항목 이름")
+    ap.add_argument("--out", type=Path, default=None, help="결과 JSON 경로")
+    ap.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    args = ap.parse_args()
+
+    rev = _git_rev()
+    previous = json.loads(args.compare.read_text())["results"] if args.compare else {}
+    only = {s.strip() for s in args.only.split(",") if s.strip()}
+    results: dict[str, dict] = {}
+    print(f"rev={rev} python={platform.python_version()} repeat={args.repeat} min_time={args.min_time}s")
+    for name, fn in _cases().items():
+        if only and name not in only:
+            continue
+        fn()
+        cur = _measure(fn, args.repeat, args.min_time)
+        results[name] = cur
+        print(
+            f"{name:<24} median={cur['median_ns']:>10.1f}ns  min={cur['min_ns']:>10.1f}ns"
+            f"  iqr={cur['rel_iqr'] * 100:>5.1f}%{_delta(cur, previous.get(name))}"
+        )
+
+    out = args.out or RESULTS_DIR / f"micro_auth-{rev}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({
+        "rev": rev,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+        "results": results,
+    }, indent=2, ensure_ascii=False) + "\n")
+    print(f"saved {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""refresh 토큰 회전: 기존 다중 왕복 경로 vs Lua 스크립트 단일 왕복 경로 비교.
+
+    uv run python -m benchmarks.refresh_rotation                 # fakeredis
+    uv run python -m benchmarks.refresh_rotation --rtt-ms 0.5    # fakeredis + 왕복 지연 흉내
+    uv run python -m benchmarks.refresh_rotation --redis-url redis://localhost:6379/15
+
+fakeredis는 Lua를 파이썬(lupa)에서 매번 새로 실행하므로 스크립트 경로의 절대 시간이 실제 Redis보다
+훨씬 느리게 나온다. fakeredis에서는 rtt/op를, 지연 수치는 --redis-url로 실제 Redis에서 비교한다.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import statistics
+import time
+
+from fakeredis import aioredis as fakeredis
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.utils import refresh_tools as rt
+from app.utils.refresh_store import load_scripts, rotate_refresh
+
+
+class _RoundTripCounter:
+    """명령 한 번을 왕복 한 번으로 세고, rtt가 주어지면 그만큼 대기해 네트워크 지연을 흉내낸다."""
+
+    rtt: float = 0.0
+    round_trips: int = 0
+
+    async def execute_command(self, *args, **options):
+        self.round_trips += 1
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+        return await super().execute_command(*args, **options)
+
+
+class _CountingFakeRedis(_RoundTripCounter, fakeredis.FakeRedis):
+    pass
+
+
+class _CountingRedis(_RoundTripCounter, Redis):
+    pass
+
+
+async def legacy_rotate(r: Redis, old_hash: str, new_hash: str) -> str | None:
+    """스크립트 도입 전 rotate_refresh_and_issue의 Redis 접근 순서 (SET 인덱스)."""
+    record_json = await r.getdel(rt.redis_token_key(old_hash))
+    if not record_json:
+        return None
+    user_id = rt.from_json(record_json)["user_id"]
+    await r.srem(rt.redis_user_set_key(user_id), old_hash)
+    new_rec = rt.RefreshRecord(user_id=user_id, iat=rt.now_ts(), exp=rt.exp_ts())
+    await r.setex(rt.redis_token_key(new_hash), int(settings.REFRESH_EXPIRES_SEC), rt.to_json(new_rec))
+    await r.sadd(rt.redis_user_set_key(user_id), new_hash)
+    return user_id
+
+
+async def _seed(r: Redis, chains: int) -> list[str]:
+    heads = []
+    for i in range(chains):
+        h = f"bench-{i}-0"
+        rec = rt.RefreshRecord(user_id=f"bench-user-{i}", iat=rt.now_ts(), exp=rt.exp_ts())
+        await r.setex(rt.redis_token_key(h), 600, rt.to_json(rec))
+        heads.append(h)
+    return heads
+
+
+async def _run(r: Redis, fn, heads: list[str], steps: int) -> list[float]:
+    latencies: list[float] = []
+
+    async def chain(i: int) -> None:
+        cur = heads[i]
+        for step in range(1, steps + 1):
+            nxt = f"bench-{i}-{step}"
+            t0 = time.perf_counter()
+            user_id = await fn(r, cur, nxt)
+            latencies.append(time.perf_counter() - t0)
+            assert user_id == f"bench-user-{i}"
+            cur = nxt
+
+    await asyncio.gather(*(chain(i) for i in range(len(heads))))
+    return latencies
+
+
+def _report(name: str, latencies: list[float], elapsed: float, round_trips: int) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<8} {len(latencies) / elapsed:>10.0f} ops/s  rtt/op={round_trips / len(latencies):.2f}"
+        f"  p50={q[49] * 1e3:.3f}ms  p95={q[94] * 1e3:.3f}ms  p99={q[98] * 1e3:.3f}ms"
+    )
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--redis-url", default=None, help="실제 Redis (지정하지 않으면 fakeredis)")
+    ap.add_argument("--rtt-ms", type=float, default=0.0, help="fakeredis 명령당 흉내낼 왕복 지연")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--steps", type=int, default=40)
+    args = ap.parse_args()
+
+    if args.redis_url:
+        r = _CountingRedis.from_url(args.redis_url, decode_responses=True)
+    else:
+        r = _CountingFakeRedis(decode_responses=True)
+        r.rtt = args.rtt_ms / 1000
+
+    await r.flushdb()
+    await load_scripts(r)
+    print(f"concurrency={args.concurrency} steps={args.steps} backend={args.redis_url or 'fakeredis'} rtt_ms={args.rtt_ms}")
+    for name, fn in (("legacy", legacy_rotate), ("script", rotate_refresh)):
+        heads = await _seed(r, args.concurrency)
+        r.round_trips = 0
+        t0 = time.perf_counter()
+        latencies = await _run(r, fn, heads, args.steps)
+        _report(name, latencies, time.perf_counter() - t0, r.round_trips)
+        await r.flushdb()
+    await r.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""소셜 로그인 user 조회/생성: 기존 ORM 다중 왕복 경로 vs CTE upsert 단일 statement 경로 비교.
+
+    uv run python -m benchmarks.social_login
+    uv run python -m benchmarks.social_login --concurrency 16 --logins 50
+
+설정의 DB(POSTGRES_*)에 직접 쓴다. 이번 실행에서 만든 provider_sub(bench-<run>-*)의 user/identity는 끝나면 지운다.
+user 캐시 무효화는 fakeredis로 보낸다.
+
+- new: 서로 다른 provider_sub로 첫 로그인
+- existing: 같은 provider_sub로 다시 로그인
+- race: 같은 provider_sub로 동시에 첫 로그인. user가 하나만 생기고 모두 같은 user를 받아야 한다.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fakeredis import aioredis as fakeredis
+from sqlalchemy import delete, event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.serialization import dumps_str, loads
+from app.models.identity import Identity, Provider
+from app.models.user import User
+from app.repositories.identity_repo import IdentityRepository
+from app.repositories.user_repo import UserRepository
+from app.services.uid_pool import _gen_numeric_uid
+from app.services.user_service import UserService
+from app.utils import redis_client
+
+
+async def legacy_login(db: AsyncSession, provider_sub: str) -> tuple[uuid.UUID, bool]:
+    """upsert 도입 전 create_or_get_social_user의 DB 접근 순서."""
+    ids, users = IdentityRepository(db), UserRepository(db)
+    identity = await ids.get_by_provider_sub(Provider.google.value, provider_sub)
+    if identity:
+        user = await users.get(identity.user_id)
+        user.last_login_at = datetime.now(timezone.utc)
+        await db.commit()
+        return user.id, False
+    user = User(uid=None, nickname=None, last_login_at=datetime.now(timezone.utc))
+    await users.add(user)
+    await ids.add(Identity(user_id=user.id, provider=Provider.google.value, provider_sub=provider_sub))
+    user.uid = _gen_numeric_uid()  # 충돌 재시도(rollback 후 다시 flush)는 생략
+    await db.flush()
+    await db.commit()
+    return user.id, True
+
+
+async def upsert_login(db: AsyncSession, provider_sub: str) -> tuple[uuid.UUID, bool]:
+    user, is_new = await UserService(db).create_or_get_social_user(Provider.google, provider_sub)
+    return user.id, is_new
+
+
+async def _run(Session, fn, subs: list[str], concurrency: int) -> tuple[list[float], list, int]:
+    latencies: list[float] = []
+    results: list = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(sub: str) -> None:
+        nonlocal errors
+        async with sem, Session() as db:
+            t0 = time.perf_counter()
+            try:
+                results.append(await fn(db, sub))
+            except IntegrityError:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one(s) for s in subs))
+    return latencies, results, errors
+
+
+def _report(name: str, scenario: str, latencies: list[float], stmts: int, errors: int, extra: str = "") -> None:
+    n = len(latencies)
+    if n < 2:
+        print(f"{name:<7} {scenario:<9} ok={n} errors={errors} {extra}")
+        return
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<7} {scenario:<9} ok={n:<4} errors={errors:<3} stmts/login={stmts / n:.2f}"
+        f"  p50={q[49] * 1e3:.2f}ms  p95={q[94] * 1e3:.2f}ms {extra}"
+    )
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--logins", type=int, default=40, help="시나리오당 로그인 수")
+    args = ap.parse_args()
+
+    redis_client._redis = fakeredis.FakeRedis(decode_responses=True)
+    engine = create_async_engine(
+        settings.db_url_async, pool_size=args.concurrency, json_serializer=dumps_str, json_deserializer=loads,
+    )
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    counter = {"stmts": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(*_):
+        counter["stmts"] += 1
+
+    run = uuid.uuid4().hex[:8]
+    print(f"concurrency={args.concurrency} logins={args.logins} run={run}")
+    try:
+        for name, fn in (("legacy", legacy_login), ("upsert", upsert_login)):
+            subs = [f"bench-{run}-{name}-{i}" for i in range(args.logins)]
+            for scenario in ("new", "existing"):
+                counter["stmts"] = 0
+                latencies, _, errors = await _run(Session, fn, subs, args.concurrency)
+                _report(name, scenario, latencies, counter["stmts"], errors)
+
+            counter["stmts"] = 0
+            race = [f"bench-{run}-{name}-race"] * args.concurrency
+            latencies, results, errors = await _run(Session, fn, race, args.concurrency)
+            users = len({user_id for user_id, _ in results})
+            _report(name, "race", latencies, counter["stmts"], errors, f"distinct_users={users}")
+    finally:
+        async with engine.begin() as conn:
+            user_ids = select(Identity.user_id).where(Identity.provider_sub.like(f"bench-{run}-%"))
+            await conn.execute(delete(User).where(User.id.in_(user_ids)))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
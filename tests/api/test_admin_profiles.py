@@ -0,0 +1,53 @@
+import cProfile
+import marshal
+import pytest
+
+from app.api.v1.endpoints import admin_profiles
+from app.utils.profiler import make_profile_token, profile_store
+
+
+@pytest.fixture
+def profiling(monkeypatch):
+    monkeypatch.setattr(admin_profiles.settings, "PROFILER_ENABLED", True)
+    monkeypatch.setattr(admin_profiles.settings, "PROFILER_SECRET", "s3cret")
+    prof = cProfile.Profile()
+    prof.runcall(sum, range(10))
+    profile_store.add("/v1/users/me", prof)
+    yield {"X-Profile": make_profile_token("s3cret", 4_000_000_000)}
+    profile_store.clear()
+
+
+@pytest.mark.asyncio
+async def test_admin_profiles_require_token(client, profiling):
+    assert (await client.get("/v1/admin/profiles")).status_code == 403
+    bad = make_profile_token("other", 4_000_000_000)
+    assert (await client.get("/v1/admin/profiles", headers={"X-Profile": bad})).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_admin_profiles_hidden_when_disabled(client, monkeypatch):
+    monkeypatch.setattr(admin_profiles.settings, "PROFILER_ENABLED", False)
+    headers = {"X-Profile": make_profile_token("s3cret", 4_000_000_000)}
+    assert (await client.get("/v1/admin/profiles", headers=headers)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_admin_profiles_list_download_and_clear(client, profiling):
+    res = await client.get("/v1/admin/profiles", headers=profiling)
+    assert res.status_code == 200 and res.json()[0]["route"] == "/v1/users/me"
+
+    res = await client.get("/v1/admin/profiles/download", params={"route": "/v1/users/me"}, headers=profiling)
+    assert res.status_code == 200
+    assert res.headers["content-disposition"] == 'attachment; filename="v1_users_me.prof"'
+    assert isinstance(marshal.loads(res.content), dict)
+
+    res = await client.get(
+        "/v1/admin/profiles/download", params={"route": "/v1/users/me", "format": "text"}, headers=profiling,
+    )
+    assert "function calls" in res.text
+
+    missing = await client.get("/v1/admin/profiles/download", params={"route": "/x"}, headers=profiling)
+    assert missing.status_code == 404
+
+    assert (await client.delete("/v1/admin/profiles", headers=profiling)).status_code == 204
+    assert (await client.get("/v1/admin/profiles", headers=profiling)).json() == []
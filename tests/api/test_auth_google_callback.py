@@ -9,7 +9,7 @@ from app.core.session import get_session
 from app.core.config import settings
 from app.utils.redis_client import get_redis
 from app.utils.auth_session import (
-    set_result, set_error, get_status, get_code_verifier
+    set_result, set_error, get_status, get_callback_state
 )
 from app.schemas.google_oauth import GoogleTokenRequest
 from app.schemas.auth_io import TokenResponse
@@ -43,7 +43,7 @@ async def google_callback(
         await set_error(r, sid, "SERVER_MISCONFIG")
         raise HTTPException(status_code=500, detail="SERVER_MISCONFIG")
 
-    cv = await get_code_verifier(r, sid)
+    _, cv = await get_callback_state(r, sid)
     if not cv:
         raise HTTPException(status_code=404, detail="session not found")
 
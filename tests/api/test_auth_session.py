@@ -2,6 +2,12 @@ import json
 import pytest
 from app.utils import auth_session as a_sess
 
+
+async def _put_session(r, sid, **fields):
+    rec = {"status": "pending", "code_verifier": "v", "nonce": "n", "created_at": 0} | fields
+    await r.hset(a_sess._key(sid), mapping=rec)
+    await r.expire(a_sess._key(sid), 600)
+
 @pytest.mark.asyncio
 async def test_session_init_returns_auth_url_and_sid(client, fake_redis):
     res = await client.post("/v1/auth/session/init", json={"code_verifier": "abc.verifier-123"})
@@ -11,14 +17,12 @@ async def test_session_init_returns_auth_url_and_sid(client, fake_redis):
     sid = data["session_id"]
     status, result, err = await a_sess.get_status(fake_redis, sid)
     assert status == "pending"
-    cv = await a_sess.get_code_verifier(fake_redis, sid)
-    assert cv == "abc.verifier-123"
+    assert await a_sess.get_callback_state(fake_redis, sid) == ("pending", "abc.verifier-123")
 
 @pytest.mark.asyncio
 async def test_session_poll_pending(client, fake_redis):
-    rec = {"status":"pending","code_verifier":"v","nonce":"n","created_at":0,"result":None,"error":None}
     sid = "S123"
-    await fake_redis.setex(a_sess._key(sid), 600, json.dumps(rec))
+    await _put_session(fake_redis, sid)
     res = await client.get("/v1/auth/session/poll", params={"sid": sid})
     assert res.status_code == 202
     assert res.json() == {"message":"pending"}
@@ -27,8 +31,7 @@ async def test_session_poll_pending(client, fake_redis):
 async def test_session_poll_ready(client, fake_redis):
     sid = "READY1"
     token = {"access_token":"acc","refresh_token":"ref","expires_in":3600,"token_type":"bearer","is_new_user":False}
-    rec = {"status":"ready","code_verifier":"v","nonce":"n","created_at":0,"result":token,"error":None}
-    await fake_redis.setex(a_sess._key(sid), 600, json.dumps(rec))
+    await _put_session(fake_redis, sid, status="ready", result=json.dumps(token))
     res = await client.get("/v1/auth/session/poll", params={"sid": sid})
     assert res.status_code == 200
     assert res.json()["access_token"] == "acc"
@@ -36,8 +39,7 @@ async def test_session_poll_ready(client, fake_redis):
 @pytest.mark.asyncio
 async def test_session_poll_error(client, fake_redis):
     sid = "ERR1"
-    rec = {"status":"error","code_verifier":"v","nonce":"n","created_at":0,"result":None,"error":"google_error:access_denied"}
-    await fake_redis.setex(a_sess._key(sid), 600, json.dumps(rec))
+    await _put_session(fake_redis, sid, status="error", error="google_error:access_denied")
     res = await client.get("/v1/auth/session/poll", params={"sid": sid})
     assert res.status_code == 400
     assert "google_error" in res.json()["detail"]
@@ -46,3 +48,96 @@ async def test_session_poll_error(client, fake_redis):
 async def test_session_poll_not_found(client):
     res = await client.get("/v1/auth/session/poll", params={"sid": "NOPE"})
     assert res.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_google_callback_reads_session_once_and_completes(client, fake_redis, monkeypatch):
+    from types import SimpleNamespace
+    from app.core.session import get_session
+    from app.api.v1.endpoints import auth_google_callback
+    from app.main import app
+    from app.schemas.auth_io import TokenResponse
+    from app.services import auth_service
+
+    monkeypatch.setattr(auth_google_callback.settings, "GOOGLE_CLIENT_ID_WEB", "cid")
+    monkeypatch.setattr(auth_google_callback.settings, "GOOGLE_REDIRECT_URI", "http://localhost/cb")
+
+    sid = (await a_sess.create_auth_session(fake_redis, "cv-1"))["session_id"]
+    token = TokenResponse(access_token="acc", refresh_token="ref", expires_in=3600, is_new_user=True)
+
+    async def fake_exchange(req):
+        assert req.code_verifier == "cv-1"
+        return SimpleNamespace(id_token="idt")
+
+    async def fake_verify(id_token):
+        return SimpleNamespace(sub="s")
+
+    async def fake_login(db, claims):
+        return token
+
+    monkeypatch.setattr(auth_service, "exchange_google_token", fake_exchange)
+    monkeypatch.setattr(auth_service, "verify_google_id_token", fake_verify)
+    monkeypatch.setattr(auth_service, "handle_google_login", fake_login)
+    app.dependency_overrides[get_session] = lambda: None
+
+    reads = []
+    orig_hmget, orig_get, orig_hget = fake_redis.hmget, fake_redis.get, fake_redis.hget
+    async def hmget(*a, **k):
+        reads.append("hmget")
+        return await orig_hmget(*a, **k)
+    async def get(*a, **k):
+        reads.append("get")
+        return await orig_get(*a, **k)
+    async def hget(*a, **k):
+        reads.append("hget")
+        return await orig_hget(*a, **k)
+    monkeypatch.setattr(fake_redis, "hmget", hmget)
+    monkeypatch.setattr(fake_redis, "get", get)
+    monkeypatch.setattr(fake_redis, "hget", hget)
+
+    try:
+        res = await client.get("/v1/auth/google/callback", params={"state": sid, "code": "c"})
+        assert res.status_code == 200 and "Login complete" in res.text
+        assert reads == ["hmget"]
+
+        # 같은 state로 다시 들어온 callback은 토큰 교환 전에 거절한다
+        res = await client.get("/v1/auth/google/callback", params={"state": sid, "code": "c"})
+        assert res.status_code == 409
+    finally:
+        app.dependency_overrides.clear()
+
+    res = await client.get("/v1/auth/session/poll", params={"sid": sid})
+    assert res.status_code == 200 and res.json()["access_token"] == "acc"
+
+
+@pytest.mark.asyncio
+async def test_session_long_poll_returns_when_callback_completes(client, fake_redis, monkeypatch):
+    import asyncio
+    from app.api.v1.endpoints import auth_session as ep
+    from app.utils.auth_session_events import SessionNotifier
+
+    notifier = SessionNotifier()
+    monkeypatch.setattr(ep, "session_notifier", notifier)
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    token = {"access_token": "acc", "refresh_token": "ref", "expires_in": 3600, "token_type": "bearer", "is_new_user": False}
+
+    try:
+        poll = asyncio.create_task(client.get("/v1/auth/session/poll", params={"sid": sid, "wait": 10}))
+        while notifier.waiting == 0:
+            await asyncio.sleep(0)
+        assert not poll.done()
+
+        await a_sess.set_result(fake_redis, sid, token)
+        res = await asyncio.wait_for(poll, 2)
+        assert res.status_code == 200 and res.json()["access_token"] == "acc"
+
+        pending = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+        res = await client.get("/v1/auth/session/poll", params={"sid": pending, "wait": 0.05})
+        assert res.status_code == 202
+
+        # 상한보다 긴 wait은 거절하지 않고 상한까지만 기다린다
+        monkeypatch.setattr(ep.settings, "AUTH_POLL_MAX_WAIT_SEC", 0.05)
+        res = await asyncio.wait_for(client.get("/v1/auth/session/poll", params={"sid": pending, "wait": 3600}), 2)
+        assert res.status_code == 202
+    finally:
+        await notifier.close()
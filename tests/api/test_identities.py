@@ -6,6 +6,7 @@ from app.main import app
 from app.core.session import get_session
 from app.deps.auth import get_current_user_id
 from app.api.v1.endpoints import identities
+from app.services.user_service import UserService
 
 @pytest.mark.asyncio
 async def test_link_identity(monkeypatch, client):
@@ -39,8 +40,9 @@ async def test_unlink_identity(monkeypatch, client):
     app.dependency_overrides[get_session] = override_session
     app.dependency_overrides[get_current_user_id] = lambda: "user"
 
-    class DummySvc:
+    class DummySvc(UserService):
         def __init__(self, db):
+            super().__init__(db)
             self.ids = SimpleNamespace(delete_returning=AsyncMock(return_value=(1, [{"provider_sub": "sub"}])))
 
     monkeypatch.setattr(identities, "UserService", DummySvc)
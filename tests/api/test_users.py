@@ -51,3 +51,117 @@ async def test_set_nickname(monkeypatch, client):
     assert resp.status_code == 200
     assert resp.json()["nickname"] == "new"
     app.dependency_overrides.clear()
+
+@pytest.mark.asyncio
+async def test_users_me_is_cached_and_invalidated_on_write(client, async_session, monkeypatch):
+    from app.models.user import User
+    from app.services.user_service import UserService
+    from app.utils.user_cache import user_cache
+
+    user = User(uid="123456789", nickname=None)
+    async_session.add(user)
+    await async_session.commit()
+
+    async def override_session():
+        yield async_session
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_current_user_id] = lambda: str(user.id)
+    user_cache.clear_local()
+
+    calls = []
+    orig = UserService.require_user
+    async def counting_require_user(self, user_id):
+        calls.append(user_id)
+        return await orig(self, user_id)
+    monkeypatch.setattr(UserService, "require_user", counting_require_user)
+
+    for _ in range(3):
+        resp = await client.get("/v1/users/me")
+        assert resp.status_code == 200
+        assert resp.json()["nickname"] is None
+    assert len(calls) == 1
+
+    await UserService(async_session).update_nickname_once(user.id, "cached")
+
+    resp = await client.get("/v1/users/me")
+    assert resp.json()["nickname"] == "cached"
+    assert len(calls) == 2
+    app.dependency_overrides.clear()
+    user_cache.clear_local()
+
+@pytest.mark.asyncio
+async def test_search_users_by_prefix_with_keyset_pages(client, async_session):
+    from app.models.user import User
+
+    for i, nn in enumerate(["Alpha1", "alpha2", "ALPHA3", "alpine", "beta", "al_x", "alZ"]):
+        async_session.add(User(uid=str(100000000 + i), nickname=nn))
+    await async_session.commit()
+
+    async def override_session():
+        yield async_session
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_current_user_id] = lambda: "user"
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "ALP", "limit": 2} | ({"cursor": cursor} if cursor else {})
+        resp = await client.get("/v1/users/search", params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["items"]) <= 2
+        seen += [item["nickname"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["Alpha1", "alpha2", "ALPHA3", "alpine"]
+    assert set(body["items"][0]) == {"uid", "nickname"}
+
+    # LIKE 와일드카드는 글자 그대로 취급한다
+    resp = await client.get("/v1/users/search", params={"q": "al_"})
+    assert [item["nickname"] for item in resp.json()["items"]] == ["al_x"]
+
+    resp = await client.get("/v1/users/search", params={"q": "al", "cursor": "not-a-cursor"})
+    assert resp.status_code == 422
+    assert resp.json()["code"] == "INVALID_CURSOR"
+    app.dependency_overrides.clear()
+
+@pytest.mark.asyncio
+async def test_batch_profiles_one_query_then_cache(client, async_session, query_budget):
+    from app.models.user import User
+    from app.services.user_service import UserService
+
+    uids = [str(200000000 + i) for i in range(198)]
+    for i, uid in enumerate(uids):
+        async_session.add(User(uid=uid, nickname=f"p{i}"))
+    await async_session.commit()
+    first = await async_session.scalar(User.__table__.select().where(User.uid == uids[0]).with_only_columns(User.id))
+
+    async def override_session():
+        yield async_session
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_current_user_id] = lambda: "user"
+
+    body = {"uids": uids[:150] + ["999999999", "bad"] + uids[150:]}
+    with query_budget(1):
+        resp = await client.post("/v1/users/batch", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [u["uid"] for u in data["users"]] == uids
+    assert data["missing"] == ["999999999", "bad"]
+
+    with query_budget(1):
+        resp = await client.post("/v1/users/batch", json={"uids": uids[:2] + ["999999999"]})
+    assert resp.json()["users"][0] == {"uid": uids[0], "nickname": "p0"}
+
+    # 캐시만으로 끝나면 DB를 건드리지 않는다. 빠진 uid가 없으면 missing도 생략된다.
+    with query_budget(0):
+        resp = await client.post("/v1/users/batch", json={"uids": uids[:2]})
+    assert resp.json() == {"users": [{"uid": uids[0], "nickname": "p0"}, {"uid": uids[1], "nickname": "p1"}]}
+
+    await UserService(async_session).change_nickname(first, "renamed")
+    resp = await client.post("/v1/users/batch", json={"uids": uids[:1]})
+    assert resp.json()["users"][0]["nickname"] == "renamed"
+
+    resp = await client.post("/v1/users/batch", json={"uids": [str(300000000 + i) for i in range(201)]})
+    assert resp.status_code == 422
+    app.dependency_overrides.clear()
@@ -1,11 +1,13 @@
 import asyncio
 import json
 import os
+from contextlib import contextmanager
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 import sqlalchemy as sa
+from sqlalchemy.engine import Engine
 from fakeredis import aioredis as _fakeredis
 
 from app.main import app
@@ -48,9 +50,7 @@ async def fake_redis():
 def _override_redis(fake_redis, monkeypatch):
     import app.utils.redis_client as rc
     app.dependency_overrides[rc.get_redis] = lambda: fake_redis
-    rc._redis = fake_redis
-    import app.services.auth_service as auth_service
-    monkeypatch.setattr(auth_service, "redis_from_url", lambda *a, **k: fake_redis)
+    monkeypatch.setattr(rc, "_redis", fake_redis)
 
 @pytest_asyncio.fixture
 async def client(_override_redis, event_loop):
@@ -79,3 +79,29 @@ async def async_session():
         finally:
             await session.rollback()
     await engine.dispose()
+
+
+@pytest.fixture
+def query_budget():
+    """코드 경로가 선언한 statement 수를 넘기면 실패시킨다.
+
+        with query_budget(1) as stmts:
+            await repo.get(user_id)
+    """
+    @contextmanager
+    def _budget(limit: int):
+        stmts: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            stmts.append(statement)
+
+        sa.event.listen(Engine, "before_cursor_execute", _count)
+        try:
+            yield stmts
+        finally:
+            sa.event.remove(Engine, "before_cursor_execute", _count)
+        assert len(stmts) <= limit, (
+            f"query budget exceeded: {len(stmts)} > {limit}\n" + "\n---\n".join(stmts)
+        )
+
+    return _budget
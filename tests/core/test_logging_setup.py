@@ -0,0 +1,78 @@
+import io
+import json
+import logging
+import pytest
+
+from app.core import logging_setup as ls
+from app.core.config import Settings
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    saved = (root.handlers[:], root.level)
+    yield
+    ls.stop_logging()
+    root.handlers[:] = saved[0]
+    root.setLevel(saved[1])
+    for name in ("sqlalchemy.engine", "noisy", ls.ACCESS_LOGGER):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+        logging.getLogger(name).filters.clear()
+
+
+def _settings(**kw) -> Settings:
+    return Settings(**{"LOG_LEVEL": "INFO", "LOG_JSON": True, "LOG_LEVELS": "noisy=error", "LOG_ACCESS_SAMPLE_RATE": 1.0} | kw)
+
+
+def test_json_records_are_written_by_listener(restore_logging):
+    buf = io.StringIO()
+    ls.configure_logging(_settings(), stream=buf)
+    log = logging.getLogger("app.test")
+    log.info("hello %s", "world", extra={"user_id": "u1"})
+    log.debug("dropped by level")
+    logging.getLogger("noisy").warning("dropped by override")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("failed")
+    ls.stop_logging()
+
+    lines = [json.loads(line) for line in buf.getvalue().splitlines()]
+    assert [(d["level"], d["msg"]) for d in lines] == [("INFO", "hello world"), ("ERROR", "failed")]
+    assert lines[0]["logger"] == "app.test" and lines[0]["user_id"] == "u1"
+    assert "ValueError: boom" in lines[1]["exc"]
+
+
+def test_reconfigure_keeps_a_single_queue_handler(restore_logging):
+    ls.configure_logging(_settings(), stream=io.StringIO())
+    ls.configure_logging(_settings(LOG_JSON=False), stream=io.StringIO())
+    root = logging.getLogger()
+    assert sum(isinstance(h, ls.QueueHandler) for h in root.handlers) == 1
+
+
+def test_access_sampler_keeps_errors(monkeypatch):
+    sampler = ls.AccessLogSampler(0.0)
+    def rec(status, level=logging.INFO):
+        return logging.LogRecord(ls.ACCESS_LOGGER, level, "", 0, '%s - "%s %s HTTP/%s" %d',
+                                 ("1.2.3.4:1", "GET", "/health", "1.1", status), None)
+    before = ls.log_stats["sampled_out"]
+    assert not sampler.filter(rec(200))
+    assert sampler.filter(rec(404)) and sampler.filter(rec(503))
+    assert sampler.filter(rec(200, logging.WARNING))
+    assert ls.log_stats["sampled_out"] == before + 1
+    assert ls.AccessLogSampler(1.0).filter(rec(200))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    import queue
+    h = ls._NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = ls.log_stats["dropped"]
+    for _ in range(3):
+        h.handle(logging.LogRecord("x", logging.INFO, "", 0, "m", None, None))
+    assert ls.log_stats["dropped"] == before + 2
+
+
+def test_parse_level_overrides():
+    assert ls.parse_level_overrides(" httpx=warning, bad,sqlalchemy.engine=ERROR,") == {
+        "httpx": "WARNING", "sqlalchemy.engine": "ERROR",
+    }
@@ -0,0 +1,38 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+import pytest
+
+from app.core.serialization import ORJSONResponse, dumps, dumps_str, loads
+from app.schemas.auth_io import TokenResponse
+from app.utils.refresh_tools import from_json, to_json
+
+
+def test_dumps_handles_types_the_stdlib_path_handled():
+    uid = uuid.uuid4()
+    at = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    tok = TokenResponse(access_token="a", expires_in=1, is_new_user=True)
+    out = loads(dumps({"id": uid, "at": at, "n": Decimal("1.5"), "tok": tok, "name": "상철"}))
+    assert out == {
+        "id": str(uid), "at": "2025-01-02T03:04:05+00:00", "n": 1.5,
+        "tok": tok.model_dump(mode="json"), "name": "상철",
+    }
+    assert isinstance(dumps_str({}), str)
+
+
+def test_refresh_record_codec_is_compatible_with_stdlib_json():
+    rec = {"user_id": str(uuid.uuid4()), "iat": 1, "exp": 2}
+    assert json.loads(to_json(rec)) == rec
+    # 배포 전에 stdlib로 써 둔 레코드도 그대로 읽는다
+    assert from_json(json.dumps(rec)) == rec
+
+
+@pytest.mark.asyncio
+async def test_default_response_class_is_orjson(client):
+    from app.main import app
+
+    assert app.router.default_response_class is ORJSONResponse
+    res = await client.get("/health")
+    assert res.status_code == 200 and res.headers["content-type"] == "application/json"
+    assert res.content == dumps(res.json())
@@ -0,0 +1,45 @@
+import pytest
+from authlib.jose import jwt
+from fastapi import HTTPException
+
+from app.deps import auth as D
+from app.utils.jwt_tools import issue_access_token
+from app.utils.token_cache import VerifiedTokenCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = VerifiedTokenCache(maxsize=100)
+    monkeypatch.setattr(D, "token_cache", cache)
+    return cache
+
+
+def test_decode_caches_verified_claims(fresh_cache, monkeypatch):
+    token = issue_access_token("u1")
+
+    assert D._decode(token)["sub"] == "u1"
+
+    def boom(*a, **k):
+        raise AssertionError("verified again")
+
+    monkeypatch.setattr(D, "decode_access_token", boom)
+    assert D._decode(token)["sub"] == "u1"
+    assert fresh_cache.stats()["hits"] == 1
+
+
+def test_decode_rejects_expired_token(fresh_cache):
+    token = jwt.encode(
+        {"alg": "HS256"}, {"sub": "u1", "iat": 1, "exp": 2}, D.settings.JWT_SECRET
+    ).decode()
+
+    with pytest.raises(HTTPException) as exc:
+        D._decode(token)
+    assert exc.value.status_code == 401
+    assert fresh_cache.stats()["size"] == 0
+
+
+def test_decode_rejects_bad_signature(fresh_cache):
+    token = jwt.encode({"alg": "HS256"}, {"sub": "u1", "exp": 2**31}, "wrong-secret").decode()
+
+    with pytest.raises(HTTPException):
+        D._decode(token)
@@ -1,5 +1,6 @@
 import uuid
 import pytest
+from sqlalchemy.exc import InvalidRequestError
 import app.db.base_class  # noqa: F401
 from app.models.user import User
 from app.models.identity import Identity, Provider
@@ -13,8 +14,19 @@ async def test_user_model_relationship(async_session):
     assert user.created_at is not None
     assert user.updated_at is None
 
-    identity = Identity(user=user, provider=Provider.google, provider_sub="sub")
+    identity = Identity(user_id=user.id, provider=Provider.google, provider_sub="sub")
     async_session.add(identity)
     await async_session.flush()
-    await async_session.refresh(user)
+    await async_session.refresh(user, ["identities"])
     assert len(user.identities) == 1
+
+
+@pytest.mark.asyncio
+async def test_relationships_are_not_lazy_loaded(async_session):
+    user = User(uid=f"user-{uuid.uuid4()}", nickname="nick")
+    async_session.add(user)
+    await async_session.flush()
+    async_session.expire(user, ["identities"])
+
+    with pytest.raises(InvalidRequestError):
+        user.identities
@@ -1,8 +1,13 @@
+import asyncio
 import uuid
 import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 import app.db.base_class  # noqa: F401
 from app.models.user import User
-from app.repositories.user_repo import UserRepository
+from app.models.identity import Identity, Provider
+from app.repositories.identity_repo import IdentityRepository
+from app.repositories.user_repo import UserRepository, UserShape
 
 @pytest.mark.asyncio
 async def test_user_repository_crud(async_session):
@@ -25,3 +30,102 @@ async def test_user_repository_crud(async_session):
 
     users = await repo.get_all_by_nickname("nick")
     assert {u.uid for u in users} == {uid1, uid2}
+
+
+async def _user_with_identity(session) -> User:
+    user = User(uid=f"user-{uuid.uuid4()}", nickname="nick")
+    session.add(user)
+    await session.flush()
+    session.add(Identity(user_id=user.id, provider=Provider.google, provider_sub=f"sub-{user.uid}"))
+    await session.commit()
+    session.expunge_all()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_bare_shape_is_one_statement(async_session, query_budget):
+    user = await _user_with_identity(async_session)
+    repo = UserRepository(async_session)
+
+    with query_budget(1):
+        fetched = await repo.get(user.id)
+        assert fetched.uid == user.uid
+
+
+@pytest.mark.asyncio
+async def test_with_identities_shape(async_session, query_budget):
+    user = await _user_with_identity(async_session)
+    repo = UserRepository(async_session)
+
+    with query_budget(2):
+        fetched = await repo.get_by_uid(user.uid, shape=UserShape.with_identities)
+        assert [i.provider for i in fetched.identities] == ["google"]
+
+
+@pytest.mark.asyncio
+async def test_profile_shape_batch_is_one_statement(async_session, query_budget):
+    users = [await _user_with_identity(async_session) for _ in range(3)]
+    repo = UserRepository(async_session)
+
+    with query_budget(1):
+        fetched = await repo.list_by_uids([u.uid for u in users])
+        assert {u.uid for u in fetched} == {u.uid for u in users}
+
+
+@pytest.mark.asyncio
+async def test_query_budget_fails_when_exceeded(async_session, query_budget):
+    user = await _user_with_identity(async_session)
+    repo = UserRepository(async_session)
+
+    with pytest.raises(AssertionError, match="query budget exceeded"):
+        with query_budget(1):
+            await repo.get(user.id, shape=UserShape.with_identities)
+
+
+@pytest.mark.asyncio
+async def test_upsert_social_creates_then_finds(async_session, query_budget):
+    repo = UserRepository(async_session)
+
+    with query_budget(1):
+        user, is_new = await repo.upsert_social("google", "s-1", "123456789", {"email": "e@example.com"})
+    assert is_new and user.uid == "123456789"
+    await async_session.commit()
+
+    with query_budget(1):
+        again, is_new = await repo.upsert_social("google", "s-1", "987654321")
+    assert not is_new and again.id == user.id and again.uid == "123456789"
+    await async_session.commit()
+
+    ident = await IdentityRepository(async_session).get_by_provider_sub("google", "s-1")
+    assert ident.user_id == user.id and ident.email == "e@example.com"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_logins_resolve_to_one_user(async_session):
+    from app.services.user_service import UserService
+
+    Session = async_sessionmaker(async_session.bind, expire_on_commit=False, class_=AsyncSession)
+
+    async def login():
+        async with Session() as s:
+            user, is_new = await UserService(s).create_or_get_social_user(Provider.google, "race")
+            return user.id, is_new
+
+    results = await asyncio.gather(*(login() for _ in range(8)))
+
+    assert len({user_id for user_id, _ in results}) == 1
+    assert sum(is_new for _, is_new in results) == 1
+    assert await async_session.scalar(select(func.count()).select_from(User)) == 1
+
+
+@pytest.mark.asyncio
+async def test_exists_checks(async_session):
+    user = await _user_with_identity(async_session)
+    repo = UserRepository(async_session)
+
+    assert await repo.exists_uid(user.uid) is True
+    assert await repo.exists_uid("missing") is False
+    assert await repo.exists_nickname("nick") is True
+    assert await repo.exists_nickname("nobody") is False
+    assert await IdentityRepository(async_session).exists_provider_for_user(user.id, "google") is True
+    assert await IdentityRepository(async_session).exists_provider_for_user(user.id, "steam") is False
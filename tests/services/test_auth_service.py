@@ -8,6 +8,9 @@ from unittest.mock import AsyncMock
 import httpx
 
 from fastapi import HTTPException
+from authlib.jose.errors import InvalidClaimError
+from sqlalchemy.exc import IntegrityError
+from app.models.identity import Provider
 
 from app.schemas.google_oauth import GoogleTokenRequest, GoogleIdClaims
 from app.services import auth_service
@@ -40,7 +43,7 @@ async def test_exchange_google_token_success(monkeypatch):
 
             return Resp()
 
-    monkeypatch.setattr(httpx, "AsyncClient", lambda *a, **k: DummyClient())
+    monkeypatch.setattr(auth_service.google_http, "_client", DummyClient())
     resp = await auth_service.exchange_google_token(req)
     assert resp.id_token == "id"
 
@@ -71,7 +74,7 @@ async def test_exchange_google_token_failure(monkeypatch):
 
             return Resp()
 
-    monkeypatch.setattr(httpx, "AsyncClient", lambda *a, **k: DummyClient())
+    monkeypatch.setattr(auth_service.google_http, "_client", DummyClient())
     with raises(HTTPException):
         await auth_service.exchange_google_token(req)
 
@@ -80,8 +83,8 @@ async def test_exchange_google_token_failure(monkeypatch):
 async def test_verify_google_id_token(monkeypatch):
     monkeypatch.setattr(auth_service.settings, "GOOGLE_CLIENT_IDS", "client")
 
-    async def fake_get():
-        return {"keys": []}
+    async def fake_get_key(kid):
+        return object()
 
     class MockClaims(dict):
         def validate(self, leeway):
@@ -99,7 +102,7 @@ async def test_verify_google_id_token(monkeypatch):
                 }
             )
 
-    monkeypatch.setattr(auth_service._jwks_cache, "get", fake_get)
+    monkeypatch.setattr(auth_service._jwks_cache, "get_key", fake_get_key)
     monkeypatch.setattr(auth_service, "_rs256", MockRs256())
 
     claims = await auth_service.verify_google_id_token("token")
@@ -111,12 +114,12 @@ async def test_verify_google_id_token(monkeypatch):
 async def test_verify_google_id_token_invalid_aud(monkeypatch):
     monkeypatch.setattr(auth_service.settings, "GOOGLE_CLIENT_IDS", "client")
 
-    async def fake_get():
-        return {}
+    async def fake_get_key(kid):
+        return object()
 
     class MockClaims(dict):
         def validate(self, leeway):
-            return True
+            raise InvalidClaimError("aud")
 
     class MockRs256:
         def decode(self, token, keyset, claims_options):
@@ -128,27 +131,21 @@ async def test_verify_google_id_token_invalid_aud(monkeypatch):
                 }
             )
 
-    monkeypatch.setattr(auth_service._jwks_cache, "get", fake_get)
+    monkeypatch.setattr(auth_service._jwks_cache, "get_key", fake_get_key)
     monkeypatch.setattr(auth_service, "_rs256", MockRs256())
 
-    with raises(HTTPException):
+    with raises(HTTPException) as exc:
         await auth_service.verify_google_id_token("token")
+    assert exc.value.status_code == 400
+    assert exc.value.detail.startswith("INVALID_AUDIENCE")
 
 
 @pytest.mark.asyncio
 async def test_handle_google_login_existing_user(monkeypatch):
     user_id = uuid.uuid4()
-    identity = SimpleNamespace(user_id=user_id)
     user = SimpleNamespace(id=user_id)
-
-    id_repo = SimpleNamespace(
-        get_by_provider_sub=AsyncMock(return_value=identity), add=AsyncMock()
-    )
-    user_repo = SimpleNamespace(get=AsyncMock(return_value=user), add=AsyncMock())
-
-    monkeypatch.setattr(_user_service_mod, "IdentityRepository", lambda db: id_repo)
+    user_repo = SimpleNamespace(upsert_social=AsyncMock(return_value=(user, False)))
     monkeypatch.setattr(_user_service_mod, "UserRepository", lambda db: user_repo)
-
     monkeypatch.setattr(auth_service, "issue_access_token", lambda uid: f"token-{uid}")
 
     db = SimpleNamespace(commit=AsyncMock())
@@ -157,42 +154,42 @@ async def test_handle_google_login_existing_user(monkeypatch):
     resp = await auth_service.handle_google_login(db, claims)
     assert resp.is_new_user is False
     assert resp.access_token == f"token-{user_id}"
-    id_repo.add.assert_not_awaited()
-    user_repo.add.assert_not_awaited()
+    user_repo.upsert_social.assert_awaited_once()
     db.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_handle_google_login_new_user(monkeypatch):
-    async def add_user(user):
-        user.id = uuid.uuid4()
-        return user
-
-    id_repo = SimpleNamespace(
-        get_by_provider_sub=AsyncMock(return_value=None), add=AsyncMock()
-    )
-    user_repo = SimpleNamespace(get=AsyncMock(), add=AsyncMock(side_effect=add_user))
-
-    from app.services import user_service as _user_service_mod
-    monkeypatch.setattr(_user_service_mod, "IdentityRepository", lambda db: id_repo)
+    user = SimpleNamespace(id=uuid.uuid4())
+    user_repo = SimpleNamespace(upsert_social=AsyncMock(return_value=(user, True)))
     monkeypatch.setattr(_user_service_mod, "UserRepository", lambda db: user_repo)
-
     monkeypatch.setattr(auth_service, "issue_access_token", lambda uid: f"token-{uid}")
 
-    db = SimpleNamespace(
-        commit=AsyncMock(),
-        flush=AsyncMock(),
-        rollback=AsyncMock(),
-    )
-
+    db = SimpleNamespace(commit=AsyncMock(), rollback=AsyncMock())
     claims = GoogleIdClaims(sub="sub123", email="e@example.com", email_verified=True)
 
     resp = await auth_service.handle_google_login(db, claims)
     assert resp.is_new_user is True
-    assert resp.access_token.startswith("token-")
-    id_repo.add.assert_awaited_once()
-    user_repo.add.assert_awaited_once()
-    db.flush.assert_awaited()
+    assert resp.access_token == f"token-{user.id}"
+    provider, sub, uid, passed_claims = user_repo.upsert_social.await_args.args
+    assert (provider, sub, passed_claims["email"]) == ("google", "sub123", "e@example.com")
+    assert uid.isdigit()
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_social_login_retries_on_uid_collision_and_lost_race(monkeypatch):
+    user = SimpleNamespace(id=uuid.uuid4())
+    collision = IntegrityError("INSERT", {}, Exception("uq uid"))
+    user_repo = SimpleNamespace(upsert_social=AsyncMock(side_effect=[collision, None, (user, False)]))
+    monkeypatch.setattr(_user_service_mod, "UserRepository", lambda db: user_repo)
+
+    db = SimpleNamespace(commit=AsyncMock(), rollback=AsyncMock())
+    got, is_new = await _user_service_mod.UserService(db).create_or_get_social_user(Provider.google, "sub123")
+
+    assert got is user and is_new is False
+    assert user_repo.upsert_social.await_count == 3
+    db.rollback.assert_awaited_once()
     db.commit.assert_awaited_once()
 
 
@@ -202,3 +199,46 @@ async def test_handle_google_login_missing_sub(monkeypatch):
     claims = GoogleIdClaims(sub=None)
     with raises(HTTPException):
         await auth_service.handle_google_login(db, claims)
+
+
+@pytest.mark.asyncio
+async def test_rotate_refresh_and_issue_consumes_token_once(fake_redis):
+    issued = await auth_service.issue_auth_tokens("user-1", is_new_user=False)
+    db = SimpleNamespace(commit=AsyncMock())
+
+    rotated = await auth_service.rotate_refresh_and_issue(db, issued.refresh_token)
+    assert rotated.refresh_token != issued.refresh_token
+    db.commit.assert_awaited_once()
+
+    with raises(HTTPException) as exc:
+        await auth_service.rotate_refresh_and_issue(db, issued.refresh_token)
+    assert exc.value.status_code == 401
+
+    again = await auth_service.rotate_refresh_and_issue(db, rotated.refresh_token)
+    assert again.access_token
+
+
+@pytest.mark.asyncio
+async def test_verify_google_id_token_unknown_kid(monkeypatch):
+    monkeypatch.setattr(auth_service.settings, "GOOGLE_CLIENT_IDS", "client")
+
+    async def fake_get_key(kid):
+        return None
+
+    monkeypatch.setattr(auth_service._jwks_cache, "get_key", fake_get_key)
+
+    with raises(HTTPException) as exc:
+        await auth_service.verify_google_id_token("token")
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_verify_google_id_token_jwks_unavailable(monkeypatch):
+    async def fake_get_key(kid):
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(auth_service._jwks_cache, "get_key", fake_get_key)
+
+    with raises(HTTPException) as exc:
+        await auth_service.verify_google_id_token("token")
+    assert exc.value.status_code == 503
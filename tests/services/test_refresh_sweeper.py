@@ -0,0 +1,26 @@
+import pytest
+
+from app.services import refresh_sweeper
+from app.utils import refresh_tools as rt
+
+
+@pytest.mark.asyncio
+async def test_sweep_once_reports_reclaimed(fake_redis, monkeypatch):
+    monkeypatch.setattr(refresh_sweeper, "sweep_stats", {"runs": 0, "skipped": 0, "last_reclaimed": 0, "total_reclaimed": 0})
+    past = rt.now_ts() - 1
+    await fake_redis.zadd(rt.redis_user_set_key("u1"), {"a": past, "b": past, "c": past + 3600})
+
+    assert await refresh_sweeper.sweep_once() == 2
+    assert refresh_sweeper.sweep_stats == {"runs": 1, "skipped": 0, "last_reclaimed": 2, "total_reclaimed": 2}
+
+
+@pytest.mark.asyncio
+async def test_sweep_once_runs_once_per_interval_across_workers(fake_redis, monkeypatch):
+    monkeypatch.setattr(refresh_sweeper, "sweep_stats", {"runs": 0, "skipped": 0, "last_reclaimed": 0, "total_reclaimed": 0})
+
+    assert await refresh_sweeper.sweep_once() == 0
+    # 같은 주기 안에 다른 워커가 깨어나도 다시 훑지 않는다
+    assert await refresh_sweeper.sweep_once() is None
+    assert refresh_sweeper.sweep_stats["runs"] == 1
+    assert refresh_sweeper.sweep_stats["skipped"] == 1
+    assert 0 < await fake_redis.ttl(rt.redis_sweep_lock_key()) <= refresh_sweeper.settings.REFRESH_INDEX_SWEEP_INTERVAL_SEC
@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from redis.exceptions import RedisError
+
+from app.models.user import User
+from app.services import uid_pool
+from app.services.uid_pool import UID_MAX, UID_MIN
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    monkeypatch.setattr(uid_pool, "_spare", [])
+    monkeypatch.setattr(uid_pool, "uid_pool_stats", dict.fromkeys(uid_pool.uid_pool_stats, 0))
+    monkeypatch.setattr(uid_pool.settings, "UID_POOL_TARGET", 50)
+    monkeypatch.setattr(uid_pool.settings, "UID_POOL_LOW_WATERMARK", 20)
+
+
+@pytest.mark.asyncio
+async def test_refill_fills_to_target_with_unused_random_uids(fake_redis, async_session, monkeypatch):
+    async_session.add(User(uid="123456789"))
+    await async_session.commit()
+    draws = iter(["123456789"] + [str(UID_MIN + i * 7919) for i in range(49)])
+    monkeypatch.setattr(uid_pool, "_gen_numeric_uid", lambda: next(draws))
+
+    assert await uid_pool.refill_once(fake_redis, async_session) == 49
+    members = await fake_redis.smembers(uid_pool.redis_uid_pool_key())
+    assert "123456789" not in members
+    assert uid_pool.uid_pool_stats["rejected"] == 1
+    assert uid_pool.uid_pool_stats["last_depth"] == 49
+    # 락은 채운 뒤 바로 풀린다
+    assert await fake_redis.get(uid_pool.redis_uid_pool_lock_key()) is None
+
+
+@pytest.mark.asyncio
+async def test_refill_is_noop_above_low_watermark(fake_redis, async_session):
+    await fake_redis.sadd(uid_pool.redis_uid_pool_key(), *(str(UID_MIN + i) for i in range(30)))
+
+    assert await uid_pool.refill_once(fake_redis, async_session) == 0
+    assert uid_pool.uid_pool_stats["refills"] == 0
+    assert uid_pool.uid_pool_stats["last_depth"] == 30
+
+
+@pytest.mark.asyncio
+async def test_refill_skips_while_another_worker_holds_lock(fake_redis, async_session):
+    await fake_redis.set(uid_pool.redis_uid_pool_lock_key(), "other")
+
+    assert await uid_pool.refill_once(fake_redis, async_session) is None
+    assert uid_pool.uid_pool_stats["skipped"] == 1
+    assert await fake_redis.get(uid_pool.redis_uid_pool_lock_key()) == "other"
+
+
+@pytest.mark.asyncio
+async def test_refill_keeps_lock_taken_over_by_another_worker(fake_redis, async_session, monkeypatch):
+    lock = uid_pool.redis_uid_pool_lock_key()
+    orig_scard = fake_redis.scard
+
+    async def scard(key):
+        # 채우는 도중 락이 만료되고 다른 워커가 잡은 경우
+        await fake_redis.set(lock, "other", ex=30)
+        return await orig_scard(key)
+
+    monkeypatch.setattr(fake_redis, "scard", scard)
+    await uid_pool.refill_once(fake_redis, async_session)
+    assert await fake_redis.get(lock) == "other"
+
+
+@pytest.mark.asyncio
+async def test_take_uid_pops_distinct_pooled_uids(fake_redis, async_session):
+    await uid_pool.refill_once(fake_redis, async_session)
+
+    uids = await asyncio.gather(*(uid_pool.take_uid(fake_redis) for _ in range(50)))
+    assert len(set(uids)) == 50
+    assert all(UID_MIN <= int(u) <= UID_MAX for u in uids)
+    assert uid_pool.uid_pool_stats["taken"] == 50
+    assert await uid_pool.pool_depth(fake_redis) == 0
+
+
+@pytest.mark.asyncio
+async def test_take_uid_falls_back_when_pool_empty_or_down(fake_redis, monkeypatch):
+    assert (await uid_pool.take_uid(fake_redis)).isdigit()
+
+    async def broken(*_):
+        raise RedisError("down")
+    monkeypatch.setattr(fake_redis, "spop", broken)
+    assert (await uid_pool.take_uid(fake_redis)).isdigit()
+    assert uid_pool.uid_pool_stats["fallbacks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_released_uid_is_reused_without_redis(fake_redis):
+    uid_pool.release_uid("123456789")
+    assert await uid_pool.take_uid(fake_redis) == "123456789"
+    assert uid_pool.uid_pool_stats["fallbacks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_signup_takes_pooled_uid_and_returning_login_gives_it_back(fake_redis, async_session):
+    from app.models.identity import Provider
+    from app.services.user_service import UserService
+
+    await fake_redis.sadd(uid_pool.redis_uid_pool_key(), "555555555", "666666666")
+    svc = UserService(async_session)
+
+    user, is_new = await svc.create_or_get_social_user(Provider.google, "pool-sub")
+    assert is_new and user.uid in {"555555555", "666666666"}
+
+    _, is_new = await svc.create_or_get_social_user(Provider.google, "pool-sub")
+    assert not is_new
+    # 기존 user 로그인에서 꺼낸 uid는 버리지 않고 이 프로세스에 남겨 둔다
+    assert await uid_pool.pool_depth(fake_redis) == 0
+    assert len(uid_pool._spare) == 1
+    assert uid_pool.uid_pool_stats["fallbacks"] == 0
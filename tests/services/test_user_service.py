@@ -1,11 +1,7 @@
 import pytest
 
-from app.services.user_service import (
-    _gen_numeric_uid,
-    UID_MIN,
-    UID_MAX,
-    UserService,
-)
+from app.services.uid_pool import _gen_numeric_uid, UID_MIN, UID_MAX
+from app.services.user_service import UserService
 from app.core.error import SCDomainError, DomainErrorCode
 
 
@@ -0,0 +1,49 @@
+import pytest
+import pytest_asyncio
+
+from app.core.session import engine
+from app.services import warmup
+
+
+@pytest_asyncio.fixture
+async def fresh_engine():
+    # 테스트마다 이벤트 루프가 달라서 루프에 묶인 커넥션을 풀에 남기지 않는다
+    await engine.dispose()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_db_opens_connections(fresh_engine):
+    assert await warmup.warm_db(3) == 3
+    assert engine.pool.checkedin() == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_db_is_capped_by_pool_size(fresh_engine):
+    assert await warmup.warm_db(engine.pool.size() + 5) == engine.pool.size()
+
+
+@pytest.mark.asyncio
+async def test_warm_redis_pings(fake_redis):
+    assert await warmup.warm_redis(4) == 4
+    assert await warmup.warm_redis(0) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_step_does_not_block_readiness(fake_redis, fresh_engine, monkeypatch):
+    async def broken_jwks():
+        raise RuntimeError("google down")
+
+    async def no_http():
+        return 0
+
+    monkeypatch.setattr(warmup, "warm_jwks", broken_jwks)
+    monkeypatch.setattr(warmup, "warm_http", no_http)
+    monkeypatch.setitem(warmup.warmup_state, "ready", False)
+
+    state = await warmup.run_warmup()
+
+    assert state["ready"] is True
+    assert state["steps"]["jwks"] == {"ok": False, "error": "RuntimeError"}
+    assert state["steps"]["redis"]["ok"] is True
@@ -0,0 +1,40 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app import main
+from app.main import app, lifespan
+from app.services import warmup
+from app.utils import refresh_store
+
+
+@pytest.mark.asyncio
+async def test_lifespan_preloads_refresh_scripts(fake_redis, monkeypatch):
+    monkeypatch.setattr(main.settings, "WARMUP_ENABLED", False)
+    async with lifespan(app):
+        shas = [s._script.sha for s in (refresh_store._issue, refresh_store._rotate, refresh_store._revoke_all)]
+        assert await fake_redis.script_exists(*shas) == [True, True, True]
+
+
+@pytest.mark.asyncio
+async def test_ready_only_after_warmup(fake_redis, monkeypatch):
+    async def fake_jwks():
+        return 2
+
+    async def fake_http():
+        return 3
+
+    monkeypatch.setattr(warmup, "warm_jwks", fake_jwks)
+    monkeypatch.setattr(warmup, "warm_http", fake_http)
+    monkeypatch.setitem(warmup.warmup_state, "ready", False)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as c:
+        assert (await c.get("/health/ready")).status_code == 503
+
+        async with lifespan(app):
+            res = await c.get("/health/ready")
+            assert res.status_code == 200
+            steps = res.json()["steps"]
+            assert steps["jwks"] == {"ok": True, "result": 2, "ms": steps["jwks"]["ms"]}
+            assert steps["db"]["ok"] and steps["redis"]["ok"] and steps["http"]["ok"]
+
+        assert (await c.get("/health/ready")).status_code == 503
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+import pytest_asyncio
+
+from app.utils import auth_session as a_sess
+from app.utils.auth_session_events import SessionNotifier
+
+
+@pytest_asyncio.fixture
+async def notifier():
+    n = SessionNotifier()
+    yield n
+    await n.close()
+
+
+@pytest.mark.asyncio
+async def test_waiters_wake_on_result_through_one_subscription(fake_redis, notifier, monkeypatch):
+    subscriptions = []
+    orig = fake_redis.pubsub
+    monkeypatch.setattr(fake_redis, "pubsub", lambda **kw: subscriptions.append(1) or orig(**kw))
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    other = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+
+    waiters = [asyncio.create_task(notifier.wait_for_status(fake_redis, sid, 5)) for _ in range(20)]
+    bystander = asyncio.create_task(notifier.wait_for_status(fake_redis, other, 5))
+    while notifier.waiting < 21:
+        await asyncio.sleep(0)
+
+    await a_sess.set_result(fake_redis, sid, {"ok": True})
+    results = await asyncio.wait_for(asyncio.gather(*waiters), 1)
+
+    assert all(res == ("ready", {"ok": True}, None) for res in results)
+    assert len(subscriptions) == 1
+    assert not bystander.done() and notifier.waiting == 1
+
+    await a_sess.set_error(fake_redis, other, "denied")
+    assert await asyncio.wait_for(bystander, 1) == ("error", None, "denied")
+    assert notifier.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_finished_session_returns_without_waiting(fake_redis, notifier):
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    await a_sess.set_error(fake_redis, sid, "x")
+
+    assert await asyncio.wait_for(notifier.wait_for_status(fake_redis, sid, 30), 1) == ("error", None, "x")
+    assert await notifier.wait_for_status(fake_redis, "missing", 30) == ("not_found", None, None)
+
+
+@pytest.mark.asyncio
+async def test_times_out_as_pending(fake_redis, notifier):
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+
+    assert await notifier.wait_for_status(fake_redis, sid, 0.05) == ("pending", None, None)
+    assert notifier.waiting == 0
+
+
+class _SilentRedis:
+    """SUBSCRIBE / PUBLISH / HMGET / PING만 흉내 내는 최소 RESP 서버. 알림이 없으면 구독 연결에 아무것도 쓰지 않는다."""
+
+    def __init__(self):
+        self.ready: set[str] = set()
+        self.subscribers: list[asyncio.StreamWriter] = []
+        self.subscribes = 0
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        for w in self.subscribers:
+            w.close()
+
+    @staticmethod
+    def _bulk(v: str | None) -> bytes:
+        return b"$-1\r\n" if v is None else f"${len(v.encode())}\r\n{v}\r\n".encode()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                n = int((await reader.readline())[1:])
+                args = []
+                for _ in range(n):
+                    size = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(size + 2))[:-2].decode())
+                cmd = args[0].upper()
+                if cmd == "SUBSCRIBE":
+                    self.subscribers.append(writer)
+                    self.subscribes += 1
+                    writer.write(b"*3\r\n" + self._bulk("subscribe") + self._bulk(args[1]) + b":1\r\n")
+                elif cmd == "PING":
+                    if writer in self.subscribers:
+                        writer.write(b"*2\r\n" + self._bulk("pong") + self._bulk(args[1] if len(args) > 1 else ""))
+                    else:
+                        writer.write(b"+PONG\r\n")
+                elif cmd == "HMGET":
+                    sid = args[1].removeprefix(a_sess.SESSION_PREFIX)
+                    st = "ready" if sid in self.ready else "pending"
+                    result = '{"ok": true}' if sid in self.ready else None
+                    writer.write(b"*3\r\n" + self._bulk(st) + self._bulk(result) + self._bulk(None))
+                else:
+                    writer.write(b"+OK\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+
+    def publish(self, sid: str) -> None:
+        self.ready.add(sid)
+        msg = b"*3\r\n" + self._bulk("message") + self._bulk(a_sess.SESSION_EVENTS_CHANNEL) + self._bulk(sid)
+        for w in self.subscribers:
+            w.write(msg)
+
+
+@pytest.mark.asyncio
+async def test_socket_timeout_on_idle_subscription_is_not_a_lost_subscriber(notifier, caplog, monkeypatch):
+    from redis.asyncio import Redis
+    from app.core import config
+    from app.utils import redis_client
+
+    fake = _SilentRedis()
+    port = await fake.start()
+    # 운영과 같은 풀(socket_timeout 있음). 알림 없이 그보다 오래 기다려도 구독을 끊거나 다시 맺지 않아야 한다
+    monkeypatch.setattr(config.settings, "REDIS_URL", f"redis://127.0.0.1:{port}/0")
+    monkeypatch.setattr(config.settings, "REDIS_SOCKET_TIMEOUT_SEC", 0.2)
+    monkeypatch.setattr(redis_client, "settings", config.settings)
+    r = Redis.from_pool(redis_client._make_pool())
+    try:
+        waiting = asyncio.create_task(notifier.wait_for_status(r, "sid-1", 5))
+        await asyncio.sleep(1)
+        assert not waiting.done()
+        assert notifier.waiting == 1
+        assert fake.subscribes == 1
+
+        fake.publish("sid-1")
+        assert await asyncio.wait_for(waiting, 2) == ("ready", {"ok": True}, None)
+        assert not [rec for rec in caplog.records if "subscriber lost" in rec.getMessage()]
+    finally:
+        await notifier.close()
+        await r.aclose()
+        await fake.stop()
@@ -9,15 +9,38 @@ async def test_create_auth_session_and_status(monkeypatch):
     data = await a_sess.create_auth_session(r, "verifier-xyz")
     assert "session_id" in data and "auth_url" in data
     sid = data["session_id"]
+    assert await r.type(a_sess._key(sid)) == "hash"
+    assert 0 < await r.ttl(a_sess._key(sid)) <= a_sess.SESSION_TTL
 
     status, result, err = await a_sess.get_status(r, sid)
     assert status == "pending" and result is None and err is None
-    assert await a_sess.get_code_verifier(r, sid) == "verifier-xyz"
+    assert await a_sess.get_callback_state(r, sid) == ("pending", "verifier-xyz")
 
-    await a_sess.set_result(r, sid, {"ok": True})
+    assert await a_sess.set_result(r, sid, {"ok": True}) is True
     status, result, err = await a_sess.get_status(r, sid)
     assert status == "ready" and result == {"ok": True} and err is None
 
-    await a_sess.set_error(r, sid, "oops")
+@pytest.mark.asyncio
+async def test_set_error(monkeypatch):
+    r = FakeRedis(decode_responses=True)
+    sid = (await a_sess.create_auth_session(r, "v"))["session_id"]
+
+    assert await a_sess.set_error(r, sid, "oops") is True
     status, result, err = await a_sess.get_status(r, sid)
     assert status == "error" and result is None and err == "oops"
+
+@pytest.mark.asyncio
+async def test_only_pending_sessions_transition():
+    r = FakeRedis(decode_responses=True)
+    sid = (await a_sess.create_auth_session(r, "v"))["session_id"]
+    await a_sess.set_result(r, sid, {"ok": True})
+
+    # 이미 끝난 세션은 덮어쓰지 않는다
+    assert await a_sess.set_error(r, sid, "late") is False
+    assert await a_sess.set_result(r, sid, {"ok": False}) is False
+    assert await a_sess.get_status(r, sid) == ("ready", {"ok": True}, None)
+
+    # 없는 세션은 만들지 않는다
+    assert await a_sess.set_result(r, "missing", {"ok": True}) is False
+    assert await r.exists(a_sess._key("missing")) == 0
+    assert await a_sess.get_callback_state(r, "missing") == ("not_found", None)
@@ -1,13 +1,24 @@
+import asyncio
 import pytest
 import httpx
 from types import SimpleNamespace
+from authlib.jose import JsonWebKey, JsonWebToken
 
-from app.utils.jwks_cache import JWKSCache
+from app.utils import jwks_cache as jc
+from app.utils.jwks_cache import JWKSCache, JWKSError, unverified_kid
 
 
-@pytest.mark.asyncio
-async def test_jwks_cache(monkeypatch):
-    calls = SimpleNamespace(count=0)
+def _jwk(kid: str):
+    key = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": kid})
+    return key, key.as_dict(is_private=False)
+
+
+_KEY1, _PUB1 = _jwk("k1")
+_KEY2, _PUB2 = _jwk("k2")
+
+
+def _patch_client(monkeypatch, keys, headers=None, delay=0.0, error=None):
+    calls = SimpleNamespace(count=0, keys=keys, headers=headers or {}, error=error)
 
     class DummyClient:
         async def __aenter__(self):
@@ -18,10 +29,18 @@ async def test_jwks_cache(monkeypatch):
 
         async def get(self, url):
             calls.count += 1
+            if delay:
+                await asyncio.sleep(delay)
+            if calls.error:
+                raise calls.error
+            snapshot = list(calls.keys)
 
             class Resp:
+                status_code = 200
+                headers = calls.headers
+
                 def json(self):
-                    return {"keys": ["k"]}
+                    return {"keys": snapshot}
 
                 def raise_for_status(self):
                     pass
@@ -29,9 +48,160 @@ async def test_jwks_cache(monkeypatch):
             return Resp()
 
     monkeypatch.setattr(httpx, "AsyncClient", lambda *a, **k: DummyClient())
+    return calls
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(jc, "_now", c)
+    return c
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache(monkeypatch):
+    calls = _patch_client(monkeypatch, [_PUB1])
 
     cache = JWKSCache("http://example")
     jwks1 = await cache.get()
     jwks2 = await cache.get()
     assert jwks1 == jwks2
     assert calls.count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_gets_share_one_fetch(monkeypatch):
+    calls = _patch_client(monkeypatch, [_PUB1], delay=0.01)
+    cache = JWKSCache("http://example")
+
+    keys = await asyncio.gather(*(cache.get_key("k1") for _ in range(20)))
+
+    assert calls.count == 1
+    assert all(k is keys[0] for k in keys)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_gets_share_one_failed_fetch(monkeypatch):
+    calls = _patch_client(monkeypatch, [_PUB1], delay=0.01, error=httpx.ConnectError("down"))
+    cache = JWKSCache("http://example")
+
+    results = await asyncio.gather(*(cache.get_key("k1") for _ in range(20)), return_exceptions=True)
+
+    assert calls.count == 1
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+
+    calls.error = None
+    assert await cache.get_key("k1") is not None
+    assert calls.count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_jwks_raises_jwks_error(monkeypatch):
+    _patch_client(monkeypatch, [{"kid": "bad"}])
+    cache = JWKSCache("http://example")
+
+    with pytest.raises(JWKSError):
+        await cache.get()
+
+
+@pytest.mark.asyncio
+async def test_parsed_key_verifies_token(monkeypatch):
+    _patch_client(monkeypatch, [_PUB1])
+    cache = JWKSCache("http://example")
+    token = JsonWebToken(["RS256"]).encode({"alg": "RS256", "kid": "k1"}, {"sub": "s"}, _KEY1).decode()
+
+    key = await cache.get_key(unverified_kid(token))
+    claims = JsonWebToken(["RS256"]).decode(token, key)
+    assert claims["sub"] == "s"
+
+
+@pytest.mark.asyncio
+async def test_honors_cache_control_max_age(monkeypatch, clock):
+    calls = _patch_client(monkeypatch, [_PUB1], headers={"cache-control": "public, max-age=120, must-revalidate"})
+    cache = JWKSCache("http://example", ttl=3600)
+
+    await cache.get()
+    clock.now += 119
+    await cache.get()
+    assert calls.count == 1
+
+    clock.now += 2
+    await cache.get()
+    await cache._revalidate_task
+    assert calls.count == 2
+
+
+@pytest.mark.asyncio
+async def test_serves_stale_while_revalidating(monkeypatch, clock):
+    calls = _patch_client(monkeypatch, [_PUB1], delay=0.01)
+    cache = JWKSCache("http://example", ttl=60)
+    await cache.get_key("k1")
+
+    calls.keys = [_PUB2]
+    clock.now += 61
+    stale = await asyncio.gather(*(cache.get_key("k1") for _ in range(10)))
+    assert all(k is not None for k in stale)
+
+    await cache._revalidate_task
+    assert calls.count == 2
+    assert await cache.get_key("k2") is not None
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_forces_rate_limited_refresh(monkeypatch, clock):
+    calls = _patch_client(monkeypatch, [_PUB1])
+    cache = JWKSCache("http://example", min_refresh_interval=30)
+    await cache.get()
+
+    clock.now += 5
+    assert await cache.get_key("k2") is None
+    assert calls.count == 1
+
+    calls.keys = [_PUB1, _PUB2]
+    clock.now += 30
+    assert await cache.get_key("k2") is not None
+    assert calls.count == 2
+
+    assert await cache.get_key("missing") is None
+    assert calls.count == 2
+
+
+def test_unverified_kid():
+    assert unverified_kid("not-a-jwt") is None
+    key9, _ = _jwk("k9")
+    token = JsonWebToken(["RS256"]).encode({"alg": "RS256", "kid": "k9"}, {"sub": "s"}, key9).decode()
+    assert unverified_kid(token) == "k9"
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refresh_is_rate_limited_while_upstream_fails(monkeypatch, clock):
+    calls = _patch_client(monkeypatch, [_PUB1])
+    cache = JWKSCache("http://example", min_refresh_interval=30)
+    await cache.get()
+
+    calls.error = httpx.ConnectError("down")
+    clock.now += 30
+    with pytest.raises(httpx.ConnectError):
+        await cache.get_key("random-1")
+    assert calls.count == 2
+
+    # 실패한 시도도 rate limit에 들어가므로 다음 kid들은 upstream을 부르지 않는다
+    for i in range(5):
+        clock.now += 1
+        assert await cache.get_key(f"random-{i + 2}") is None
+    assert calls.count == 2
+    assert await cache.get_key("k1") is not None
+
+    calls.error = None
+    calls.keys = [_PUB1, _PUB2]
+    clock.now += 30
+    assert await cache.get_key("k2") is not None
+    assert calls.count == 3
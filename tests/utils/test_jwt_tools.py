@@ -1,7 +1,11 @@
+import time
 import pytest
 from authlib.jose import jwt
 
-from app.utils.jwt_tools import issue_access_token
+from app.utils import jwt_tools
+from app.utils.jwt_tools import (
+    AuthlibCodec, FastHS256Codec, InvalidTokenError, get_codec, issue_access_token,
+)
 from app.core.config import settings
 
 
@@ -14,3 +18,55 @@ def test_issue_access_token_encodes_claims():
     assert claims["iss"] == "sangcheol-odyssey"
     assert claims["exp"] - claims["iat"] == settings.JWT_EXPIRES_SEC
     assert "aud" not in claims
+
+_CODECS = [FastHS256Codec, AuthlibCodec]
+
+
+def _claims(**over):
+    c = {"sub": "u1", "typ": "access", "exp": int(time.time()) + 60, "iat": 1, "iss": "iss"}
+    c.update(over)
+    return c
+
+
+@pytest.mark.parametrize("enc", _CODECS)
+@pytest.mark.parametrize("dec", _CODECS)
+def test_codecs_interoperate(enc, dec):
+    token = enc("secret", "iss").encode(_claims())
+    assert dec("secret", "iss").decode(token)["sub"] == "u1"
+
+
+@pytest.mark.parametrize("codec", _CODECS)
+@pytest.mark.parametrize("claims", [
+    _claims(exp=1),
+    _claims(iss="other"),
+    {k: v for k, v in _claims().items() if k != "exp"},
+])
+def test_codecs_enforce_exp_and_iss(codec, claims):
+    token = FastHS256Codec("secret", "iss").encode(claims)
+    with pytest.raises(InvalidTokenError):
+        codec("secret", "iss").decode(token)
+
+
+@pytest.mark.parametrize("codec", _CODECS)
+def test_codecs_reject_bad_signature_and_garbage(codec):
+    token = FastHS256Codec("other-secret", "iss").encode(_claims())
+    for bad in (token, "not-a-jwt", token.rsplit(".", 1)[0] + ".", "a.b.c"):
+        with pytest.raises(InvalidTokenError):
+            codec("secret", "iss").decode(bad)
+
+
+def test_fast_codec_rejects_alg_none():
+    fast = FastHS256Codec("secret", "iss")
+    header = jwt_tools._b64encode(b'{"alg":"none"}').decode()
+    payload = jwt_tools._b64encode(jwt_tools._json(_claims())).decode()
+    with pytest.raises(InvalidTokenError):
+        fast.decode(f"{header}.{payload}.")
+
+
+def test_get_codec_follows_settings(monkeypatch):
+    monkeypatch.setattr(jwt_tools.settings, "JWT_CODEC", "authlib")
+    assert isinstance(get_codec(), AuthlibCodec)
+    monkeypatch.setattr(jwt_tools.settings, "JWT_CODEC", "fast")
+    codec = get_codec()
+    assert isinstance(codec, FastHS256Codec)
+    assert get_codec() is codec
@@ -0,0 +1,90 @@
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.utils.metrics import Histogram, Registry, REDIS_DURATION, UPSTREAM_REQUESTS
+from app.utils.redis_client import TimedRedis
+from app.utils.upstream import UpstreamClient
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = Registry()
+    h = reg.histogram("lat_seconds", "latency", ("route",), buckets=(0.1, 1.0))
+    c = reg.counter("hits_total", "hits", ("route",))
+    child = h.labels('/a"b')
+    for v in (0.05, 0.1, 0.5, 3.0):
+        child.observe(v)
+    c.labels("/a").inc()
+    reg.register_collector(lambda: [("depth", "gauge", "depth", [({}, 7)])])
+
+    out = reg.render().splitlines()
+    assert 'lat_seconds_bucket{route="/a\\"b",le="0.1"} 2' in out
+    assert 'lat_seconds_bucket{route="/a\\"b",le="1.0"} 3' in out
+    assert 'lat_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in out
+    assert 'lat_seconds_count{route="/a\\"b"} 4' in out
+    assert 'hits_total{route="/a"} 1' in out
+    assert "# TYPE depth gauge" in out and "depth 7" in out
+
+
+def test_labels_children_are_cached():
+    h = Histogram("x", "x", ("a",), buckets=(1.0,))
+    assert h.labels("k") is h.labels("k")
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_templates(client):
+    from app.utils.metrics import HTTP_REQUESTS
+
+    child = HTTP_REQUESTS.labels("DELETE", "/v1/identities/{provider}", "403")
+    before = child.value
+    assert (await client.delete("/v1/identities/google")).status_code == 403
+    await client.get("/no/such/path")
+    res = await client.get("/metrics")
+    assert res.status_code == 200 and res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = res.text
+    assert child.value == before + 1
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in body
+    assert 'http_request_duration_seconds_count{method="DELETE",route="/v1/identities/{provider}"}' in body
+    for name in ("db_pool_checked_out", "redis_pool_connections", "user_cache_lookups_total", "uid_pool_takes_total"):
+        assert f"# TYPE {name} " in body
+
+
+@pytest.mark.asyncio
+async def test_timed_redis_records_command_latency(fake_redis):
+    r = TimedRedis(connection_pool=fake_redis.connection_pool)
+    before = sum(REDIS_DURATION.labels("SET").counts)
+    await r.set("k", "v")
+    assert await r.get("k") == "v"
+    assert sum(REDIS_DURATION.labels("SET").counts) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_counts_outcomes():
+    def handler(req: httpx.Request) -> httpx.Response:
+        if req.url.path == "/down":
+            raise httpx.ConnectError("down")
+        return httpx.Response(503 if req.url.path == "/busy" else 200)
+
+    up = UpstreamClient("metrics-test", transport=httpx.MockTransport(handler))
+    await up.get("https://x/ok")
+    await up.get("https://x/busy")
+    with pytest.raises(httpx.ConnectError):
+        await up.get("https://x/down")
+    await up.aclose()
+    assert [UPSTREAM_REQUESTS.labels("metrics-test", o).value for o in ("2xx", "5xx", "error")] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_timed_pool_records_checkout_wait(test_db_url):
+    from app.core.session import _TimedQueuePool
+
+    engine = create_async_engine(test_db_url, poolclass=_TimedQueuePool, pool_size=1)
+    wait = _TimedQueuePool._wait
+    before = sum(wait.counts)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("select 1"))
+    finally:
+        await engine.dispose()
+    assert sum(wait.counts) == before + 1
@@ -0,0 +1,58 @@
+import marshal
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.utils import profiler as pf
+
+
+def test_profile_token_roundtrip_and_expiry():
+    tok = pf.make_profile_token("s3cret", 2_000)
+    assert pf.verify_profile_token("s3cret", tok, now=1_000)
+    assert not pf.verify_profile_token("s3cret", tok, now=2_001)
+    assert not pf.verify_profile_token("other", tok, now=1_000)
+    assert not pf.verify_profile_token(None, tok, now=1_000)
+    assert not pf.verify_profile_token("s3cret", "junk", now=1_000)
+
+
+def _app(store: pf.ProfileStore) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(pf.ProfilerMiddleware, store=store)
+
+    @app.get("/work/{n}")
+    async def work(n: int):
+        return {"sum": sum(i * i for i in range(n))}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_signed_header_profiles_and_merges_per_route(monkeypatch):
+    monkeypatch.setattr(pf.settings, "PROFILER_SECRET", "s3cret")
+    monkeypatch.setattr(pf.settings, "PROFILER_SAMPLE_RATE", 0.0)
+    store = pf.ProfileStore()
+    good = pf.make_profile_token("s3cret", 4_000_000_000)
+    async with AsyncClient(transport=ASGITransport(app=_app(store)), base_url="http://t") as c:
+        await c.get("/work/10")
+        await c.get("/work/10", headers={"X-Profile": "1.bad"})
+        assert store.summary() == []
+
+        await c.get("/work/1000", headers={"X-Profile": good})
+        await c.get("/work/2000", headers={"X-Profile": good})
+
+    [row] = store.summary()
+    assert row["route"] == "/work/{n}" and row["samples"] == 2
+    stats = marshal.loads(store.dump("/work/{n}"))
+    assert any(func[2] == "work" for func in stats)
+    assert "work" in store.render_text("/work/{n}")
+    assert not store.active
+    assert store.dump("/nope") is None
+
+
+@pytest.mark.asyncio
+async def test_sample_rate_profiles_without_header(monkeypatch):
+    monkeypatch.setattr(pf.settings, "PROFILER_SAMPLE_RATE", 1.0)
+    store = pf.ProfileStore()
+    async with AsyncClient(transport=ASGITransport(app=_app(store)), base_url="http://t") as c:
+        await c.get("/work/5")
+    assert store.summary()[0]["samples"] == 1
@@ -0,0 +1,67 @@
+import logging
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.utils import query_stats as qs
+
+
+def test_normalize_sql_collapses_values_and_in_lists():
+    sql = """SELECT "user".id FROM "user"
+             WHERE "user".uid IN ($1, $2, $3) AND nickname = 'bob''s' AND n > 10 AND p::jsonb ? :name"""
+    assert qs.normalize_sql(sql) == (
+        'SELECT "user".id FROM "user" WHERE "user".uid IN (...) AND nickname = ? AND n > ? AND p::jsonb ? ?'
+    )
+
+
+@pytest.mark.asyncio
+async def test_middleware_counts_per_request_and_sets_headers(test_db_url, monkeypatch):
+    eng = create_async_engine(test_db_url)
+    qs.install_query_hooks(eng.sync_engine)
+    qs.install_query_hooks(eng.sync_engine)  # 두 번 걸어도 한 번만 센다
+    monkeypatch.setattr(qs.settings, "DB_DEBUG_HEADERS", True)
+    monkeypatch.setattr(qs.settings, "DB_SLOW_QUERY_MS", 0)
+
+    app = FastAPI()
+    app.add_middleware(qs.QueryStatsMiddleware)
+
+    @app.get("/q/{n}")
+    async def run(n: int):
+        async with eng.connect() as conn:
+            for _ in range(n):
+                await conn.execute(text("select 1"))
+        return {}
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as c:
+            before = sum(qs.DB_STATEMENTS.labels("/q/{n}").counts)
+            res = await c.get("/q/3")
+            assert res.headers["x-db-queries"] == "3"
+            assert float(res.headers["x-db-time"]) > 0
+            assert (await c.get("/q/0")).headers["x-db-queries"] == "0"
+        child = qs.DB_STATEMENTS.labels("/q/{n}")
+        assert sum(child.counts) == before + 2
+        assert qs.DB_TIME.labels("/q/{n}").value > 0
+        assert qs.current_stats() is None
+    finally:
+        await eng.dispose()
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_normalized(test_db_url, monkeypatch, caplog):
+    eng = create_async_engine(test_db_url)
+    qs.install_query_hooks(eng.sync_engine)
+    monkeypatch.setattr(qs.settings, "DB_SLOW_QUERY_MS", 0.0001)
+    before = qs._slow.value
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+            async with eng.connect() as conn:
+                await conn.execute(text("select pg_sleep(0.01), 'x'"))
+                with pytest.raises(Exception):
+                    await conn.execute(text("select * from no_such_table"))
+    finally:
+        await eng.dispose()
+    assert qs._slow.value >= before + 1
+    assert any("select pg_sleep(?), ?" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,25 @@
+import pytest
+from redis.asyncio import BlockingConnectionPool
+
+from app.utils import redis_client as rc
+
+
+@pytest.mark.asyncio
+async def test_get_redis_shares_one_bounded_pool(monkeypatch):
+    monkeypatch.setattr(rc, "_redis", None)
+    monkeypatch.setattr(rc.settings, "REDIS_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(rc.settings, "REDIS_HEALTH_CHECK_INTERVAL_SEC", 15)
+
+    r1 = rc.get_redis()
+    r2 = rc.get_redis()
+    assert r1 is r2
+    pool = r1.connection_pool
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["health_check_interval"] == 15
+    assert rc.pool_stats() == {"max_connections": 7, "in_use": 0, "idle": 0}
+
+    await rc.close_redis()
+    assert rc._redis is None
+    assert rc.get_redis() is not r1
+    await rc.close_redis()
@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+
+from app.utils import refresh_tools as rt
+from app.utils.refresh_store import (
+    store_refresh, rotate_refresh, revoke_all, compact_user_indexes, convert_legacy_indexes, load_scripts,
+)
+
+
+async def _index(r, user_id: str) -> dict[str, float]:
+    return dict(await r.zrange(rt.redis_user_set_key(user_id), 0, -1, withscores=True))
+
+
+@pytest.mark.asyncio
+async def test_store_refresh_indexes_by_expiry(fake_redis):
+    await store_refresh(fake_redis, "u1", "h1")
+
+    rec = rt.from_json(await fake_redis.get(rt.redis_token_key("h1")))
+    assert rec["user_id"] == "u1"
+    assert await _index(fake_redis, "u1") == {"h1": rec["exp"]}
+    assert await fake_redis.ttl(rt.redis_user_set_key("u1")) > 0
+
+
+@pytest.mark.asyncio
+async def test_store_refresh_trims_expired_members(fake_redis):
+    idx = rt.redis_user_set_key("u1")
+    await fake_redis.zadd(idx, {"dead1": rt.now_ts() - 10, "dead2": rt.now_ts() - 1})
+
+    await store_refresh(fake_redis, "u1", "h1")
+
+    assert set(await _index(fake_redis, "u1")) == {"h1"}
+
+
+@pytest.mark.asyncio
+async def test_rotate_refresh_moves_record_and_index(fake_redis):
+    await store_refresh(fake_redis, "u1", "old")
+
+    assert await rotate_refresh(fake_redis, "old", "new") == "u1"
+
+    assert await fake_redis.get(rt.redis_token_key("old")) is None
+    rec = rt.from_json(await fake_redis.get(rt.redis_token_key("new")))
+    assert rec["user_id"] == "u1"
+    assert rec["exp"] - rec["iat"] == int(rt.settings.REFRESH_EXPIRES_SEC)
+    assert await _index(fake_redis, "u1") == {"new": rec["exp"]}
+
+    assert await rotate_refresh(fake_redis, "old", "again") is None
+    assert await fake_redis.get(rt.redis_token_key("again")) is None
+
+
+@pytest.mark.asyncio
+async def test_rotate_refresh_rejects_expired_record(fake_redis):
+    rec = rt.RefreshRecord(user_id="u1", iat=rt.now_ts() - 100, exp=rt.now_ts() - 1)
+    await fake_redis.setex(rt.redis_token_key("old"), 60, rt.to_json(rec))
+    await fake_redis.zadd(rt.redis_user_set_key("u1"), {"old": rec["exp"]})
+
+    assert await rotate_refresh(fake_redis, "old", "new") is None
+    assert await fake_redis.get(rt.redis_token_key("new")) is None
+    assert await _index(fake_redis, "u1") == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rotations_have_single_winner(fake_redis):
+    await load_scripts(fake_redis)
+    await store_refresh(fake_redis, "u1", "old")
+
+    results = await asyncio.gather(*(rotate_refresh(fake_redis, "old", f"n{i}") for i in range(20)))
+
+    winners = [i for i, uid in enumerate(results) if uid == "u1"]
+    assert len(winners) == 1
+    assert set(await _index(fake_redis, "u1")) == {f"n{winners[0]}"}
+
+
+@pytest.mark.asyncio
+async def test_legacy_set_index_is_detached_on_login_path(fake_redis):
+    rec = rt.RefreshRecord(user_id="u1", iat=rt.now_ts(), exp=rt.exp_ts())
+    await fake_redis.setex(rt.redis_token_key("live"), 100, rt.to_json(rec))
+    await fake_redis.setex(rt.redis_token_key("other"), 100, rt.to_json(rec))
+    await fake_redis.sadd(rt.redis_user_set_key("u1"), "live", "other", "gone")
+
+    assert await rotate_refresh(fake_redis, "live", "next") == "u1"
+
+    # 로그인 경로에서는 떼어 내기만 하고 멤버 변환은 하지 않는다
+    assert set(await _index(fake_redis, "u1")) == {"next"}
+    assert await fake_redis.smembers(rt.redis_user_legacy_key("u1")) == {"other", "gone"}
+
+
+@pytest.mark.asyncio
+async def test_convert_legacy_indexes_in_batches(fake_redis):
+    rec = rt.RefreshRecord(user_id="u1", iat=rt.now_ts(), exp=rt.exp_ts())
+    live = [f"live{i}" for i in range(10)]
+    for h in live:
+        await fake_redis.setex(rt.redis_token_key(h), 100, rt.to_json(rec))
+    await fake_redis.sadd(rt.redis_user_legacy_key("u1"), *live, *(f"dead{i}" for i in range(15)))
+    await store_refresh(fake_redis, "u1", "new")
+
+    assert await convert_legacy_indexes(fake_redis, batch=7) == 15
+
+    assert set(await _index(fake_redis, "u1")) == {"new", *live}
+    assert await fake_redis.exists(rt.redis_user_legacy_key("u1")) == 0
+
+
+@pytest.mark.asyncio
+async def test_revoke_all_deletes_unconverted_legacy_tokens(fake_redis):
+    await store_refresh(fake_redis, "u1", "a")
+    rec = rt.RefreshRecord(user_id="u1", iat=rt.now_ts(), exp=rt.exp_ts())
+    await fake_redis.setex(rt.redis_token_key("old"), 100, rt.to_json(rec))
+    await fake_redis.sadd(rt.redis_user_legacy_key("u1"), "old", "gone")
+
+    assert await revoke_all(fake_redis, "u1") == 2
+    assert await fake_redis.exists(rt.redis_token_key("a"), rt.redis_token_key("old")) == 0
+    assert await fake_redis.exists(rt.redis_user_legacy_key("u1")) == 0
+
+
+@pytest.mark.asyncio
+async def test_revoke_all_deletes_only_live_tokens(fake_redis):
+    await store_refresh(fake_redis, "u1", "a")
+    await store_refresh(fake_redis, "u1", "b")
+    await fake_redis.zadd(rt.redis_user_set_key("u1"), {"dead": rt.now_ts() - 1})
+
+    assert await revoke_all(fake_redis, "u1") == 2
+    assert await fake_redis.exists(rt.redis_token_key("a"), rt.redis_token_key("b")) == 0
+    assert await fake_redis.exists(rt.redis_user_set_key("u1")) == 0
+    assert await revoke_all(fake_redis, "u1") == 0
+
+
+@pytest.mark.asyncio
+async def test_compact_user_indexes_reclaims_expired_members(fake_redis):
+    past = rt.now_ts() - 1
+    for i in range(30):
+        await fake_redis.zadd(rt.redis_user_set_key(f"u{i}"), {"dead": past, f"live{i}": past + 3600})
+
+    assert await compact_user_indexes(fake_redis, batch=7) == 30
+    assert set(await _index(fake_redis, "u3")) == {"live3"}
+    assert await compact_user_indexes(fake_redis, batch=7) == 0
+
+
+@pytest.mark.asyncio
+async def test_compact_user_indexes_converts_legacy_sets(fake_redis):
+    await store_refresh(fake_redis, "legacy", "live")
+    await fake_redis.delete(rt.redis_user_set_key("legacy"))
+    await fake_redis.sadd(rt.redis_user_set_key("legacy"), "live", "orphan")
+
+    assert await compact_user_indexes(fake_redis) == 1
+    assert set(await _index(fake_redis, "legacy")) == {"live"}
+
+
+@pytest.mark.asyncio
+async def test_store_refresh_evicts_oldest_over_cap(fake_redis, monkeypatch):
+    import app.utils.refresh_store as rs
+    monkeypatch.setattr(rs.settings, "REFRESH_MAX_SESSIONS_PER_USER", 3)
+    base = rt.now_ts()
+    clock = iter(range(base, base + 100))
+    monkeypatch.setattr(rs, "now_ts", lambda: next(clock))
+
+    evicted = [await store_refresh(fake_redis, "u1", f"h{i}") for i in range(5)]
+
+    assert evicted == [0, 0, 0, 1, 1]
+    assert set(await _index(fake_redis, "u1")) == {"h2", "h3", "h4"}
+    assert await fake_redis.exists(rt.redis_token_key("h0"), rt.redis_token_key("h1")) == 0
+    assert await fake_redis.exists(*(rt.redis_token_key(f"h{i}") for i in (2, 3, 4))) == 3
+
+
+@pytest.mark.asyncio
+async def test_session_cap_zero_is_unlimited(fake_redis, monkeypatch):
+    import app.utils.refresh_store as rs
+    monkeypatch.setattr(rs.settings, "REFRESH_MAX_SESSIONS_PER_USER", 0)
+
+    for i in range(12):
+        assert await store_refresh(fake_redis, "u1", f"h{i}") == 0
+    assert len(await _index(fake_redis, "u1")) == 12
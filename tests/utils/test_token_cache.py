@@ -0,0 +1,38 @@
+from app.utils import token_cache as tc
+from app.utils.token_cache import VerifiedTokenCache
+
+
+def test_hit_until_exp(monkeypatch):
+    monkeypatch.setattr(tc, "_now", lambda: 1000.0)
+    cache = VerifiedTokenCache(maxsize=10)
+    cache.put("t1", {"sub": "u1", "exp": 1010})
+
+    assert cache.get("t1") == {"sub": "u1", "exp": 1010}
+    assert cache.get("other") is None
+
+    monkeypatch.setattr(tc, "_now", lambda: 1010.0)
+    assert cache.get("t1") is None
+    assert cache.stats() == {"size": 0, "maxsize": 10, "hits": 1, "misses": 2}
+
+
+def test_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(tc, "_now", lambda: 0.0)
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("a", {"exp": 100})
+    cache.put("b", {"exp": 100})
+    assert cache.get("a") is not None
+    cache.put("c", {"exp": 100})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_skips_tokens_without_exp_and_zero_size():
+    cache = VerifiedTokenCache(maxsize=10)
+    cache.put("t", {"sub": "u1"})
+    assert cache.stats()["size"] == 0
+
+    disabled = VerifiedTokenCache(maxsize=0)
+    disabled.put("t", {"exp": 2**40})
+    assert disabled.get("t") is None
@@ -0,0 +1,68 @@
+import httpx
+import pytest
+
+from app.utils.upstream import UpstreamClient
+
+
+def _client(handler, **kwargs):
+    return UpstreamClient("test", transport=httpx.MockTransport(handler), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_reuses_one_client_and_records_latency():
+    up = _client(lambda req: httpx.Response(200, json={"ok": True}))
+
+    first = up.client
+    for _ in range(3):
+        r = await up.get("https://example.test/a")
+        assert r.json() == {"ok": True}
+    await up.post("https://example.test/b", data={"x": "1"})
+
+    assert up.client is first
+    stats = up.stats()
+    assert stats["count"] == 4
+    assert stats["errors"] == 0
+    assert stats["max_ms"] >= stats["p95_ms"] >= stats["p50_ms"] >= 0
+    await up.aclose()
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_are_counted():
+    def handler(req):
+        raise httpx.ConnectError("refused", request=req)
+
+    up = _client(handler)
+    with pytest.raises(httpx.ConnectError):
+        await up.get("https://example.test/")
+
+    assert up.stats()["count"] == 1
+    assert up.stats()["errors"] == 1
+    await up.aclose()
+
+
+@pytest.mark.asyncio
+async def test_limits_and_split_timeouts(monkeypatch):
+    from app.utils import upstream
+    monkeypatch.setattr(upstream.settings, "UPSTREAM_CONNECT_TIMEOUT_SEC", 1.5)
+    monkeypatch.setattr(upstream.settings, "UPSTREAM_READ_TIMEOUT_SEC", 7.0)
+    up = _client(lambda req: httpx.Response(200), max_connections=4)
+
+    timeout = up.client.timeout
+    assert timeout.connect == 1.5
+    assert timeout.read == 7.0
+    await up.aclose()
+    assert up._client is None
+
+
+@pytest.mark.asyncio
+async def test_prime_opens_each_host():
+    seen = []
+
+    def handler(req):
+        seen.append((req.method, req.url.host))
+        return httpx.Response(404)
+
+    up = _client(handler, prime_urls=("https://a.test/", "https://b.test/"))
+    assert await up.prime() == 2
+    assert seen == [("HEAD", "a.test"), ("HEAD", "b.test")]
+    await up.aclose()
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.schemas.user import UserOut, UserPublic
+from app.utils import user_cache as uc
+from app.utils.user_cache import UserProfileCache, redis_user_cache_key
+
+
+def _user(nickname="n") -> UserOut:
+    return UserOut(id=uuid.uuid4(), uid="123456789", nickname=nickname, created_at=datetime.now(timezone.utc))
+
+
+@pytest.mark.asyncio
+async def test_local_then_redis_then_invalidate(fake_redis):
+    cache = UserProfileCache(local_size=10, local_ttl=5, ttl=60)
+    user = _user()
+    uid = str(user.id)
+
+    assert await cache.get(fake_redis, uid) is None
+    await cache.set(fake_redis, user)
+    assert 0 < await fake_redis.ttl(redis_user_cache_key(uid)) <= 60
+
+    assert await cache.get(fake_redis, uid) == user
+    cache.clear_local()
+    assert await cache.get(fake_redis, uid) == user
+    assert cache.stats() == {"local_size": 1, "local_hits": 1, "redis_hits": 1, "misses": 1}
+
+    await cache.invalidate(fake_redis, uid)
+    assert await cache.get(fake_redis, uid) is None
+    assert 0 < await fake_redis.ttl(redis_user_cache_key(uid)) <= cache.tombstone_ttl
+
+
+@pytest.mark.asyncio
+async def test_set_after_invalidate_does_not_restore_stale_profile(fake_redis):
+    cache = UserProfileCache(local_size=10, local_ttl=5, ttl=60, tombstone_ttl=10)
+    old = _user("old")
+    uid = str(old.id)
+
+    # miss 뒤 DB에서 old를 읽었는데, set하기 전에 닉네임 수정이 commit되고 invalidate됐다
+    assert await cache.get(fake_redis, uid) is None
+    await cache.invalidate(fake_redis, uid)
+    await cache.set(fake_redis, old)
+
+    assert await cache.get(fake_redis, uid) is None
+    assert cache.stats()["local_size"] == 0
+
+    # 삭제 표시가 사라지면 다시 채운다
+    await fake_redis.delete(redis_user_cache_key(uid))
+    new = old.model_copy(update={"nickname": "new"})
+    await cache.set(fake_redis, new)
+    assert await cache.get(fake_redis, uid) == new
+
+
+@pytest.mark.asyncio
+async def test_local_entries_expire(fake_redis, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(uc, "_now", lambda: now[0])
+    cache = UserProfileCache(local_size=10, local_ttl=5, ttl=60)
+    user = _user()
+    await cache.set(fake_redis, user)
+    await fake_redis.delete(redis_user_cache_key(str(user.id)))
+
+    assert await cache.get(fake_redis, str(user.id)) == user
+    now[0] += 5
+    assert await cache.get(fake_redis, str(user.id)) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_misses():
+    class BrokenRedis:
+        async def get(self, key):
+            raise RedisConnectionError("down")
+
+        async def set(self, *a, **k):
+            raise RedisConnectionError("down")
+
+        async def delete(self, key):
+            raise RedisConnectionError("down")
+
+    cache = UserProfileCache(local_size=0, local_ttl=0, ttl=60)
+    user = _user()
+    await cache.set(BrokenRedis(), user)
+    assert await cache.get(BrokenRedis(), str(user.id)) is None
+    await cache.invalidate(BrokenRedis(), str(user.id))
+
+
+@pytest.mark.asyncio
+async def test_public_profiles_mget_and_invalidate(fake_redis):
+    cache = uc.PublicProfileCache(ttl=60)
+    a, b = UserPublic(uid="111111111", nickname="a"), UserPublic(uid="222222222", nickname=None)
+
+    assert await cache.get_many(fake_redis, [a.uid, b.uid]) == {}
+    await cache.set_many(fake_redis, [a, b])
+    assert await cache.get_many(fake_redis, [a.uid, b.uid, "333333333"]) == {a.uid: a, b.uid: b}
+    assert 0 < await fake_redis.ttl(uc.redis_public_profile_key(a.uid)) <= 60
+
+    await cache.invalidate(fake_redis, a.uid)
+    assert await cache.get_many(fake_redis, [a.uid, b.uid]) == {b.uid: b}
+    assert cache.stats() == {"hits": 3, "misses": 4}
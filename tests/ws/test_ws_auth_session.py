@@ -0,0 +1,161 @@
+import asyncio
+import json
+import pytest
+from app.main import app
+from app.utils import auth_session as a_sess
+
+TOKEN = {"access_token": "acc", "refresh_token": "ref", "expires_in": 3600, "token_type": "bearer", "is_new_user": False}
+
+
+class _WSClient:
+    """ASGI websocket scope를 직접 구동하는 최소 클라이언트 (httpx ASGITransport는 websocket을 지원하지 않는다)."""
+
+    def __init__(self, sid: str):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "http_version": "1.1",
+            "path": "/v1/ws/auth/session", "raw_path": b"/v1/ws/auth/session", "root_path": "",
+            "query_string": f"sid={sid}".encode(), "headers": [], "subprotocols": [],
+            "server": ("testserver", 80), "client": ("testclient", 50000),
+        }
+        self.inbox.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(app(scope, self.inbox.get, self.outbox.put))
+
+    async def recv(self, timeout: float = 2) -> dict:
+        return await asyncio.wait_for(self.outbox.get(), timeout)
+
+    async def disconnect(self) -> None:
+        await self.inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 2)
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    from app.ws import auth_session as ws_ep
+    from app.utils.auth_session_events import SessionNotifier
+
+    n = SessionNotifier()
+    monkeypatch.setattr(ws_ep, "session_notifier", n)
+    return n
+
+
+@pytest.mark.asyncio
+async def test_ws_pushes_token_when_callback_completes(fake_redis, notifier):
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    try:
+        ws = _WSClient(sid)
+        assert (await ws.recv())["type"] == "websocket.accept"
+        while notifier.waiting == 0:
+            await asyncio.sleep(0)
+
+        await a_sess.set_result(fake_redis, sid, TOKEN)
+        msg = await ws.recv()
+        assert json.loads(msg["text"]) == {"status": "ready", "token": TOKEN}
+        assert (await ws.recv())["type"] == "websocket.close"
+        await asyncio.wait_for(ws.task, 2)
+        assert notifier.waiting == 0
+    finally:
+        await notifier.close()
+
+
+@pytest.mark.asyncio
+async def test_ws_pushes_error_and_already_finished_session(fake_redis, notifier):
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    try:
+        ws = _WSClient(sid)
+        assert (await ws.recv())["type"] == "websocket.accept"
+        while notifier.waiting == 0:
+            await asyncio.sleep(0)
+        await a_sess.set_error(fake_redis, sid, "google_error:access_denied")
+        assert json.loads((await ws.recv())["text"]) == {"status": "error", "error": "google_error:access_denied"}
+
+        # 이미 끝난 세션은 구독하자마자 결과를 받는다
+        late = _WSClient(sid)
+        assert (await late.recv())["type"] == "websocket.accept"
+        assert json.loads((await late.recv())["text"])["status"] == "error"
+    finally:
+        await notifier.close()
+
+
+@pytest.mark.asyncio
+async def test_ws_unknown_session_closes_with_4404(fake_redis, notifier):
+    try:
+        ws = _WSClient("NOPE")
+        assert (await ws.recv())["type"] == "websocket.accept"
+        msg = await ws.recv()
+        assert msg["type"] == "websocket.close" and msg["code"] == 4404
+    finally:
+        await notifier.close()
+
+
+@pytest.mark.asyncio
+async def test_ws_client_disconnect_releases_waiter(fake_redis, notifier):
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    try:
+        ws = _WSClient(sid)
+        assert (await ws.recv())["type"] == "websocket.accept"
+        while notifier.waiting == 0:
+            await asyncio.sleep(0)
+        await ws.disconnect()
+        assert notifier.waiting == 0
+    finally:
+        await notifier.close()
+
+
+@pytest.mark.asyncio
+async def test_ws_keeps_waiting_after_spurious_wake(fake_redis, notifier, monkeypatch):
+    from app.ws import auth_session as ws_ep
+
+    monkeypatch.setattr(ws_ep, "_REWAIT_PAUSE_SEC", 0)
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    real_wait = notifier.wait_for_status
+    calls = []
+
+    async def wait_for_status(r, sid, timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            # 구독 연결이 끊겨 마감 전에 pending으로 돌아온 경우
+            return await a_sess.get_status(r, sid)
+        return await real_wait(r, sid, timeout)
+
+    monkeypatch.setattr(notifier, "wait_for_status", wait_for_status)
+    try:
+        ws = _WSClient(sid)
+        assert (await ws.recv())["type"] == "websocket.accept"
+        while notifier.waiting == 0:
+            await asyncio.sleep(0)
+        assert ws.outbox.empty()
+
+        await a_sess.set_result(fake_redis, sid, TOKEN)
+        assert json.loads((await ws.recv())["text"]) == {"status": "ready", "token": TOKEN}
+        assert len(calls) == 2 and 0 < calls[1] <= calls[0]
+    finally:
+        await notifier.close()
+
+
+@pytest.mark.asyncio
+async def test_ws_closes_with_4408_only_when_session_expires(fake_redis, notifier, monkeypatch):
+    from app.ws import auth_session as ws_ep
+
+    monkeypatch.setattr(ws_ep, "SESSION_TTL", 0.2)
+    sid = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+    try:
+        ws = _WSClient(sid)
+        assert (await ws.recv())["type"] == "websocket.accept"
+        msg = await ws.recv()
+        assert msg["type"] == "websocket.close" and msg["code"] == 4408
+
+        # 기다리는 중에 세션 키가 사라져도 만료로 닫는다 (처음부터 없던 세션만 4404)
+        monkeypatch.setattr(ws_ep, "SESSION_TTL", 30)
+        gone = (await a_sess.create_auth_session(fake_redis, "v"))["session_id"]
+        ws = _WSClient(gone)
+        assert (await ws.recv())["type"] == "websocket.accept"
+        while notifier.waiting == 0:
+            await asyncio.sleep(0)
+        await fake_redis.delete(a_sess._key(gone))
+        notifier._wake(gone)
+        msg = await ws.recv()
+        assert msg["type"] == "websocket.close" and msg["code"] == 4408
+    finally:
+        await notifier.close()